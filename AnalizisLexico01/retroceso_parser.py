@@ -6,6 +6,14 @@
 #   B->ccd|ddc
 
 # Cadena: addc#   (si no pones '#', se agrega)
+# Con --memo se usa el retroceso memoizado (tiempo polinomial).
+# Con --earley se usa el reconocedor de Earley (cualquier gramática, incluso
+# recursiva por la izquierda o ambigua; a lo sumo O(n³)).
+# Con --stats archivo.json se guardan las estadísticas del análisis.
+
+import json, sys, time
+from bisect import bisect_right
+from collections import Counter
 
 def normalize_rhs(s):
     s = s.replace(" ", "")
@@ -53,7 +61,32 @@ def beta_to_str(beta):
 def print_state(mode, i, alpha, beta, note):
     print(f"( {mode}, {i}, {alpha_to_str(alpha)}, {beta_to_str(beta)} )".ljust(50), note)
 
-def analyze(grammar, start, labels, input_syms):
+def nuevas_estadisticas():
+    # expansiones por etiqueta (S1, A2…), concordancias, retrocesos por no
+    # terminal (punto de decisión), profundidad máxima de α/β y tiempo
+    return {"expansiones": Counter(), "concordancias": 0, "retrocesos": Counter(),
+            "max_alpha": 0, "max_beta": 0, "segundos": 0.0}
+
+def resumen_estadisticas(est):
+    return (f"{sum(est['expansiones'].values())} expansiones, {est['concordancias']} concordancias, "
+            f"{sum(est['retrocesos'].values())} retrocesos, |α|≤{est['max_alpha']}, "
+            f"|β|≤{est['max_beta']}, {est['segundos']:.3f} s")
+
+def exportar_estadisticas(est, ruta):
+    datos = dict(est)
+    datos["expansiones"] = dict(est["expansiones"].most_common())
+    datos["retrocesos"] = dict(est["retrocesos"].most_common())
+    datos["total_expansiones"] = sum(est["expansiones"].values())
+    datos["total_retrocesos"] = sum(est["retrocesos"].values())
+    datos["segundos"] = round(est["segundos"], 6)
+    with open(ruta, "w", encoding="utf-8") as f:
+        json.dump(datos, f, ensure_ascii=False, indent=2)
+
+def analyze(grammar, start, labels, input_syms, est=None):
+    # est: diccionario de nuevas_estadisticas() que se llena durante el análisis
+    if est is None:
+        est = nuevas_estadisticas()
+    t0 = time.perf_counter()
     # Estado
     beta = [start, "#"]   # pila (por derivar)
     alpha = []            # reconocidos + etiquetas (S1, A2, ...)
@@ -72,10 +105,14 @@ def analyze(grammar, start, labels, input_syms):
     print_state("n", 1, alpha, beta, "Inicio")
 
     while True:
+        if len(alpha) > est["max_alpha"]: est["max_alpha"] = len(alpha)
+        if len(beta) > est["max_beta"]: est["max_beta"] = len(beta)
+
         # Regla 3: éxito
         if beta == ["#"] and a_sym() == "#":
             print_state("n", i, alpha, beta, "(3) fin de pila con '#'")
             print_state("t", i+1, alpha, ["ε"], "ACEPTA")
+            est["segundos"] = time.perf_counter() - t0
             return True
 
         if mode == "n":
@@ -96,6 +133,7 @@ def analyze(grammar, start, labels, input_syms):
                 alpha.append(label)                  # agrega S1 / A1 / ...
                 actions.append({"kind":"expand","detail":label,"nonterm":X,"alt":alt,"rhs":rhs})
                 decisions.append({"X":X,"alt":alt,"i0":i,"alpha_len":len(alpha),"rhs":rhs})
+                est["expansiones"][label] += 1
                 print_state("n", i, alpha, beta, f"(1) entra {X}, aplica {label}")
                 continue
 
@@ -106,6 +144,7 @@ def analyze(grammar, start, labels, input_syms):
                     alpha.append(X)                   # agrega a α
                     actions.append({"kind":"match","detail":X})
                     i += 1
+                    est["concordancias"] += 1
                     print_state("n", i, alpha, beta, f"(2) concordancia '{X}'")
                     continue
                 else:
@@ -125,6 +164,7 @@ def analyze(grammar, start, labels, input_syms):
         else:
             if not decisions:
                 print_state("r", i, alpha, beta, "(6b) sin más alternativas: RECHAZA")
+                est["segundos"] = time.perf_counter() - t0
                 return False
 
             # Regla 5: deshacer matches hasta volver al punto de decisión cuando haga falta
@@ -188,6 +228,7 @@ def analyze(grammar, start, labels, input_syms):
                     break
                 q -= 1
             print_state("r", i, alpha, beta, f"(6c) deshacer producción {X}{tried_alt} (volver a {X})")
+            est["retrocesos"][X] += 1
 
             # Regla 6a: ¿hay siguiente alternativa?
             next_alt = tried_alt + 1
@@ -198,6 +239,7 @@ def analyze(grammar, start, labels, input_syms):
                 alpha.append(new_label)
                 actions.append({"kind":"expand","detail":new_label,"nonterm":X,"alt":next_alt,"rhs":new_rhs})
                 decisions[-1] = {"X":X,"alt":next_alt,"i0":dp["i0"],"alpha_len":len(alpha),"rhs":new_rhs}
+                est["expansiones"][new_label] += 1
                 print_state("n", i, alpha, beta, f"(6a) siguiente alternativa de {X}: aplica {new_label}")
                 mode = "n"
                 continue
@@ -207,10 +249,336 @@ def analyze(grammar, start, labels, input_syms):
                 # continuar en 'r'
                 continue
 
+def analyze_memo(grammar, start, labels, input_syms):
+    # Retroceso memoizado: mismo resultado y misma derivación que analyze(),
+    # pero cada intento (no terminal, posición) se deriva una sola vez.
+    # Cada intento es un flujo perezoso de las posiciones finales distintas
+    # que alcanza, en el orden en que el retroceso las encontraría; retroceder
+    # es pedirle al flujo su siguiente resultado. Tiempo polinomial en vez de
+    # exponencial. La recursión por la izquierda se corta en lugar de colgarse.
+    n_syms = len(input_syms)
+    flujos = {}   # (X, i) o (X, alt, k, i) -> estado del flujo
+    lejos = 1     # posición más lejana concordada (para el mensaje de rechazo)
+
+    def sym(i):
+        return input_syms[i-1] if i <= n_syms else "#"
+
+    # Cada flujo que se está avanzando es un generador que pide con
+    # 'yield (clave, idx)' los resultados de los flujos de los que depende;
+    # obtener() los lleva en una pila explícita, sin recursión de Python.
+    def obtener(clave, idx):
+        pila = []
+        while True:
+            f = flujos.get(clave)
+            if f is None:
+                f = flujos[clave] = {"res": [], "vistos": set(), "alt": 1, "a": 0, "b": 0,
+                                     "fin": False, "activo": False}
+            if idx < len(f["res"]):
+                valor = f["res"][idx]
+            elif f["fin"] or f["activo"]:
+                valor = None  # agotado, o recursión por la izquierda: se corta
+            else:
+                pila.append(producir(clave, f, idx))
+                valor = None
+            while True:
+                if not pila:
+                    return valor
+                try:
+                    clave, idx = pila[-1].send(valor)
+                    break
+                except StopIteration as hecho:
+                    pila.pop()
+                    valor = hecho.value
+
+    def producir(clave, f, idx):
+        res = f["res"]
+        f["activo"] = True
+        while len(res) <= idx and not f["fin"]:
+            if len(clave) == 2:
+                yield from avanzar_nt(clave, f)
+            else:
+                yield from avanzar_sec(clave, f)
+        f["activo"] = False
+        return res[idx] if idx < len(res) else None
+
+    # (X, i) -> [(j, nodo)]; nodo = (X, alt, hijos)
+    def avanzar_nt(clave, f):
+        X, i = clave
+        alt = f["alt"]
+        if alt > len(grammar.get(X, [])):
+            f["fin"] = True
+            return
+        r = yield (X, alt, 0, i), f["b"]
+        if r is None:
+            f["alt"] += 1; f["b"] = 0
+            return
+        f["b"] += 1
+        j, hijos = r
+        if j not in f["vistos"]:
+            f["vistos"].add(j); f["res"].append((j, (X, alt, hijos)))
+
+    # (X, alt, k, i): rhs[k:] desde i -> [(j, hijos)]; hijos = (arbol, resto)
+    def avanzar_sec(clave, f):
+        nonlocal lejos
+        X, alt, k, i = clave
+        rhs = grammar[X][alt-1]
+        if k == len(rhs):
+            f["res"].append((i, None)); f["fin"] = True
+            return
+        Y = rhs[k]
+        if Y.isupper():
+            e = yield (Y, i), f["a"]
+        elif f["a"] == 0 and sym(i) == Y:
+            e = (i+1, Y)
+            lejos = max(lejos, i+1)
+        else:
+            e = None
+        if e is None:
+            f["fin"] = True
+            return
+        j, arbol = e
+        r = yield (X, alt, k+1, j), f["b"]
+        if r is None:
+            f["a"] += 1; f["b"] = 0
+            return
+        f["b"] += 1
+        m, hijos = r
+        if m not in f["vistos"]:
+            f["vistos"].add(m); f["res"].append((m, (arbol, hijos)))
+
+    raiz, idx = None, 0
+    while (r := obtener((start, 1), idx)) is not None:
+        if sym(r[0]) == "#":
+            raiz = r[1]
+            break
+        idx += 1
+
+    if raiz is None:
+        print("\nTRAZA:")
+        print_state("r", lejos, [], [start, "#"], "(6b) sin más alternativas: RECHAZA")
+        return False
+    trazar_derivacion(grammar, start, labels, raiz)
+    return True
+
+def anulables_de(grammar):
+    # no terminales que derivan ε (punto fijo)
+    anulables = set()
+    cambio = True
+    while cambio:
+        cambio = False
+        for X, rhss in grammar.items():
+            if X not in anulables and any(all(Y in anulables for Y in rhs) for rhs in rhss):
+                anulables.add(X)
+                cambio = True
+    return anulables
+
+def analyze_earley(grammar, start, labels, input_syms):
+    # Reconocedor de Earley: acepta cualquier gramática libre de contexto
+    # (recursión por la izquierda, ambigüedad, ε) en tiempo O(n³) en el peor
+    # caso y O(n²) si no es ambigua; con la optimización de Leo para las
+    # cadenas de compleciones de la recursión por la derecha, es lineal en
+    # las gramáticas deterministas. Un ítem es (X, alt, punto, origen); las
+    # producciones anulables se tratan como Aycock y Horspool (al predecir
+    # X anulable se avanza ya). Si acepta, se arma una derivación y se
+    # imprime como la de analyze_memo.
+    palabras = input_syms[:-1] if input_syms and input_syms[-1] == "#" else list(input_syms)
+    n = len(palabras)
+    # mas_alto() y derivacion_earley() recurren: el límite se sube solo mientras dura
+    limite = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(limite, 20 * n + 1000))
+    try:
+        anulables = anulables_de(grammar)
+        conjuntos = [[] for _ in range(n+1)]
+        vistos = [set() for _ in range(n+1)]
+        esperan = [{} for _ in range(n+1)]   # k -> {Y: [ítems con el punto antes de Y]}
+        fines = {}                           # (X, origen) -> set(k) donde X se completó
+        leo = {}                             # (i, B) -> ítem completo más alto de la cadena, o None
+
+        def agregar(k, item):
+            if item not in vistos[k]:
+                vistos[k].add(item)
+                conjuntos[k].append(item)
+
+        def mas_alto(i, B):
+            # Leo: si en el conjunto i un único ítem espera B y B es su último
+            # símbolo, completar B completa ese ítem, y así hacia arriba; se salta
+            # la cadena y se agrega solo el ítem de arriba
+            clave = (i, B)
+            if clave in leo:
+                return leo[clave]
+            res = None
+            espera = esperan[i].get(B, ())
+            if len(espera) == 1:
+                A, alt, punto, j = espera[0]
+                if punto + 1 == len(grammar[A][alt-1]):
+                    res = (A, alt, punto+1, j)
+                    if not (A == start and j == 0):
+                        res = mas_alto(j, A) or res
+            leo[clave] = res
+            return res
+
+        for alt in range(1, len(grammar.get(start, [])) + 1):
+            agregar(0, (start, alt, 0, 0))
+
+        lejos = 0
+        for k in range(n+1):
+            lista = conjuntos[k]
+            if lista:
+                lejos = k
+            idx = 0
+            while idx < len(lista):
+                item = lista[idx]; idx += 1
+                X, alt, punto, origen = item
+                rhs = grammar[X][alt-1]
+                if punto < len(rhs):
+                    Y = rhs[punto]
+                    if Y.isupper():
+                        # predicción
+                        esperan[k].setdefault(Y, []).append(item)
+                        for a in range(1, len(grammar.get(Y, [])) + 1):
+                            agregar(k, (Y, a, 0, k))
+                        if Y in anulables:
+                            agregar(k, (X, alt, punto+1, origen))
+                    elif k < n and palabras[k] == Y:
+                        # lectura
+                        agregar(k+1, (X, alt, punto+1, origen))
+                else:
+                    # compleción (el conjunto 'origen' ya está cerrado si origen < k)
+                    fines.setdefault((X, origen), set()).add(k)
+                    arriba = mas_alto(origen, X) if origen < k else None
+                    if arriba is not None:
+                        agregar(k, arriba)
+                        continue
+                    for Z, a2, p2, o2 in tuple(esperan[origen].get(X, ())):
+                        agregar(k, (Z, a2, p2+1, o2))
+
+        if n not in fines.get((start, 0), ()):
+            print("\nTRAZA:")
+            print_state("r", lejos+1, [], [start, "#"], "(6b) sin derivación posible: RECHAZA")
+            return False
+
+        raiz = derivacion_earley(grammar, palabras, fines, start, n)
+        trazar_derivacion(grammar, start, labels, raiz)
+        return True
+    finally:
+        sys.setrecursionlimit(limite)
+
+def derivacion_earley(grammar, palabras, fines, start, n):
+    # Arma una derivación (X, alt, hijos) a partir de los conjuntos de Earley:
+    # en cada no terminal la primera alternativa (en orden) que cubre el
+    # tramo y en cada secuencia el corte más largo que funciona, así la
+    # recursión por la izquierda acierta al primer intento. Los finales de un
+    # símbolo que no es el último de su producción se toman de 'fines'; el
+    # último termina donde termina la producción (con Leo, esas compleciones
+    # intermedias no se registran) y se verifica bajando. Los tramos se
+    # memoizan: el costo es polinomial aunque la gramática sea ambigua.
+    memo_nt, memo_sec = {}, {}
+    activos = set()
+    ordenados = {}   # (Y, p) -> finales de Y desde p, en orden
+
+    def finales(Y, p):
+        lst = ordenados.get((Y, p))
+        if lst is None:
+            lst = ordenados[(Y, p)] = sorted(fines.get((Y, p), ()))
+        return lst
+
+    def nodo(X, i, j):
+        clave = (X, i, j)
+        if clave in memo_nt:
+            return memo_nt[clave]
+        if clave in activos:
+            return None  # X ⇒+ X sobre el mismo tramo: se busca otra derivación
+        activos.add(clave)
+        res = None
+        for alt in range(1, len(grammar.get(X, [])) + 1):
+            hijos = secuencia(X, alt, 0, i, j)
+            if hijos is not False:
+                res = (X, alt, hijos)
+                break
+        activos.discard(clave)
+        if res is not None or not activos:
+            memo_nt[clave] = res
+        return res
+
+    # rhs[k:] de X/alt cubre exactamente palabras[p:j] -> hijos (cons) o False
+    def secuencia(X, alt, k, p, j):
+        rhs = grammar[X][alt-1]
+        if k == len(rhs):
+            return None if p == j else False
+        clave = (X, alt, k, p, j)
+        if clave in memo_sec:
+            return memo_sec[clave]
+        Y = rhs[k]
+        res = False
+        if not Y.isupper():
+            if p < j and palabras[p] == Y:
+                resto = secuencia(X, alt, k+1, p+1, j)
+                if resto is not False:
+                    res = (Y, resto)
+        elif k == len(rhs) - 1:
+            sub = nodo(Y, p, j)
+            if sub is not None:
+                res = (sub, None)
+        else:
+            lst = finales(Y, p)
+            for t in range(bisect_right(lst, j) - 1, -1, -1):
+                q = lst[t]
+                resto = secuencia(X, alt, k+1, q, j)
+                if resto is False:
+                    continue
+                sub = nodo(Y, p, q)
+                if sub is not None:
+                    res = (sub, resto)
+                    break
+        if res is not False or not activos:
+            memo_sec[clave] = res
+        return res
+
+    return nodo(start, 0, n)
+
+def trazar_derivacion(grammar, start, labels, raiz):
+    # Reimprime la derivación aceptada con las reglas (1) y (2)
+    alpha, beta, i = [], [start, "#"], 1
+    print("\nTRAZA:")
+    print_state("n", 1, alpha, beta, "Inicio")
+    pila = [raiz]
+    while pila:
+        nodo = pila.pop()
+        if isinstance(nodo, tuple):
+            X, alt, hijos = nodo
+            label = labels[(X, alt)]
+            beta = grammar[X][alt-1] + beta[1:]
+            alpha.append(label)
+            print_state("n", i, alpha, beta, f"(1) entra {X}, aplica {label}")
+            lista = []
+            while hijos is not None:
+                lista.append(hijos[0]); hijos = hijos[1]
+            pila.extend(reversed(lista))
+        else:
+            beta = beta[1:]
+            alpha.append(nodo)
+            i += 1
+            print_state("n", i, alpha, beta, f"(2) concordancia '{nodo}'")
+    print_state("n", i, alpha, beta, "(3) fin de pila con '#'")
+    print_state("t", i+1, alpha, ["ε"], "ACEPTA")
+
 def main():
     grammar, start, labels = parse_grammar()
     input_syms = read_input_syms()
-    analyze(grammar, start, labels, input_syms)
+    if "--memo" in sys.argv[1:]:
+        analyze_memo(grammar, start, labels, input_syms)
+        return
+    if "--earley" in sys.argv[1:]:
+        analyze_earley(grammar, start, labels, input_syms)
+        return
+    est = nuevas_estadisticas()
+    analyze(grammar, start, labels, input_syms, est)
+    print("\nEstadísticas:", resumen_estadisticas(est))
+    if "--stats" in sys.argv[1:]:
+        k = sys.argv.index("--stats")
+        ruta = sys.argv[k+1] if k+1 < len(sys.argv) else "estadisticas.json"
+        exportar_estadisticas(est, ruta)
+        print(f"Estadísticas guardadas en {ruta}")
 
 if __name__ == "__main__":
     main()
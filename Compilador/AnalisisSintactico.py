@@ -0,0 +1,1358 @@
+# AnalisisSintactico.py
+# Analizador sintáctico sin interfaz: los modos de análisis (retroceso,
+# memoizado, LL(1)), la recuperación de errores y el análisis por trozos en
+# un pool de procesos. No importa tkinter, así que los procesos de trabajo
+# solo cargan este módulo (y Arbol/Gramatica) aunque el pool use 'spawn'.
+# Sintactico.py es la interfaz gráfica encima de este módulo.
+
+import gc, io, json, os, re, sys, threading, time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as EsperaAgotada
+from functools import partial
+from Arbol import Programa, construir_ast, desplazar
+from Gramatica import cargar_o_compilar, describir_conflictos, tabla_ll1
+
+class TrazaSintactica:
+    """
+    Traza por niveles de los analizadores: NADA, DECISIONES (expansiones,
+    fallos y cambios de alternativa, sin cada concordancia ni cada retroceso
+    a la entrada) o COMPLETA. Los pasos se guardan sin formatear en un búfer
+    circular de los últimos 'capacidad' pasos (α y β son pilas enlazadas
+    inmutables, así que guardarlas es O(1)): solo se arman las líneas que se
+    imprimen y, al rechazar, las de los pasos recientes que se vuelcan.
+    """
+    NADA, DECISIONES, COMPLETA = 0, 1, 2
+    __slots__ = ("nivel", "recientes", "formatear", "escribir")
+
+    def __init__(self, nivel, capacidad, formatear, escribir=print):
+        self.nivel = nivel
+        self.recientes = deque(maxlen=capacidad)
+        self.formatear = formatear   # paso -> línea de texto
+        self.escribir = escribir     # línea -> salida (como print)
+
+    def paso(self, nivel, modo, i, alpha, beta, nota, *args):
+        """nota es un formato con {} para args, o una función nota(*args)."""
+        p = (modo, i, alpha, beta, nota, args)
+        self.recientes.append(p)
+        if nivel <= self.nivel:
+            self.escribir(self.formatear(p))
+
+    def encabezado(self):
+        if self.nivel > self.NADA:
+            self.escribir("\nTRAZA:")
+
+    def volcar_recientes(self):
+        """Tras un rechazo: los últimos pasos, si no se imprimieron ya todos."""
+        if self.nivel < self.COMPLETA and self.recientes:
+            self.escribir(f"\nÚltimos {len(self.recientes)} pasos antes del rechazo:")
+            for p in self.recientes:
+                self.escribir(self.formatear(p))
+
+
+class AnalisisInterrumpido(Exception):
+    """El análisis se detuvo por cancelación o por agotar su presupuesto."""
+    def __init__(self, motivo, progreso):
+        super().__init__(
+            f"Análisis interrumpido: {motivo} (posición más lejana {progreso['lejos']} "
+            f"de {progreso['simbolos']}, {progreso['pasos']} pasos, {progreso['retrocesos']} retrocesos)")
+        self.motivo = motivo
+        self.progreso = progreso
+
+
+class LimitesAnalisis:
+    """
+    Presupuesto de pasos y de tiempo, y cancelación desde otro hilo, para un
+    análisis sintáctico. Los analizadores lo consultan cada CADA pasos (o justo
+    al llegar a max_pasos), así que el costo en el bucle es una comparación.
+    """
+    CADA = 1024
+    __slots__ = ("max_pasos", "max_segundos", "_cancelado", "_vence")
+
+    def __init__(self, max_pasos=None, max_segundos=None):
+        self.max_pasos = max_pasos
+        self.max_segundos = max_segundos
+        self._cancelado = threading.Event()
+        self._vence = None
+
+    def iniciar(self):
+        """Arranca el reloj; devuelve el paso del primer control."""
+        self._vence = time.monotonic() + self.max_segundos if self.max_segundos else None
+        return self.proximo_control(0)
+
+    def cancelar(self):
+        self._cancelado.set()
+
+    @property
+    def cancelado(self):
+        return self._cancelado.is_set()
+
+    def restante(self):
+        """Segundos que quedan del presupuesto de tiempo (None = sin límite)."""
+        if self._vence is None:
+            return None
+        return max(0.0, self._vence - time.monotonic())
+
+    def proximo_control(self, pasos):
+        siguiente = pasos + self.CADA
+        if self.max_pasos is not None:
+            siguiente = min(siguiente, self.max_pasos + 1)
+        return siguiente
+
+    def motivo(self, pasos):
+        """None si se puede seguir; si no, por qué hay que parar."""
+        if self._cancelado.is_set():
+            return "cancelado por el usuario"
+        if self.max_pasos is not None and pasos > self.max_pasos:
+            return f"se superó el límite de {self.max_pasos} pasos"
+        if self._vence is not None and time.monotonic() > self._vence:
+            return f"se superó el límite de {self.max_segundos} s"
+        return None
+
+
+class EstadisticasParser:
+    """
+    Contadores de un análisis con retroceso: expansiones por etiqueta de
+    producción (Exp1, TermP2…), concordancias, retrocesos por punto de
+    decisión (no terminal cuya producción se deshizo), profundidad máxima de
+    α y β y tiempo. Sirven para ajustar el orden de las alternativas y para
+    detectar regresiones entre versiones de la gramática.
+    """
+    __slots__ = ("expansiones", "concordancias", "retrocesos", "max_alpha", "max_beta",
+                 "segundos", "_t0")
+
+    def __init__(self):
+        self.expansiones = Counter()
+        self.concordancias = 0
+        self.retrocesos = Counter()
+        self.max_alpha = 0
+        self.max_beta = 0
+        self.segundos = 0.0
+        self._t0 = time.perf_counter()
+
+    def terminar(self):
+        self.segundos = time.perf_counter() - self._t0
+
+    def resumen(self):
+        return (f"{sum(self.expansiones.values())} expansiones, {self.concordancias} concordancias, "
+                f"{sum(self.retrocesos.values())} retrocesos, |α|≤{self.max_alpha}, "
+                f"|β|≤{self.max_beta}, {self.segundos:.3f} s")
+
+    def a_dict(self):
+        return {
+            "expansiones": dict(self.expansiones.most_common()),
+            "total_expansiones": sum(self.expansiones.values()),
+            "concordancias": self.concordancias,
+            "retrocesos": dict(self.retrocesos.most_common()),
+            "total_retrocesos": sum(self.retrocesos.values()),
+            "max_alpha": self.max_alpha,
+            "max_beta": self.max_beta,
+            "segundos": round(self.segundos, 6),
+        }
+
+    def exportar_json(self, ruta):
+        with open(ruta, "w", encoding="utf-8") as f:
+            json.dump(self.a_dict(), f, ensure_ascii=False, indent=2)
+
+
+class SesionSintactica:
+    """
+    Un análisis sintáctico con su propio estado: configuración (MODO, TRAZA,
+    SALIDA, ERROR_SINK...), límites, traza, estadísticas, errores, árbol y
+    las asignaciones capturadas. Cada análisis (o cada hilo/proceso) usa su
+    propia instancia, así que varios pueden correr a la vez sin pisarse.
+    Los atributos de clase son solo los valores por defecto de la
+    configuración; SintacticoApp.nueva_sesion arma una con la de la app.
+    """
+    DEBUG = False
+    MODO = "retroceso"      # "retroceso" (backtracking) | "memo" (retroceso memoizado) | "ll1" (predictivo)
+    TRAZA = TrazaSintactica.COMPLETA   # NADA | DECISIONES | COMPLETA (True/False = COMPLETA/NADA)
+    TRAZA_RECIENTES = 200   # pasos que se vuelcan al rechazar si la traza no era completa
+    MAX_PASOS = None        # presupuesto si no se pasan límites (None = sin límite), ver LimitesAnalisis
+    MAX_SEGUNDOS = None
+    DIR_CACHE = None        # caché de gramáticas compiladas (None = cache_gramaticas/ junto al módulo)
+    SALIDA = None           # destino de traza y avisos (algo con write); None = sys.stdout
+    ESCRIBIR_OPERACIONES = False    # operaciones.txt (archivo compartido) para los scripts sueltos
+    RECUPERAR = True        # al rechazar, otra pasada en modo pánico que junta todos los errores
+    SINCRONIZACION = (";", "end")   # tokens donde se retoma el análisis tras un error
+    ERROR_SINK = None       # hook: recibe la lista de errores (dicts) para la ventana principal
+    PROCESOS = None         # >1: sentencias por trozos en un pool de procesos (ver analizar_en_trozos)
+    SENTENCIAS_POR_TROZO = 2000     # tamaño máximo de cada trozo en ese modo
+    CONFIG = ("DEBUG", "MODO", "TRAZA", "TRAZA_RECIENTES", "MAX_PASOS", "MAX_SEGUNDOS", "DIR_CACHE",
+              "SALIDA", "ESCRIBIR_OPERACIONES", "RECUPERAR", "SINCRONIZACION", "ERROR_SINK",
+              "PROCESOS", "SENTENCIAS_POR_TROZO")
+
+    def __init__(self, limites=None, **config):
+        for nombre, valor in config.items():
+            if nombre not in self.CONFIG:
+                raise TypeError(f"SesionSintactica: configuración desconocida {nombre!r}")
+            setattr(self, nombre, valor)
+        self.limites = limites if limites is not None else LimitesAnalisis(self.MAX_PASOS, self.MAX_SEGUNDOS)
+        self.traza = None           # TrazaSintactica del último análisis
+        self.ultimo_progreso = None # {'pasos', 'lejos', 'retrocesos', 'simbolos', 'interrumpido'} del último análisis
+        self.estadisticas = None    # EstadisticasParser del último análisis con analyze()/analyze_ll1()
+        self.errores = []           # errores de sintaxis del último análisis (ver analizar_con_recuperacion)
+        self.ast = None             # Arbol.Programa de la última entrada aceptada
+        self._total_declared = None # leído de variables.txt
+        self._lex_values = {}       # idx(1-based) -> lexema real para num/strlit/boollit
+        self._lex_lineas = []       # idx(0-based) -> línea del fuente de cada símbolo
+        self._desplazamiento = 0    # trozo de analizar_en_trozos: posición global = local + esto (si > 1)
+        self._operaciones = []      # [(linea, tokens_rhs), ...] capturadas en el último análisis
+        self._clases = {}           # terminal de clase -> {lexema: k}, p.ej. "nomvar" -> {"$a": 1, ...}
+        # --- buffers/control para capturar asignaciones aritméticas ---
+        self._ops_file_path = None  # ruta de operaciones.txt
+        self._rhs_buffer = []       # [{'text': str, 'snap': int}, ...]
+        self._assign_open = None    # {'lhs': str, 'tokens': [], 'snap': int, 'saw_strlit': bool, 'saw_op': bool}
+
+    # ----------------- salida -------------------------------
+    def _escribir(self, texto=""):
+        """Como print(texto), pero hacia SALIDA de esta sesión."""
+        salida = self.SALIDA if self.SALIDA is not None else sys.stdout
+        salida.write(f"{texto}\n")
+
+    # ----------------- utilidades de rutas -----------------
+    def _log(self, msg):
+        if self.DEBUG: self._escribir(msg)
+
+    def _ruta_base(self):
+        return os.path.dirname(__file__)
+
+    def _candidatos_base(self):
+        base = self._ruta_base()
+        return [base, os.path.dirname(base), os.getcwd()]
+
+    def _buscar_en_candidatos(self, nombre_archivo: str) -> str:
+        for base in self._candidatos_base():
+            ruta = os.path.join(base, nombre_archivo)
+            if os.path.exists(ruta):
+                self._log(f"[Sintáctico] Usando {nombre_archivo} en: {ruta}")
+                return ruta
+        ruta_def = os.path.join(self._ruta_base(), nombre_archivo)
+        self._log(f"[Sintáctico] {nombre_archivo} no encontrado. Intentaré en: {ruta_def}")
+        return ruta_def
+
+    # ----------------- lectura de variables ----------------
+    def leer_variables_desde_txt(self, nombre="variables.txt"):
+        ruta = self._buscar_en_candidatos(nombre)
+        vars_list, total_declared = [], None
+        if os.path.exists(ruta):
+            with open(ruta, "r", encoding="utf-8") as f:
+                for ln in f:
+                    t = ln.strip()
+                    if not t:
+                        continue
+                    m = re.search(r'^\s*TOTAL\s*[:=]\s*(\d+)\s*$', t, re.I)
+                    if m:
+                        total_declared = int(m.group(1))
+                        continue
+                    vars_list.append(t)
+        else:
+            self._log(f"[Sintáctico] Advertencia: no existe {ruta}")
+        self._total_declared = total_declared
+        return vars_list
+
+    # ----------------- tokenización ------------------------
+    def leer_cadena_desde_txt(self, nombre="cadena_entrada.txt"):
+        ruta = self._buscar_en_candidatos(nombre)
+        if not os.path.exists(ruta):
+            self._log(f"[Sintáctico] Advertencia: no existe {ruta}")
+            return ["#"]
+
+        # se recorre línea por línea (ningún token cruza un salto de línea),
+        # normalizando comillas curvas y quitando comentarios en cada una, sin
+        # copias del archivo completo
+        def raw_tokens():
+            with open(ruta, "r", encoding="utf-8") as f:
+                for ln, linea in enumerate(f, start=1):
+                    linea = linea.replace("“", "\"").replace("”", "\"")
+                    linea = re.sub(r'#.*?(?=\n|$)', '', linea)
+                    for t in self._PATRON_SIMBOLOS.findall(linea):
+                        yield t, ln
+
+        return self._clasificar_simbolos(raw_tokens())
+
+    _PATRON_SIMBOLOS = re.compile(
+        r'"[^"\n]*"'               # "texto"
+        r'|\$[A-Za-z_]\w*'         # $var
+        r'|\d+(?:\.\d+)?'          # número
+        r'|[A-Za-z]+'              # palabras
+        r'|[,;()=+\-*/]'           # símbolos
+    )
+
+    def simbolos_desde_flujo(self, flujo):
+        """
+        Igual que leer_cadena_desde_txt() pero desde el FlujoTokens del léxico
+        (ver Compilacion.UnidadCompilacion): no se vuelve a leer ni a escanear
+        el fuente. Cadenas, variables, números y booleanos pasan tal cual;
+        comentarios se descartan; el resto se parte con el mismo patrón.
+        """
+        def raw_tokens():
+            for grupo, lexema, ln, _col in flujo:
+                if grupo in ("cadenas", "identificadores", "numeros", "booleanos"):
+                    yield lexema, ln
+                elif grupo != "comentarios":
+                    for t in self._PATRON_SIMBOLOS.findall(lexema):
+                        yield t, ln
+
+        return self._clasificar_simbolos(raw_tokens())
+
+    def _clasificar_simbolos(self, raw_tokens):
+        toks = []
+        self._lex_values = {}
+        self._lex_lineas = []
+        pos = 1  # índice 1-based
+
+        for t, ln in raw_tokens:
+            if not t:
+                continue
+            if t[0] == '"':
+                toks.append("strlit"); self._lex_values[pos] = t
+            elif t[0] == '$':
+                toks.append(t)
+            elif re.fullmatch(r'\d+(?:\.\d+)?', t):
+                toks.append("num"); self._lex_values[pos] = t
+            elif t.lower() in ("verdadero", "falso"):
+                toks.append("boollit"); self._lex_values[pos] = t.lower()
+            else:
+                toks.append(t)
+            self._lex_lineas.append(ln)
+            pos += 1
+
+        if not toks or toks[-1] != "#":
+            toks.append("#")
+            self._lex_lineas.append(self._lex_lineas[-1] if self._lex_lineas else 1)
+        return toks
+
+    # ----------------- gramática ---------------------------
+    def construir_gramatica_fija(self, vars_nomvar):
+        G = {
+            "Sentencia": [["Ini", "Sentencias", "end"]],
+            "Sentencias": [["TipoSent", ";", "Sentencias"], ["TipoSent", ";"]],
+            "TipoSent": [["DeclaracionVar"], ["PideDatos"], ["MostrarDatos"], ["Asignacion"]],
+            "DeclaracionVar": [["tipoDato", "ListaNomvar"]],
+            "ListaNomvar": [["nomvar"], ["nomvar", ",", "ListaNomvar"]],
+            "PideDatos": [["leer", "nomvar"], ["leer"]],
+            "MostrarDatos": [["mostrar", "ListaMostrar"], ["mostrar"]],
+            "ListaMostrar": [["MostrarItem"], ["MostrarItem", ",", "ListaMostrar"]],
+            "MostrarItem": [["nomvar"], ["strlit"]],
+            "Asignacion": [["nomvar", "=", "Exp"], ["nomvar", "=", "strlit"]],
+            "Exp":   [["Term", "ExpP"]],
+            "ExpP":  [["+", "Term", "ExpP"], ["-", "Term", "ExpP"], []],
+            "Term":  [["Factor", "TermP"]],
+            "TermP": [["*", "Factor", "TermP"], ["/", "Factor", "TermP"], []],
+            "Factor":[["num"], ["nomvar"], ["boollit"], ["(", "Exp", ")"]],
+            "tipoDato": [["ente"], ["dec"], ["carac"], ["cade"], ["bool"]],
+        }
+        self._clases = self._indice_clases(vars_nomvar)
+        labels = {(nt, i+1): f"{nt}{i+1}" for nt, alts in G.items() for i in range(len(alts))}
+        return G, "Sentencia", labels
+
+    def construir_gramatica_ll1(self, vars_nomvar):
+        """
+        La misma gramática que construir_gramatica_fija, pasada por
+        Gramatica.transformar_gramatica: factorizada por la izquierda (las
+        colas comunes pasan a NTs con 'P', p.ej. ListaNomvar -> nomvar
+        ListaNomvarP) y sin recursión por la izquierda, así que es LL(1).
+        """
+        c = self.compilar_gramatica_ll1(vars_nomvar)
+        return c["gramatica"], c["inicio"], c["etiquetas"]
+
+    def compilar_gramatica_ll1(self, vars_nomvar):
+        """
+        Gramática LL(1) compilada (tabla, FIRST/FOLLOW, etiquetas; ver
+        Gramatica.compilar_gramatica) desde la caché en DIR_CACHE, indexada
+        por la huella de la gramática: solo se recalcula si la gramática cambió.
+        """
+        G, start, _labels = self.construir_gramatica_fija(vars_nomvar)
+        dir_cache = self.DIR_CACHE or os.path.join(self._ruta_base(), "cache_gramaticas")
+        c = cargar_o_compilar(G, start, dir_cache, transformar=True)
+        for linea in describir_conflictos(c["conflictos"]):
+            self._escribir(f"[Aviso] {linea}")
+        return c
+
+    def _indice_clases(self, vars_nomvar):
+        """
+        'nomvar' es un terminal de clase, no un no terminal con una alternativa
+        por variable: concuerda con cualquier variable declarada consultando
+        este índice (O(1)) en vez de probar y retroceder hasta V veces. El
+        número k de cada variable es el de su antigua alternativa nomvarK.
+        """
+        return {"nomvar": {v: k for k, v in enumerate(vars_nomvar or [], start=1)}}
+
+    # ----------------- helpers ------------------------------
+    @staticmethod
+    def alpha_to_str(alpha): return " ".join(alpha) if alpha else "ε"
+    @staticmethod
+    def beta_to_str(beta):  return " ".join(beta)
+    def _fmt_token(self, tok, idx_1based):
+        val = self._lex_values.get(idx_1based)
+        if tok in ("num", "strlit", "boollit") and val is not None:
+            return f"{tok}({val})"
+        return f"'{tok}'"
+    def _fmt_concordancia(self, X, a, idx_1based):
+        indice = self._clases.get(X)
+        if indice is not None:
+            return f"{X}{indice[a]}({a})"
+        return self._fmt_token(X, idx_1based)
+    def _concuerda(self, X, a):
+        return X == a or a in self._clases.get(X, ())
+    def _clase_de(self, a):
+        for clase, indice in self._clases.items():
+            if a in indice:
+                return clase
+        return a
+    def _lexema(self, tok, idx_1based):
+        if tok in ("num", "strlit", "boollit"):
+            return self._lex_values.get(idx_1based, tok)
+        return tok
+    def _ultimo_match_terminal(self, actions):
+        for k in range(len(actions) - 1, -1, -1):
+            a = actions[k]
+            if a.get("kind") == "match":
+                return a["lexema"], k
+        return None, -1
+    @staticmethod
+    def _apilar(simbolos, resto):
+        for s in reversed(simbolos):
+            resto = (s, resto)
+        return resto
+    @staticmethod
+    def _desde_pila(pila, invertir=False):
+        lista = []
+        while pila is not None:
+            lista.append(pila[0]); pila = pila[1]
+        if invertir: lista.reverse()
+        return lista
+    def _linea_estado(self, mode, i, alpha, beta, note):
+        return f"( {mode}, {i}, {self.alpha_to_str(alpha)}, {self.beta_to_str(beta)} )".ljust(75) + " " + note
+    def print_state(self, mode, i, alpha, beta, note):
+        self._escribir(self._linea_estado(mode, i, alpha, beta, note))
+
+    # ----------------- traza ---------------------------------
+    def _progreso(self, pasos, lejos, retrocesos, n_syms, motivo=None):
+        self.ultimo_progreso = {"pasos": pasos, "lejos": lejos, "retrocesos": retrocesos,
+                               "simbolos": n_syms, "interrumpido": motivo}
+        return self.ultimo_progreso
+    def _controlar(self, limites, pasos, lejos, retrocesos, n_syms):
+        """Lanza AnalisisInterrumpido si hay que parar; si no, el próximo paso a controlar."""
+        motivo = limites.motivo(pasos)
+        if motivo is not None:
+            raise AnalisisInterrumpido(motivo, self._progreso(pasos, lejos, retrocesos, n_syms, motivo))
+        return limites.proximo_control(pasos)
+    def _nueva_traza(self):
+        nivel = self.TRAZA
+        if nivel is True: nivel = TrazaSintactica.COMPLETA
+        elif nivel is False: nivel = TrazaSintactica.NADA
+        self.traza = TrazaSintactica(nivel, self.TRAZA_RECIENTES, self._formatear_paso, self._escribir)
+        return self.traza
+    def _formatear_paso(self, paso):
+        # α y β llegan como pilas (cima, resto): α con lo último arriba
+        mode, i, alpha, beta, nota, args = paso
+        if callable(nota): nota = nota(*args)
+        elif args: nota = nota.format(*args)
+        return self._linea_estado(mode, i, self._desde_pila(alpha, invertir=True), self._desde_pila(beta), nota)
+    def _nota_concordancia(self, X, a, idx_1based):
+        return f"(2) concordancia {self._fmt_concordancia(X, a, idx_1based)}"
+    def _nota_no_concuerda(self, X, a, idx_1based, fin=""):
+        return f"(4) no concuerda: {self._fmt_token(X, idx_1based)} ≠ {self._fmt_token(a, idx_1based)}{fin}"
+    def _nota_sin_produccion(self, X, a, idx_1based):
+        return f"(4) ninguna producción de {X} empieza con {self._fmt_token(a, idx_1based)}: RECHAZA"
+
+    # ----------------- captura de operaciones ----------------
+    def _preparar_operaciones(self):
+        # buffers / archivo
+        self._rhs_buffer = []
+        self._assign_open = None
+        self._operaciones = []
+        self.ast = None
+        if not self.ESCRIBIR_OPERACIONES:
+            return
+        if self._ops_file_path is None:
+            self._ops_file_path = os.path.join(self._ruta_base(), "operaciones.txt")
+        # limpiar archivo al inicio
+        try:
+            with open(self._ops_file_path, "w", encoding="utf-8") as _:
+                pass
+        except Exception as e:
+            self._log(f"[Sintáctico] No pude crear/limpiar operaciones.txt: {e}")
+
+    def _volcar_operaciones(self):
+        # volcar buffer sin duplicados
+        try:
+            seen = set(); lines = []
+            self._operaciones = []
+            for it in self._rhs_buffer:
+                t = it["text"]
+                if t not in seen:
+                    seen.add(t); lines.append(t)
+                    self._operaciones.append((f"{it['lhs']} = {' '.join(it['tokens'])}", it["tokens"]))
+            if self.ESCRIBIR_OPERACIONES:
+                with open(self._ops_file_path, "w", encoding="utf-8") as f:
+                    for t in lines: f.write(t + "\n")
+        except Exception as e:
+            self._log(f"[Sintáctico] Error al escribir operaciones.txt: {e}")
+
+    def _capturar_operaciones(self, input_syms):
+        """
+        Captura de asignaciones en una sola pasada sobre la entrada ACEPTADA:
+        en la derivación final cada terminal se concuerda una vez y en orden,
+        así que el resultado es el mismo que la captura incremental de analyze().
+        """
+        self._rhs_buffer = []
+        abierta = None
+        for pos, X in enumerate(input_syms, start=1):
+            if X == "=":
+                lhs = input_syms[pos-2] if pos >= 2 else None
+                abierta = {"lhs": lhs, "tokens": [], "saw_strlit": False, "saw_op": False}
+            elif X == ";" and abierta is not None:
+                if not abierta["saw_strlit"] and abierta["saw_op"] and abierta["tokens"] and abierta["lhs"]:
+                    rhs_text = " ".join(abierta["tokens"])
+                    self._rhs_buffer.append({"text": f"{abierta['lhs']} = {rhs_text} ;", "snap": 0,
+                                            "lhs": abierta["lhs"], "tokens": abierta["tokens"]})
+                abierta = None
+            elif abierta is not None:
+                if X == "strlit":
+                    abierta["saw_strlit"] = True
+                if X in ("+", "-", "*", "/"):
+                    abierta["saw_op"] = True
+                abierta["tokens"].append(self._lexema(X, pos))
+        self._volcar_operaciones()
+
+    # ----------------- árbol sintáctico ----------------------
+    def _construir_ast(self, grammar, labels, derivacion, input_syms):
+        """Arma self.ast (Arbol.Programa) desde la derivación aceptada (ver Arbol.construir_ast)."""
+        simbolos = [self._lexema(t, k) for k, t in enumerate(input_syms, start=1)]
+        lineas = self._lex_lineas
+        if len(lineas) < len(simbolos):
+            lineas = [None] * len(simbolos)     # símbolos que no vienen de _clasificar_simbolos
+        self.ast = construir_ast(grammar, labels, derivacion, simbolos, lineas)
+        return self.ast
+
+    @staticmethod
+    def _derivacion_de_raiz(raiz, labels):
+        """Etiquetas y terminales en preorden de un árbol (X, alt, hijos) de analyze_memo."""
+        pila = [raiz]
+        while pila:
+            nodo = pila.pop()
+            if isinstance(nodo, tuple):
+                X, alt, hijos = nodo
+                yield labels[(X, alt)]
+                lista = []
+                while hijos is not None:
+                    lista.append(hijos[0]); hijos = hijos[1]
+                pila.extend(reversed(lista))
+            else:
+                yield nodo
+
+    # ----------------- analizador predictivo (LL(1)) -------
+    def analyze_ll1(self, grammar, start, labels, input_syms, tabla=None):
+        """
+        Análisis predictivo sin retroceso: en cada paso la tabla LL(1) decide
+        la única producción posible, así que el tiempo es lineal en la entrada.
+        La traza muestra los mismos pasos (1) expandir / (2) concordar /
+        (3) fin que el modo con retroceso, en el formato ( n, i, α, β ).
+        Los límites de la sesión pueden cortar el análisis con AnalisisInterrumpido.
+        """
+        if tabla is None:
+            tabla, _conflictos = tabla_ll1(grammar, start)
+        DEC, COMP = TrazaSintactica.DECISIONES, TrazaSintactica.COMPLETA
+        traza = self._nueva_traza()
+        beta = (start, ("#", None))
+        alpha = None
+        i = 1
+        n_syms = len(input_syms)
+        limites = self.limites
+        pasos, control = 0, limites.iniciar()
+        estad = self.estadisticas = EstadisticasParser()
+        expansiones, largo_b, max_b = estad.expansiones, 2, 2
+        self._preparar_operaciones()
+
+        def cerrar_estadisticas():
+            # sin retroceso α solo crece: su máximo es el final
+            estad.concordancias = i - 1
+            estad.max_alpha = sum(expansiones.values()) + i - 1
+            estad.max_beta = max_b
+            estad.terminar()
+
+        traza.encabezado()
+        traza.paso(DEC, "n", 1, alpha, beta, "Inicio")
+
+        while True:
+            pasos += 1
+            if pasos >= control:
+                try:
+                    control = self._controlar(limites, pasos, i, 0, n_syms)
+                except AnalisisInterrumpido:
+                    cerrar_estadisticas(); raise
+            X = beta[0]
+            a = input_syms[i-1] if i <= n_syms else "#"
+
+            if X == "#" and a == "#":
+                traza.paso(DEC, "n", i, alpha, beta, "(3) fin de pila con '#'")
+                self._capturar_operaciones(input_syms)
+                self._construir_ast(grammar, labels, self._desde_pila(alpha, invertir=True), input_syms)
+                traza.paso(DEC, "t", i+1, alpha, ("ε", None), "ACEPTA")
+                self._progreso(pasos, i, 0, n_syms)
+                cerrar_estadisticas()
+                return True
+
+            if X in grammar:
+                alt = tabla.get((X, self._clase_de(a)))
+                if alt is None:
+                    traza.paso(DEC, "e", i, alpha, beta, self._nota_sin_produccion, X, a, i)
+                    traza.volcar_recientes()
+                    self._progreso(pasos, i, 0, n_syms)
+                    cerrar_estadisticas()
+                    return False
+                label = labels[(X, alt)]
+                rhs = grammar[X][alt-1]
+                beta = self._apilar(rhs, beta[1])
+                alpha = (label, alpha)
+                expansiones[label] += 1
+                largo_b += len(rhs) - 1
+                if largo_b > max_b: max_b = largo_b
+                traza.paso(DEC, "n", i, alpha, beta, "(1) entra {}, aplica {}", X, label)
+                continue
+
+            if self._concuerda(X, a):
+                beta = beta[1]
+                alpha = (a, alpha)
+                i += 1
+                largo_b -= 1
+                traza.paso(COMP, "n", i, alpha, beta, self._nota_concordancia, X, a, i-1)
+                continue
+
+            traza.paso(DEC, "e", i, alpha, beta, self._nota_no_concuerda, X, a, i, ": RECHAZA")
+            traza.volcar_recientes()
+            self._progreso(pasos, i, 0, n_syms)
+            cerrar_estadisticas()
+            return False
+
+    # ----------------- recuperación de errores (modo pánico) --
+    def _error_sintaxis(self, i, esperados, a):
+        linea = self._lex_lineas[i-1] if i <= len(self._lex_lineas) else None
+        encontrado = "fin de entrada" if a == "#" else self._fmt_token(a, i)
+        lista = ["fin de entrada" if t == "#" else f"'{t}'" for t in esperados]
+        esperado = lista[0] if len(lista) == 1 else "uno de " + ", ".join(lista)
+        if linea is not None:
+            donde = f"Línea {linea}"
+        else:
+            donde = f"Símbolo {i + self._desplazamiento if i > 1 else i}"
+        return {"mensaje": f"Error de sintaxis!!! {donde}: se esperaba {esperado} y se encontró {encontrado}",
+                "linea": linea, "posicion": i, "esperados": list(esperados), "encontrado": a}
+
+    def analizar_con_recuperacion(self, grammar, start, labels, input_syms, tabla=None):
+        """
+        Pasada predictiva (LL(1), sin traza) que no se detiene en el primer
+        error: lo registra (línea, terminales esperados, token encontrado),
+        descarta la entrada hasta el siguiente token de SINCRONIZACION y
+        desapila hasta un símbolo que pueda seguir desde ahí. Tras ';' se
+        retoma con el token siguiente (la sentencia rota queda cerrada).
+        Devuelve la lista de errores ([] si la entrada es válida).
+        """
+        if tabla is None:
+            tabla, _conflictos = tabla_ll1(grammar, start)
+        esperados_de = {}
+        for (nt, t) in tabla:
+            esperados_de.setdefault(nt, []).append(t)
+        for ts in esperados_de.values():
+            ts.sort(key=lambda t: (t == "#", t))
+
+        def acepta(X, a):
+            if X in grammar:
+                return (X, self._clase_de(a)) in tabla
+            return self._concuerda(X, a)
+
+        pila = ["#", start]          # cima al final
+        errores = []
+        n_syms = len(input_syms)
+        i = 1
+        while True:
+            X = pila[-1]
+            a = input_syms[i-1] if i <= n_syms else "#"
+            if X == "#" and a == "#":
+                return errores
+            if X in grammar:
+                alt = tabla.get((X, self._clase_de(a)))
+                if alt is None and len(grammar[X]) == 1:
+                    alt = 1     # producción única: el error se reporta en su primer terminal
+                if alt is not None:
+                    pila.pop()
+                    pila.extend(reversed(grammar[X][alt-1]))
+                    continue
+                esperados = esperados_de.get(X, [])
+            elif self._concuerda(X, a):
+                pila.pop()
+                i += 1
+                continue
+            else:
+                esperados = [X]
+
+            if not errores or errores[-1]["posicion"] != i:
+                errores.append(self._error_sintaxis(i, esperados, a))
+            if len(pila) == 1:
+                # solo queda '#' (p.ej. un 'end' de más cerró el programa): lo que
+                # sigue es un único error, no uno por cada token restante
+                return errores
+            # descartar hasta un token de sincronización (o el fin)
+            while a != "#" and a not in self.SINCRONIZACION:
+                i += 1
+                a = input_syms[i-1] if i <= n_syms else "#"
+            if a == ";":
+                # la sentencia rota termina en este ';': se cierra y se sigue con lo que va después
+                i += 1
+                if ";" in pila:
+                    del pila[len(pila) - 1 - pila[::-1].index(";"):]
+                    continue
+                a = input_syms[i-1] if i <= n_syms else "#"
+            # desapilar hasta el primer símbolo que pueda seguir con 'a'
+            for k in range(len(pila) - 1, -1, -1):
+                if acepta(pila[k], a):
+                    del pila[k+1:]
+                    break
+            else:
+                # nadie espera este token: se descarta, pero queda reportado
+                X = pila[-1]
+                esperados = esperados_de.get(X, []) if X in grammar else [X]
+                if errores[-1]["posicion"] != i:
+                    errores.append(self._error_sintaxis(i, esperados, a))
+                i += 1
+
+    # ----------------- retroceso memoizado (packrat) ----------
+    def analyze_memo(self, grammar, start, labels, input_syms):
+        """
+        Mismo resultado que analyze() (acepta la misma entrada y elige la misma
+        derivación: la primera en el orden en que el retroceso prueba las
+        alternativas), pero cada intento (no terminal, posición) se deriva una
+        sola vez. Cada intento es un flujo perezoso y memoizado de las
+        posiciones finales DISTINTAS que alcanza, en orden de búsqueda, con la
+        primera derivación de cada una: retroceder es pedirle al flujo su
+        siguiente resultado, nunca volver a derivar un subárbol. El tiempo pasa
+        de exponencial a polinomial (lineal si la entrada se acepta sin dudas).
+        Con traza se reimprime la derivación aceptada con las reglas (1)/(2)/(3).
+        La recursión por la izquierda (que colgaría a analyze()) aquí se corta.
+        Los pasos que cuentan para los límites son los avances de los flujos, y
+        los retrocesos, las veces que un flujo pasa a otra alternativa.
+        """
+        n_syms = len(input_syms)
+        flujos = {}   # (X, i) o (X, alt, k, i) -> _Flujo
+        lejos = 1     # posición más lejana concordada (para el mensaje de rechazo)
+        limites = self.limites
+        pasos, retrocesos, control = 0, 0, limites.iniciar()
+
+        def sym(i):
+            return input_syms[i-1] if i <= n_syms else "#"
+
+        # Cada flujo que se está avanzando es un generador que pide con
+        # 'yield (clave, idx)' los resultados de los flujos de los que depende
+        # y recibe la respuesta con send(); obtener() los lleva en una pila
+        # explícita, así que la profundidad de la derivación no depende de la
+        # recursión de Python (como construir_ast).
+        def obtener(clave, idx):
+            """Resultado idx del flujo 'clave' (lo calcula si hace falta) o None."""
+            pila = []
+            while True:
+                f = flujos.get(clave)
+                if f is None:
+                    f = flujos[clave] = _Flujo()
+                if idx < len(f.res):
+                    valor = f.res[idx]
+                elif f.fin or f.activo:
+                    valor = None    # agotado, o recursión por la izquierda: se corta
+                else:
+                    pila.append(producir(clave, f, idx))
+                    valor = None
+                while True:
+                    if not pila:
+                        return valor
+                    try:
+                        clave, idx = pila[-1].send(valor)
+                        break
+                    except StopIteration as hecho:
+                        pila.pop()
+                        valor = hecho.value
+
+        def producir(clave, f, idx):
+            nonlocal pasos, control
+            res = f.res
+            f.activo = True
+            while len(res) <= idx and not f.fin:
+                pasos += 1
+                if pasos >= control:
+                    control = self._controlar(limites, pasos, lejos, retrocesos, n_syms)
+                if len(clave) == 2:
+                    yield from avanzar_nt(clave, f)
+                else:
+                    yield from avanzar_sec(clave, f)
+            f.activo = False
+            return res[idx] if idx < len(res) else None
+
+        # (X, i) -> [(j, nodo)]; nodo = (X, alt, hijos)
+        def avanzar_nt(clave, f):
+            nonlocal retrocesos
+            X, i = clave
+            alt = f.alt
+            if alt > len(grammar[X]):
+                f.fin = True
+                return
+            r = yield (X, alt, 0, i), f.b
+            if r is None:
+                f.alt += 1; f.b = 0
+                retrocesos += 1
+                return
+            f.b += 1
+            j, hijos = r
+            if j not in f.vistos:
+                f.vistos.add(j); f.res.append((j, (X, alt, hijos)))
+
+        # (X, alt, k, i): rhs[k:] desde i -> [(j, hijos)]; hijos es una lista
+        # enlazada (arbol, resto) para compartir sufijos sin copiar
+        def avanzar_sec(clave, f):
+            nonlocal lejos
+            X, alt, k, i = clave
+            rhs = grammar[X][alt-1]
+            if k == len(rhs):
+                f.res.append((i, None)); f.fin = True
+                return
+            Y = rhs[k]
+            if Y in grammar:
+                e = yield (Y, i), f.a
+            elif f.a == 0 and self._concuerda(Y, sym(i)):
+                e = (i+1, Y)
+                lejos = max(lejos, i+1)
+            else:
+                e = None
+            if e is None:
+                f.fin = True
+                return
+            j, arbol = e
+            r = yield (X, alt, k+1, j), f.b
+            if r is None:
+                f.a += 1; f.b = 0
+                return
+            f.b += 1
+            m, hijos = r
+            if m not in f.vistos:
+                f.vistos.add(m); f.res.append((m, (arbol, hijos)))
+
+        self._preparar_operaciones()
+        # los flujos son muchos contenedores de vida larga: el recolector
+        # cíclico solo recorrería una y otra vez la memo sin liberar nada
+        _pausar_gc()
+        try:
+            raiz, idx = None, 0
+            while (r := obtener((start, 1), idx)) is not None:
+                if sym(r[0]) == "#":
+                    raiz = r[1]
+                    break
+                idx += 1
+        finally:
+            flujos.clear()      # la derivación elegida no depende de la memo
+            _reanudar_gc()
+
+        traza = self._nueva_traza()
+        if raiz is None:
+            traza.encabezado()
+            traza.paso(TrazaSintactica.DECISIONES, "e", lejos, None, (start, ("#", None)),
+                       "(6b) sin más alternativas: RECHAZA")
+            self._progreso(pasos, lejos, retrocesos, n_syms)
+            return False
+
+        self._progreso(pasos, lejos, retrocesos, n_syms)
+        self._capturar_operaciones(input_syms)
+        self._construir_ast(grammar, labels, self._derivacion_de_raiz(raiz, labels), input_syms)
+        if traza.nivel > TrazaSintactica.NADA:
+            self._trazar_derivacion(grammar, start, labels, raiz, input_syms, traza)
+        return True
+
+    def _trazar_derivacion(self, grammar, start, labels, raiz, input_syms, traza):
+        """Reimprime una derivación (X, alt, hijos) como pasos (1) expandir / (2) concordar."""
+        DEC, COMP = TrazaSintactica.DECISIONES, TrazaSintactica.COMPLETA
+        alpha, beta, i = None, (start, ("#", None)), 1
+        traza.encabezado()
+        traza.paso(DEC, "n", 1, alpha, beta, "Inicio")
+        pila = [raiz]
+        while pila:
+            nodo = pila.pop()
+            if isinstance(nodo, tuple):
+                X, alt, hijos = nodo
+                label = labels[(X, alt)]
+                beta = self._apilar(grammar[X][alt-1], beta[1])
+                alpha = (label, alpha)
+                traza.paso(DEC, "n", i, alpha, beta, "(1) entra {}, aplica {}", X, label)
+                lista = []
+                while hijos is not None:
+                    lista.append(hijos[0]); hijos = hijos[1]
+                pila.extend(reversed(lista))
+            else:
+                a = input_syms[i-1]
+                beta = beta[1]
+                alpha = (a, alpha)
+                i += 1
+                traza.paso(COMP, "n", i, alpha, beta, self._nota_concordancia, nodo, a, i-1)
+        traza.paso(DEC, "n", i, alpha, beta, "(3) fin de pila con '#'")
+        traza.paso(DEC, "t", i+1, alpha, ("ε", None), "ACEPTA")
+
+    # ----------------- analizador (backtracking) ------------
+    def analyze(self, grammar, start, labels, input_syms):
+        """
+        Retroceso con α y β como listas enlazadas inmutables (cima, resto):
+        expandir, concordar y retroceder comparten la cola en O(1) en vez de
+        copiar la pila, y cada punto de decisión guarda el α/β previos a su
+        expansión, así que volver a X es restaurarlos tal cual. Con traza
+        COMPLETA el retroceso se sigue imprimiendo paso a paso con (5)/(6c).
+        Los límites de la sesión pueden cortar el análisis con AnalisisInterrumpido.
+        """
+        DEC, COMP = TrazaSintactica.DECISIONES, TrazaSintactica.COMPLETA
+        traza = self._nueva_traza()
+        paso_a_paso = traza.nivel >= COMP
+        beta = (start, ("#", None))
+        alpha = None
+        mode = "n"
+        i = 1
+        n_syms = len(input_syms)
+        actions, decisions = [], []
+        limites = self.limites
+        pasos, lejos, retrocesos, control = 0, 1, 0, limites.iniciar()
+        estad = self.estadisticas = EstadisticasParser()
+        expansiones, retrocesos_nt = estad.expansiones, estad.retrocesos
+        concordancias, largo_a, largo_b, max_a, max_b = 0, 0, 2, 0, 2
+
+        def cerrar_estadisticas():
+            estad.concordancias, estad.max_alpha, estad.max_beta = concordancias, max_a, max_b
+            estad.terminar()
+
+        self._preparar_operaciones()
+
+        def purgar_capturas():
+            # descartar capturas hechas por debajo del punto al que se volvió
+            if self._assign_open is not None and len(actions) < self._assign_open["snap"]:
+                self._assign_open = None
+            while self._rhs_buffer and self._rhs_buffer[-1]["snap"] > len(actions):
+                self._rhs_buffer.pop()
+
+        traza.encabezado()
+        traza.paso(DEC, "n", 1, alpha, beta, "Inicio")
+
+        while True:
+            pasos += 1
+            if pasos >= control:
+                try:
+                    control = self._controlar(limites, pasos, lejos, retrocesos, n_syms)
+                except AnalisisInterrumpido:
+                    cerrar_estadisticas(); raise
+            a = input_syms[i-1] if i <= n_syms else "#"
+
+            # Éxito
+            if beta[0] == "#" and beta[1] is None and a == "#":
+                traza.paso(DEC, "n", i, alpha, beta, "(3) fin de pila con '#'")
+                self._volcar_operaciones()
+                self._construir_ast(grammar, labels, self._desde_pila(alpha, invertir=True), input_syms)
+                traza.paso(DEC, "t", i+1, alpha, ("ε", None), "ACEPTA")
+                self._progreso(pasos, lejos, retrocesos, n_syms)
+                cerrar_estadisticas()
+                return True
+
+            if mode == "n":
+                X = beta[0]
+
+                # expandir no terminal
+                if X in grammar:
+                    rhss = grammar[X]
+                    if not rhss:
+                        mode = "r"
+                        traza.paso(DEC, "r", i, alpha, beta, "(4) no hay producciones para no terminal")
+                        continue
+                    label = labels[(X, 1)]
+                    decisions.append({"X": X, "alt": 1, "i0": i, "alpha": alpha, "beta": beta,
+                                      "n_actions": len(actions), "largos": (largo_a, largo_b)})
+                    beta = self._apilar(rhss[0], beta[1])
+                    alpha = (label, alpha)
+                    expansiones[label] += 1
+                    largo_a += 1; largo_b += len(rhss[0]) - 1
+                    if largo_a > max_a: max_a = largo_a
+                    if largo_b > max_b: max_b = largo_b
+                    actions.append({"kind":"expand","detail":label,"nonterm":X,"alt":1})
+                    traza.paso(DEC, "n", i, alpha, beta, "(1) entra {}, aplica {}", X, label)
+                    continue
+
+                # concordancia de terminal
+                if self._concuerda(X, a):
+                    i_before = i  # índice del token a consumir
+
+                    # === CAPTURA de asignación completa LHS = RHS ; (backtracking-safe) ===
+                    if X == "=":
+                        prev_tok, _ = self._ultimo_match_terminal(actions)
+                        lhs = prev_tok if isinstance(prev_tok, str) else None
+                        self._assign_open = {
+                            "lhs": lhs,
+                            "tokens": [],
+                            "snap": len(actions),
+                            "saw_strlit": False,
+                            "saw_op": False  # <-- SOLO guardamos si hay + - * /
+                        }
+
+                    elif X == ";" and self._assign_open is not None:
+                        # cerrar: guardar SOLO si no hubo strlit y sí hubo operador
+                        ao = self._assign_open
+                        if not ao["saw_strlit"] and ao["saw_op"] and ao["tokens"] and ao["lhs"]:
+                            rhs_text = " ".join(ao["tokens"])
+                            linea = f"{ao['lhs']} = {rhs_text} ;"
+                            self._rhs_buffer.append({"text": linea, "snap": ao["snap"],
+                                                    "lhs": ao["lhs"], "tokens": list(ao["tokens"])})
+                        self._assign_open = None
+
+                    elif self._assign_open is not None:
+                        # aún dentro de la RHS
+                        if X == "strlit":
+                            self._assign_open["saw_strlit"] = True
+                        if X in ("+", "-", "*", "/"):
+                            self._assign_open["saw_op"] = True
+                        lex = self._lexema(a, i_before)
+                        self._assign_open["tokens"].append(lex)
+                    # === FIN CAPTURA ===
+
+                    beta = beta[1]
+                    alpha = (a, alpha)
+                    actions.append({"kind":"match","detail":X,"lexema":a})
+                    i += 1
+                    if i > lejos: lejos = i
+                    concordancias += 1
+                    largo_a += 1; largo_b -= 1
+                    if largo_a > max_a: max_a = largo_a
+                    traza.paso(COMP, "n", i, alpha, beta, self._nota_concordancia, X, a, i_before)
+                    continue
+
+                traza.paso(DEC, "r", i, alpha, beta, self._nota_no_concuerda, X, a, i)
+                mode = "r"
+                continue
+
+            # --------- retroceso ----------
+            if not decisions:
+                traza.paso(DEC, "e", i, alpha, beta, "(6b) sin más alternativas: RECHAZA")
+                traza.volcar_recientes()
+                self._progreso(pasos, lejos, retrocesos, n_syms)
+                cerrar_estadisticas()
+                return False
+
+            # deshacer último match (solo para imprimirlo: sin traza completa
+            # se salta directo al punto de decisión)
+            if paso_a_paso and actions[-1]["kind"] == "match":
+                last = actions.pop()
+                i -= 1
+                beta = (last["detail"], beta)
+                alpha = alpha[1]
+                largo_a -= 1; largo_b += 1
+                purgar_capturas()
+                traza.paso(COMP, "r", i, alpha, beta, "(5) retroceso a la entrada")
+                continue
+
+            # volver a X: restaurar el estado guardado al expandirlo
+            dp = decisions[-1]
+            X = dp["X"]; rhss = grammar[X]; tried_alt = dp["alt"]
+            i, alpha, beta = dp["i0"], dp["alpha"], dp["beta"]
+            largo_a, largo_b = dp["largos"]
+            del actions[dp["n_actions"]:]
+            purgar_capturas()
+            retrocesos += 1
+            retrocesos_nt[X] += 1
+            traza.paso(DEC, "r", i, alpha, beta, "(6c) deshacer producción {}{} (volver a {})", X, tried_alt, X)
+
+            # siguiente alternativa
+            next_alt = tried_alt + 1
+            if next_alt <= len(rhss):
+                new_label = labels[(X, next_alt)]
+                beta = self._apilar(rhss[next_alt-1], beta[1])
+                alpha = (new_label, alpha)
+                expansiones[new_label] += 1
+                largo_a += 1; largo_b += len(rhss[next_alt-1]) - 1
+                if largo_a > max_a: max_a = largo_a
+                if largo_b > max_b: max_b = largo_b
+                actions.append({"kind":"expand","detail":new_label,"nonterm":X,"alt":next_alt})
+                dp["alt"] = next_alt
+                traza.paso(DEC, "n", i, alpha, beta, "(6a) siguiente alternativa de {}: aplica {}", X, new_label)
+                mode = "n"
+            else:
+                decisions.pop()
+
+    # ----------------- análisis completo / por trozos ----------
+    def _analizar_secuencial(self, vars_nomvar, input_syms):
+        """
+        Un análisis en el MODO de la sesión sobre toda la entrada y, si la
+        rechaza y RECUPERAR está activo, la pasada de recuperación que deja
+        todos los errores en self.errores.
+        """
+        if self.MODO == "ll1":
+            c = self.compilar_gramatica_ll1(vars_nomvar)
+            grammar, start, labels = c["gramatica"], c["inicio"], c["etiquetas"]
+            analizar = partial(self.analyze_ll1, tabla=c["tabla"])
+        elif self.MODO == "memo":
+            grammar, start, labels = self.construir_gramatica_fija(vars_nomvar)
+            analizar = self.analyze_memo
+        else:
+            grammar, start, labels = self.construir_gramatica_fija(vars_nomvar)
+            analizar = self.analyze
+        ok = analizar(grammar, start, labels, input_syms)
+        self.errores = []
+        if not ok and self.RECUPERAR:
+            c = self.compilar_gramatica_ll1(vars_nomvar)
+            self.errores = self.analizar_con_recuperacion(c["gramatica"], c["inicio"], c["etiquetas"],
+                                                        input_syms, c["tabla"])
+        return ok
+
+    def _partir_en_trozos(self, input_syms, por_trozo):
+        """
+        [(p0, p1)] 1-based e inclusivos: las sentencias entre 'Ini' y 'end'
+        agrupadas de a 'por_trozo', cortando después de un ';'. El lenguaje es
+        Ini (TipoSent ;)+ end y ';' no aparece dentro de ninguna sentencia,
+        así que todo ';' es de primer nivel. None si la entrada no tiene esa
+        forma (se analiza entera).
+        """
+        n = len(input_syms)
+        if n < 4 or input_syms[0] != "Ini" or input_syms[-2] != "end" or input_syms[-1] != "#":
+            return None
+        trozos, p0, cuenta = [], 2, 0
+        for p in range(2, n - 1):
+            if input_syms[p-1] == ";":
+                cuenta += 1
+                if cuenta == por_trozo:
+                    trozos.append((p0, p))
+                    p0, cuenta = p + 1, 0
+        if p0 <= n - 2:
+            trozos.append((p0, n - 2))     # lo que queda tras el último ';' (o sin ';')
+        return trozos
+
+    def analizar_en_trozos(self, vars_nomvar, input_syms, procesos=None):
+        """
+        Análisis por sentencias en paralelo: la entrada se parte en los ';'
+        de primer nivel (ver _partir_en_trozos), cada trozo se analiza como
+        'Ini <sentencias> end' con la misma gramática y el mismo MODO en un
+        pool de 'procesos' procesos, y los resultados se unen en orden: un
+        solo Arbol.Programa con spans globales, las asignaciones capturadas
+        (sin repetir, como en el análisis completo) y los errores con su
+        línea real. Acepta exactamente lo mismo que el análisis completo; los
+        errores solo pueden diferir cuando la recuperación de uno cruzaría el
+        corte entre dos trozos (el trozo siguiente arranca limpio).
+        No hay traza por paso (cada trozo corre con TRAZA=NADA) ni
+        estadísticas. Cada trozo corre con lo que queda del presupuesto de la
+        sesión (max_pasos y segundos) y se corta solo; mientras espera, la
+        sesión consulta sus límites cada 0.1 s y, al cancelar o agotarlos,
+        termina los procesos del pool sin esperar a los trozos en curso. El
+        max_pasos total cuenta los pasos de los trozos ya terminados. Si la
+        entrada no tiene la forma esperada o cabe en un trozo, se analiza
+        entera como siempre.
+        En Windows los procesos nuevos re-importan el script principal: usar
+        este modo desde un script con 'if __name__ == "__main__":'.
+        """
+        procesos = procesos or os.cpu_count() or 1
+        n_syms = len(input_syms)
+        total = input_syms.count(";")
+        por_trozo = max(1, min(self.SENTENCIAS_POR_TROZO, -(-total // procesos)))
+        trozos = self._partir_en_trozos(input_syms, por_trozo)
+        if not trozos or len(trozos) < 2:
+            return self._analizar_secuencial(vars_nomvar, input_syms)
+
+        self._preparar_operaciones()
+        self.errores = []
+        # compilar (o cargar de la caché) antes del pool: los procesos solo leen el archivo
+        if self.MODO == "ll1" or self.RECUPERAR:
+            self.compilar_gramatica_ll1(vars_nomvar)
+        else:
+            self.construir_gramatica_fija(vars_nomvar)
+        limites = self.limites
+        limites.iniciar()
+        # cada trozo corre con su propio LimitesAnalisis (lo que queda del presupuesto):
+        # la cancelación no cruza procesos, para eso se cortan los procesos abajo
+        config = {"MODO": self.MODO, "RECUPERAR": self.RECUPERAR, "SINCRONIZACION": self.SINCRONIZACION,
+                  "DIR_CACHE": self.DIR_CACHE, "MAX_PASOS": limites.max_pasos,
+                  "MAX_SEGUNDOS": limites.restante()}
+        valores, lineas = self._lex_values, self._lex_lineas
+        if len(lineas) < n_syms:
+            lineas = [None] * n_syms
+
+        def tarea(p0, p1):
+            # salvo el primero, cada trozo va detrás de una sentencia 'leer ;' de
+            # relleno: el analizador llega a sus sentencias en el mismo estado que
+            # tras un ';' del programa entero (mismos terminales esperados)
+            relleno = ["leer", ";"] if p0 > 2 else []
+            base = 2 + len(relleno)     # posición local de p0
+            syms = ["Ini"] + relleno + input_syms[p0-1:p1] + ["end", "#"]
+            vals = {k - p0 + base: valores[k] for k in range(p0, p1 + 1) if k in valores}
+            # 'Ini'/'end' sintéticos con la línea del símbolo real más cercano
+            lins = [lineas[p0-2]] * (base - 1) + lineas[p0-1:p1] + [lineas[p1], lineas[-1]]
+            return (config, vars_nomvar, syms, vals, lins, p0 - base, 1 if relleno else 0)
+
+        self._escribir(f"Análisis por trozos: {total} sentencias en {len(trozos)} trozos, {procesos} procesos")
+        pasos, lejos, ok = 0, n_syms, True
+        sentencias, capturas = [], []
+        pool = ProcessPoolExecutor(max_workers=procesos)
+        try:
+            futuros = [pool.submit(_analizar_trozo, *tarea(p0, p1)) for p0, p1 in trozos]
+            for (p0, p1), futuro in zip(trozos, futuros):
+                while True:
+                    motivo = limites.motivo(pasos)
+                    if motivo is not None:
+                        raise AnalisisInterrumpido(motivo, self._progreso(pasos, p0, 0, n_syms, motivo))
+                    try:
+                        r = futuro.result(timeout=0.1)
+                        break
+                    except EsperaAgotada:
+                        continue
+                    except Exception as e:
+                        # p.ej. un árbol demasiado hondo para pickle: ese trozo se analiza aquí
+                        self._log(f"[Sintáctico] trozo {p0}-{p1} falló en el pool ({e!r}); se analiza aquí")
+                        r = _analizar_trozo(*tarea(p0, p1))
+                        break
+                if r["salida"]:
+                    self._escribir(r["salida"].rstrip("\n"))
+                pasos += r["pasos"]
+                if r["interrumpido"] is not None:
+                    motivo = r["interrumpido"]
+                    raise AnalisisInterrumpido(motivo, self._progreso(pasos, r["lejos"], 0, n_syms, motivo))
+                if r["ok"]:
+                    sentencias.extend(r["sentencias"])
+                    capturas.extend(r["capturas"])
+                else:
+                    if ok:
+                        lejos = r["lejos"]
+                    ok = False
+                    self.errores.extend(r["errores"])
+        except BaseException:
+            _cortar_pool(pool)
+            raise
+        pool.shutdown()
+
+        self._progreso(pasos, lejos, 0, n_syms)
+        if not ok:
+            return False
+        self._rhs_buffer = capturas
+        self._volcar_operaciones()
+        simbolos = [self._lexema(t, k) for k, t in enumerate(input_syms, start=1)]
+        self.ast = Programa(sentencias, simbolos, lineas, 1, n_syms - 1, lineas[0])
+        return True
+
+    # ----------------- API p/botón --------------------------
+    def analizar_sintactico(self, unidad=None):
+        """
+        Sin 'unidad' lee variables.txt y cadena_entrada.txt como siempre.
+        Con una Compilacion.UnidadCompilacion usa sus variables y su flujo de
+        tokens en memoria, y le deja las asignaciones capturadas en
+        unidad.operaciones y el árbol (Arbol.Programa) en unidad.ast para el
+        código intermedio.
+        Con los límites de la sesión el análisis puede cancelarse o cortarse
+        por pasos/tiempo: lanza AnalisisInterrumpido con el progreso parcial.
+        """
+        if unidad is not None:
+            vars_nomvar = list(unidad.variables)
+        else:
+            vars_nomvar = self.leer_variables_desde_txt("variables.txt")
+            total_decl = self._total_declared
+            if total_decl is not None and total_decl != len(vars_nomvar):
+                raise ValueError(
+                    f"TOTAL declarado en variables.txt = {total_decl}, "
+                    f"pero se encontraron {len(vars_nomvar)} variables listadas."
+                )
+        if not vars_nomvar:
+            self._escribir("[Aviso] No se leyeron variables; 'nomvar' quedará vacío.")
+        self.estadisticas = None
+        if unidad is not None:
+            input_syms = self.simbolos_desde_flujo(unidad.flujo)
+        else:
+            input_syms = self.leer_cadena_desde_txt("cadena_entrada.txt")
+        if (self.PROCESOS or 1) > 1:
+            ok = self.analizar_en_trozos(vars_nomvar, input_syms, self.PROCESOS)
+        else:
+            ok = self._analizar_secuencial(vars_nomvar, input_syms)
+        if not ok and self.RECUPERAR:
+            self._escribir(f"\nErrores de sintaxis ({len(self.errores)}):")
+            for e in self.errores:
+                self._escribir(f"  {e['mensaje']}")
+        sink = self.ERROR_SINK
+        if sink is not None:
+            try:
+                sink(list(self.errores))
+            except Exception:
+                pass
+        if unidad is not None:
+            unidad.operaciones = list(self._operaciones) if ok else None
+            unidad.ast = self.ast if ok else None
+        return ok
+
+
+# pausa del recolector cíclico compartida por las sesiones que corren a la vez
+# (hilos): se apaga con la primera y se vuelve a encender al terminar la última
+_gc_pausas = 0
+_gc_reactivar = False
+_gc_cerrojo = threading.Lock()
+
+
+def _pausar_gc():
+    global _gc_pausas, _gc_reactivar
+    with _gc_cerrojo:
+        if _gc_pausas == 0:
+            _gc_reactivar = gc.isenabled()
+            gc.disable()
+        _gc_pausas += 1
+
+
+def _reanudar_gc():
+    global _gc_pausas
+    with _gc_cerrojo:
+        _gc_pausas -= 1
+        if _gc_pausas == 0 and _gc_reactivar:
+            gc.enable()
+
+
+class _Flujo:
+    """Estado de un flujo de analyze_memo: resultados, alternativa e índices en curso."""
+    __slots__ = ("res", "vistos", "alt", "a", "b", "fin", "activo")
+
+    def __init__(self):
+        self.res = []           # [(posición final, derivación)] distintos, en orden de búsqueda
+        self.vistos = set()
+        self.alt = 1
+        self.a = self.b = 0
+        self.fin = self.activo = False
+
+
+def _cortar_pool(pool):
+    """
+    Corta un pool sin esperar a los trozos que ya están corriendo:
+    future.cancel() solo quita los que no arrancaron, así que los procesos
+    se terminan (y se esperan, que ya no tardan).
+    """
+    procesos = list((pool._processes or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for proceso in procesos:
+        proceso.terminate()
+    for proceso in procesos:
+        proceso.join()
+
+
+def _analizar_trozo(config, vars_nomvar, syms, valores, lineas, desplazamiento, relleno):
+    """
+    Trabajo de cada proceso de analizar_en_trozos: analiza un trozo
+    'Ini [relleno] <sentencias> end #' en una sesión propia y devuelve lo que
+    hace falta para unirlo, ya en posiciones globales (posición local p > 1
+    -> p + desplazamiento) y sin las 'relleno' sentencias del principio.
+    Las líneas llegan ya globales.
+    """
+    salida = io.StringIO()
+    ses = SesionSintactica(TRAZA=TrazaSintactica.NADA, TRAZA_RECIENTES=0, SALIDA=salida, **config)
+    ses._lex_values, ses._lex_lineas = valores, lineas
+    ses._desplazamiento = desplazamiento    # los mensajes sin línea ya citan el símbolo global
+    try:
+        ok = ses._analizar_secuencial(vars_nomvar, syms)
+    except AnalisisInterrumpido as e:
+        # se devuelve en vez de propagarse: el proceso padre la vuelve a lanzar
+        lejos = e.progreso["lejos"]
+        return {"ok": False, "interrumpido": e.motivo, "pasos": e.progreso["pasos"],
+                "lejos": lejos + desplazamiento if lejos > 1 else lejos, "salida": salida.getvalue()}
+    sentencias = ses.ast.sentencias[relleno:] if ok else []
+    desplazar(sentencias, desplazamiento)
+    for e in ses.errores:
+        if e["posicion"] > 1:
+            e["posicion"] += desplazamiento
+    lejos = ses.ultimo_progreso["lejos"] if ses.ultimo_progreso else 1
+    return {"ok": ok, "interrumpido": None, "sentencias": sentencias, "capturas": ses._rhs_buffer, "errores": ses.errores,
+            "pasos": ses.ultimo_progreso["pasos"] if ses.ultimo_progreso else 0,
+            "lejos": lejos + desplazamiento if lejos > 1 else lejos, "salida": salida.getvalue()}
@@ -0,0 +1,282 @@
+# Arbol.py
+# Árbol sintáctico abstracto (AST) que arma el sintáctico al aceptar:
+#   Programa -> [Declaracion | Leer | Mostrar | Asignacion]
+#   expresiones: Binaria(op, izq, der) | Numero | Variable | Booleano | Cadena
+# Cada nodo lleva su span (inicio, fin) en posiciones 1-based de los símbolos
+# de entrada y la línea del fuente donde empieza; Programa guarda esos
+# símbolos para recuperar el texto de cualquier nodo sin re-tokenizar.
+# Las etapas de código intermedio consumen las expresiones desde aquí.
+
+
+class NodoAST:
+    __slots__ = ("inicio", "fin", "linea")
+
+    def __init__(self, inicio, fin, linea):
+        self.inicio, self.fin, self.linea = inicio, fin, linea
+
+    def __repr__(self):
+        # los campos propios primero y al final los de NodoAST (inicio, fin, linea)
+        campos = [s for c in type(self).__mro__ for s in c.__dict__.get("__slots__", ())]
+        return f"{type(self).__name__}({', '.join(f'{c}={getattr(self, c)!r}' for c in campos)})"
+
+
+# ----------------- expresiones ---------------------------
+
+class Numero(NodoAST):
+    __slots__ = ("valor",)
+
+    def __init__(self, valor, inicio, fin, linea):
+        NodoAST.__init__(self, inicio, fin, linea)
+        self.valor = valor
+
+
+class Variable(NodoAST):
+    __slots__ = ("nombre",)
+
+    def __init__(self, nombre, inicio, fin, linea):
+        NodoAST.__init__(self, inicio, fin, linea)
+        self.nombre = nombre
+
+
+class Booleano(NodoAST):
+    __slots__ = ("valor",)
+
+    def __init__(self, valor, inicio, fin, linea):
+        NodoAST.__init__(self, inicio, fin, linea)
+        self.valor = valor
+
+
+class Cadena(NodoAST):
+    __slots__ = ("valor",)
+
+    def __init__(self, valor, inicio, fin, linea):
+        NodoAST.__init__(self, inicio, fin, linea)
+        self.valor = valor
+
+
+class Binaria(NodoAST):
+    __slots__ = ("op", "izq", "der")
+
+    def __init__(self, op, izq, der, inicio, fin, linea):
+        NodoAST.__init__(self, inicio, fin, linea)
+        self.op, self.izq, self.der = op, izq, der
+
+
+# ----------------- sentencias ----------------------------
+
+class Declaracion(NodoAST):
+    __slots__ = ("tipo", "nombres")
+
+    def __init__(self, tipo, nombres, inicio, fin, linea):
+        NodoAST.__init__(self, inicio, fin, linea)
+        self.tipo, self.nombres = tipo, nombres
+
+
+class Leer(NodoAST):
+    __slots__ = ("variable",)       # Variable o None ('leer' solo)
+
+    def __init__(self, variable, inicio, fin, linea):
+        NodoAST.__init__(self, inicio, fin, linea)
+        self.variable = variable
+
+
+class Mostrar(NodoAST):
+    __slots__ = ("items",)          # [Variable | Cadena]
+
+    def __init__(self, items, inicio, fin, linea):
+        NodoAST.__init__(self, inicio, fin, linea)
+        self.items = items
+
+
+class Asignacion(NodoAST):
+    __slots__ = ("destino", "valor")   # Variable, expresión o Cadena
+
+    def __init__(self, destino, valor, inicio, fin, linea):
+        NodoAST.__init__(self, inicio, fin, linea)
+        self.destino, self.valor = destino, valor
+
+
+class Programa(NodoAST):
+    __slots__ = ("sentencias", "simbolos", "lineas")
+
+    def __init__(self, sentencias, simbolos, lineas, inicio, fin, linea):
+        NodoAST.__init__(self, inicio, fin, linea)
+        self.sentencias = sentencias
+        self.simbolos = simbolos    # lexema de cada símbolo de entrada (1-based vía span)
+        self.lineas = lineas
+
+    def texto(self, nodo):
+        """Texto fuente (tokens separados por espacio) que cubre el span del nodo."""
+        return " ".join(self.simbolos[nodo.inicio-1:nodo.fin])
+
+
+# ----------------- construcción desde la derivación ------
+
+class _Parcial(list):
+    """Valor de un no terminal de lista (Sentencias, ListaNomvar...): se aplana al final."""
+    __slots__ = ()
+
+
+def _aplanar(valores):
+    # iterativo: las listas de sentencias son recursivas por la derecha
+    salida, pila = [], [(valores, 0)]
+    while pila:
+        lista, k = pila.pop()
+        while k < len(lista):
+            v = lista[k]
+            k += 1
+            if type(v) is _Parcial:
+                pila.append((lista, k))
+                pila.append((v, 0))
+                break
+            if isinstance(v, NodoAST):
+                salida.append(v)
+    return salida
+
+
+def _reducir(X, vals, inicio, fin, linea, simbolos, lineas):
+    if X == "Factor":
+        if len(vals) == 3:
+            # ( Exp ): la expresión se queda con el span de los paréntesis
+            e = vals[1]
+            e.inicio, e.fin, e.linea = inicio, fin, linea
+            return e
+        return vals[0]
+    if X in ("ExpP", "TermP"):
+        # cola (op, operando) como lista enlazada: plegar sin copiar
+        return ((vals[0], vals[1]), vals[2]) if vals else None
+    if X in ("Exp", "Term"):
+        acc, cola = vals
+        while cola is not None:
+            (op, der), cola = cola
+            acc = Binaria(op, acc, der, acc.inicio, der.fin, acc.linea)
+        return acc
+    if X == "tipoDato":
+        return vals[0]
+    if X == "DeclaracionVar":
+        return Declaracion(vals[0], _aplanar(vals[1:]), inicio, fin, linea)
+    if X == "PideDatos":
+        variables = _aplanar(vals[1:])
+        return Leer(variables[0] if variables else None, inicio, fin, linea)
+    if X == "MostrarDatos":
+        return Mostrar(_aplanar(vals[1:]), inicio, fin, linea)
+    if X == "Asignacion":
+        return Asignacion(vals[0], _aplanar(vals[2:])[0], inicio, fin, linea)
+    if X == "Sentencia":
+        return Programa(_aplanar(vals), simbolos, lineas, inicio, fin, linea)
+    return _Parcial(vals)
+
+
+# terminales que son hojas del AST; los demás (palabras clave, puntuación) quedan como su lexema
+_HOJAS = {"nomvar": Variable, "num": Numero, "boollit": Booleano, "strlit": Cadena}
+
+
+def construir_ast(grammar, labels, derivacion, simbolos, lineas):
+    """
+    AST a partir de una derivación por la izquierda aceptada: 'derivacion'
+    da en orden las etiquetas de producción (p.ej. "Exp1") y los terminales
+    concordados, como queda α al aceptar. 'simbolos'/'lineas' son el lexema
+    y la línea de cada símbolo de entrada. Sirve igual para la gramática
+    fija y para su versión LL(1) (los NT 'P' nuevos se aplanan solos).
+    """
+    producciones = {lab: (X, grammar[X][alt-1]) for (X, alt), lab in labels.items()}
+    items = iter(derivacion)
+    n_lineas = len(lineas)
+    pos = 1
+
+    def abrir():
+        X, rhs = producciones[next(items)]
+        linea = lineas[pos-1] if pos <= n_lineas else (lineas[-1] if lineas else 1)
+        return [X, rhs, 0, [], pos, linea]
+
+    pila = [abrir()]
+    while True:
+        marco = pila[-1]
+        X, rhs, k, vals, inicio, linea = marco
+        # terminales seguidos del mismo marco sin volver al ciclo externo
+        while k < len(rhs):
+            Y = rhs[k]
+            k += 1
+            if Y in grammar:
+                marco[2] = k
+                pila.append(abrir())
+                break
+            next(items)
+            hoja = _HOJAS.get(Y)
+            vals.append(hoja(simbolos[pos-1], pos, pos, lineas[pos-1]) if hoja else simbolos[pos-1])
+            pos += 1
+        else:
+            pila.pop()
+            valor = _reducir(X, vals, inicio, pos-1, linea, simbolos, lineas)
+            if not pila:
+                return valor
+            pila[-1][3].append(valor)
+
+
+def desplazar(nodos, delta):
+    """
+    Suma delta a los spans de los nodos y de todo lo que cuelga de ellos:
+    para pasar a posiciones globales un fragmento analizado por separado
+    (ver SesionSintactica.analizar_en_trozos). Sin recursión.
+    """
+    pila = list(nodos)
+    while pila:
+        n = pila.pop()
+        n.inicio += delta
+        n.fin += delta
+        for campo in _campos_hijos(type(n)):
+            v = getattr(n, campo)
+            if isinstance(v, NodoAST):
+                pila.append(v)
+            elif isinstance(v, list):
+                pila.extend(h for h in v if isinstance(h, NodoAST))
+
+
+_hijos_de = {}
+
+def _campos_hijos(clase):
+    campos = _hijos_de.get(clase)
+    if campos is None:
+        campos = _hijos_de[clase] = tuple(s for c in clase.__mro__
+                                          for s in c.__dict__.get("__slots__", ())
+                                          if s not in NodoAST.__slots__)
+    return campos
+
+
+# ----------------- consultas para las etapas siguientes --
+
+def operaciones(programa):
+    """
+    [(texto, Asignacion)] de las asignaciones aritméticas (con al menos un
+    operador), sin repetir el mismo texto: lo mismo que operaciones.txt.
+    """
+    vistos, salida = set(), []
+    for s in programa.sentencias:
+        if isinstance(s, Asignacion) and isinstance(s.valor, Binaria):
+            texto = f"{s.destino.nombre} = {programa.texto(s.valor)}"
+            if texto not in vistos:
+                vistos.add(texto)
+                salida.append((texto, s))
+    return salida
+
+
+def convertir(expr, hoja, binaria):
+    """
+    Reconstruye una expresión con los nodos de otra etapa: hoja(texto) para
+    operandos y binaria(op, izq, der) para operadores, en postorden y sin
+    recursión (expresiones largas tipo a + b + c + ...).
+    """
+    valores, pila = [], [(expr, False)]
+    while pila:
+        n, listo = pila.pop()
+        if isinstance(n, Binaria):
+            if listo:
+                der = valores.pop(); izq = valores.pop()
+                valores.append(binaria(n.op, izq, der))
+            else:
+                pila.append((n, True)); pila.append((n.der, False)); pila.append((n.izq, False))
+        elif isinstance(n, Variable):
+            valores.append(hoja(n.nombre))
+        else:
+            valores.append(hoja(n.valor))
+    return valores[0]
@@ -0,0 +1,32 @@
+# Compilacion.py
+# Front-end único del compilador: el programa se analiza léxicamente UNA vez
+# por compilación y todas las etapas (sintáctico, semántico y código
+# intermedio) reciben ese mismo flujo de tokens en memoria, en lugar de releer
+# cadena_entrada.txt / operaciones.txt y re-tokenizarlos cada una con sus
+# propias reglas. Los archivos se siguen escribiendo para los scripts sueltos.
+
+from Lexico import FlujoTokens, armar_tabla, extraer_variables
+
+
+class UnidadCompilacion:
+    """
+    Lo que una compilación comparte entre etapas:
+      texto, flujo, tokendatos, errores -> resultado del léxico (una sola pasada)
+      variables                         -> $identificadores en orden de aparición
+      ultima_linea                      -> línea del fin de archivo (para 'EOF')
+      operaciones                       -> [(linea, tokens_rhs), ...] que captura
+                                           el sintáctico; None hasta que corre
+      ast                               -> Arbol.Programa de la entrada aceptada
+                                           (None hasta que corre el sintáctico)
+    Cada etapa convierte 'flujo' a su propio formato de entrada
+    (SesionSintactica.simbolos_desde_flujo, SemanticoApp.tokenize_flujo).
+    """
+
+    def __init__(self, texto, flujo=None):
+        self.texto = texto
+        self.flujo = flujo if flujo is not None else FlujoTokens.desde_texto(texto)
+        self.tokendatos, self.errores = armar_tabla(self.flujo)
+        self.variables = extraer_variables(self.tokendatos)
+        self.ultima_linea = max(1, texto.count("\n") + (0 if texto.endswith("\n") else 1))
+        self.operaciones = None
+        self.ast = None
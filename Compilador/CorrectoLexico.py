@@ -1,43 +1,14 @@
 import tkinter as tk
 from tkinter import filedialog, scrolledtext, ttk
-import re
-import difflib
-import json
 import os
+from Lexico import (LexicoIncremental, guardar_tokens_para_sintactico, guardarVariables, guardarCadenaEntrada)
 from Sintactico import (SintacticoApp)
 from Semantico import (SemanticoApp)
+from Compilacion import UnidadCompilacion
 import sys, subprocess
 from tkinter import messagebox
 
 
-tokens = {
-    'palabras_clave': ['Ini', 'end', 'mostrar', 'leer'],
-    'tipos': ['ente', 'dec', 'carac', 'cade', 'bool'],
-    'booleanos': ['verdadero', 'falso'],
-    'operadores': ['=', r'\+', '-', r'\*', '/'],
-    'caracteres': [r'\(', r'\)', r';', r','],
-    'comentarios': r'#.*',
-    'identificadores': r'\$[a-zA-Z_][a-zA-Z0-9_]*',
-    'numeros': r'\d+(\.\d+)?',
-    'cadenas': r'"[^"]*"',
-    'espacios_blanco': r'\s+',
-    'desconocidos': r'[^\s]+',
-}
-
-Patrones = {
-    'palabras_clave': re.compile(r'\b(?:' + '|'.join(tokens['palabras_clave']) + r')\b'),
-    'tipos': re.compile(r'\b(?:' + '|'.join(tokens['tipos']) + r')\b'),
-    'booleanos': re.compile(r'\b(?:' + '|'.join(tokens['booleanos']) + r')\b'),
-    'operadores': re.compile(r'|'.join(tokens['operadores'])),
-    'comentarios': re.compile(tokens['comentarios']),
-    'identificadores': re.compile(tokens['identificadores']),
-    'numeros': re.compile(tokens['numeros']),
-    'cadenas': re.compile(tokens['cadenas']),
-    'espacios_blanco': re.compile(tokens['espacios_blanco']),
-    'desconocidos': re.compile(tokens['desconocidos']),
-    'caracteres': re.compile('|'.join(tokens['caracteres'])),
-}
-
 ventana = tk.Tk()
 ventana.title("Compilador")
 ventana.geometry("1100x700")
@@ -53,6 +24,7 @@ tk.Button(arribaframe1, text="Cargar Archivo", command=lambda: CargarArchivo(),
 tk.Button(arribaframe1, text="Limpiar", command=lambda: Limpiar(), font=("Arial", 10, "bold"), width=18, height=2, bg="lightgreen", fg="black").pack(side=tk.LEFT, padx=5)
 codigotexto = scrolledtext.ScrolledText(lefframe1, height=25, font=("Courier", 12), bg="#eef3ff")
 codigotexto.pack(fill=tk.BOTH, expand=True, padx=5)
+codigotexto.tag_config("error", background="red", foreground="white")
 muestraerrores = tk.LabelFrame(lefframe1, text="Errores detectados")
 muestraerrores.pack(fill=tk.X, padx=5, pady=5)
 erroresmensaje = scrolledtext.ScrolledText(muestraerrores, height=6, font=("Arial", 11), bg="lightgreen", fg="darkred", wrap=tk.WORD)
@@ -63,22 +35,33 @@ erroresmensaje.config(state='disabled')
 framebotones = tk.Frame(frame1)
 framebotones.pack(side=tk.RIGHT, fill=tk.Y, padx=10)
 
-def correr_semantico():
-    from Semantico import App
-    SemanticoApp = App()
-    # Hook para mandar errores al panel principal
-    SemanticoApp.ERROR_SINK = mostrar_errores_semantico_en_principal
+# Resultado del último "Léxico": las demás etapas lo reciben en memoria en vez
+# de re-tokenizar cadena_entrada.txt / operaciones.txt (ver Compilacion.py).
+unidad_actual = None
 
-    # 1) Pre-chequeo sin abrir ventanas
-    ok, errores, _roots = SemanticoApp._precheck_semantic()
+def correr_sintactico():
+    # El análisis corre en un hilo: los errores llegan al panel por after()
+    SintacticoApp.ERROR_SINK = lambda errores: ventana.after(0, mostrar_errores_sintactico_en_principal, errores)
+    SintacticoApp.run(parent=framebotones.winfo_toplevel(), unidad=unidad_actual)
 
-    # 2) Manda errores (si hay) al panel de la ventana principal
-    if errores:
-        mostrar_errores_semantico_en_principal(errores)
-    SemanticoApp.open_grammar_first(parent=ventana, auto_run=True)
+def correr_semantico():
+    # Hook para mandar errores al panel principal; open_grammar_first hace el
+    # pre-chequeo sin abrir ventanas y manda los errores (si hay) por ahí
+    SemanticoApp.ERROR_SINK = mostrar_errores_semantico_en_principal
+    SemanticoApp.open_grammar_first(parent=ventana, auto_run=True, unidad=unidad_actual)
 
     
 def abrir_codigo_intermedio():
+    # Si el sintáctico ya capturó las operaciones de esta compilación, la
+    # ventana 2x2 se abre aquí mismo (Toplevel) con su AST en memoria
+    if unidad_actual is not None and unidad_actual.operaciones is not None:
+        try:
+            from NP_PC_T_C import Ventana2x2
+            Ventana2x2(master=ventana, operaciones=unidad_actual.operaciones, programa=unidad_actual.ast)
+            return
+        except Exception as e:
+            messagebox.showerror("Error", f"No pude abrir Código intermedio:\n{e}")
+            return
     # Ruta al script que abre la ventana 2x2
     base = os.path.dirname(os.path.abspath(__file__))
     script = os.path.join(base, "NP_PC_T_C.py")
@@ -95,7 +78,7 @@ def abrir_codigo_intermedio():
 
 
 tk.Button(framebotones, text="Léxico", command=lambda: analizar(), bg="lightgreen", fg="black", width=20, height=2, font=("Arial", 10, "bold")).pack(pady=5)
-boton_sintactico = tk.Button(framebotones,text="Sintáctico",command=lambda: SintacticoApp.run(parent=framebotones.winfo_toplevel()),bg="lightgreen", fg="black", width=20, height=2, font=("Arial", 10, "bold")).pack(pady=5)
+boton_sintactico = tk.Button(framebotones,text="Sintáctico",command=correr_sintactico,bg="lightgreen", fg="black", width=20, height=2, font=("Arial", 10, "bold")).pack(pady=5)
 boton_semantico = tk.Button(framebotones,text="Semántico",command=correr_semantico,bg="lightgreen", fg="black", width=20, height=2, font=("Arial", 10, "bold"))
 boton_semantico.pack(pady=5)
 tk.Button(framebotones,text="Código intermedio",command=abrir_codigo_intermedio,bg="lightgreen", fg="black",width=20, height=2, font=("Arial", 10, "bold")).pack(pady=5)
@@ -121,10 +104,57 @@ def MarcarError(linea, start_col, end_col):
     start = f"{linea}.{start_col}"
     end = f"{linea}.{end_col}"
     codigotexto.tag_add("error", start, end)
-    codigotexto.tag_config("error", background="red", foreground="white")
 
 def LimpiarColores():
-    codigotexto.tag_delete("error")
+    codigotexto.tag_remove("error", "1.0", tk.END)
+
+# Léxico incremental: cada modificación del editor re-analiza solo las líneas
+# que tocó y actualiza sus marcas de error; las demás marcas se desplazan
+# solas con el texto. El comando Tcl del widget pasa por _ComandoEditor, que
+# ve cada insert/delete/replace (teclado, pegar, deshacer o desde el código)
+# con sus índices, así que nunca hace falta leer ni comparar todo el texto.
+estado_lexico = LexicoIncremental()
+
+def ActualizarLexico(primera, viejas, nuevas):
+    # las 'viejas' líneas desde 'primera' son ahora 'nuevas' líneas del editor
+    texto = codigotexto.get(f"{primera}.0", f"{primera + nuevas - 1}.end")
+    estado_lexico.reemplazar(primera, viejas, texto.split("\n"))
+    codigotexto.tag_remove("error", f"{primera}.0", f"{primera + nuevas}.0")
+    for linea, inicio, fin in estado_lexico.marcas(primera, nuevas):
+        MarcarError(linea, inicio, fin)
+
+class _ComandoEditor:
+    EDICIONES = ("insert", "delete", "replace")
+
+    def __init__(self, widget):
+        self.tk = widget.tk
+        self.original = widget._w + "_original"
+        self.tk.call("rename", widget._w, self.original)
+        self.tk.createcommand(widget._w, self)
+
+    def _linea(self, indice):
+        return int(self.tk.call(self.original, "index", indice).split(".")[0])
+
+    def __call__(self, op, *args):
+        # como el redirector de IDLE: un TclError que escapara de aquí cortaría
+        # el mainloop, así que los errores del widget se devuelven como ""
+        try:
+            if op not in self.EDICIONES:
+                return self.tk.call(self.original, op, *args)
+            # líneas que toca la edición, antes de hacerla
+            indices = args[:1] if op == "insert" else args if op == "delete" else args[:2]
+            if op == "delete" and len(args) % 2:
+                indices += (f"{args[-1]}+1c",)      # borra un carácter, quizá un salto de línea
+            total = self._linea("end-1c")
+            lineas = [min(self._linea(i), total) for i in indices]
+            primera, viejas = min(lineas), max(lineas) - min(lineas) + 1
+            resultado = self.tk.call(self.original, op, *args)
+        except tk.TclError:
+            return ""
+        ActualizarLexico(primera, viejas, viejas + self._linea("end-1c") - total)
+        return resultado
+
+_ComandoEditor(codigotexto)
 
 def mostrar_errores_semantico_en_principal(lista_errores):
     # Muestra los errores del semántico en la caja de errores de la ventana principal
@@ -141,24 +171,20 @@ def mostrar_errores_semantico_en_principal(lista_errores):
     erroresmensaje.config(state='disabled')
 
 
-def ClasificarToken(token):
-    if token in tokens['palabras_clave'] or token in tokens['tipos'] or token in tokens['booleanos']:
-        return "Palabra Reservada"
-    elif Patrones['identificadores'].fullmatch(token):
-        return "Identificador"
-    elif Patrones['operadores'].fullmatch(token):
-        return "Operador"
-    elif Patrones['caracteres'].fullmatch(token):
-        return "Carácter"
-    elif Patrones['numeros'].fullmatch(token):
-        return "Carácter"
+def mostrar_errores_sintactico_en_principal(lista_errores):
+    # Muestra los errores de sintaxis (todos, no solo el primero) en la caja de errores
+    erroresmensaje.config(state='normal')
+
+    texto_actual = erroresmensaje.get("1.0", "end-1c").strip()
+    separador = "\n\n" if texto_actual else ""
+
+    if not lista_errores:
+        erroresmensaje.insert(tk.END, f"{separador}Sin errores sintácticos.\n")
     else:
-        return "Otro"
+        erroresmensaje.insert(tk.END, f"{separador}Errores sintácticos:\n" + "\n".join(e["mensaje"] for e in lista_errores) + "\n")
+
+    erroresmensaje.config(state='disabled')
 
-def SugerirToken(token):
-    todoslosvalidos = tokens['palabras_clave'] + tokens['tipos'] + tokens['booleanos']
-    sugerencia = difflib.get_close_matches(token, todoslosvalidos, n=1, cutoff=0.6)
-    return sugerencia[0] if sugerencia else None
 
 def MostrarTabla(tokens_data):
     ventanatabla = tk.Toplevel(ventana)
@@ -187,7 +213,8 @@ def MostrarTabla(tokens_data):
     tk.Button(ventanatabla, text="Regresar", command=ventanatabla.destroy, font=("Arial", 10, "bold"), bg="lightgreen", fg="black", width=15).pack(pady=10)
 
 def analizar():
-    LimpiarColores()
+    global unidad_actual
+    unidad_actual = None
     erroresmensaje.config(state='normal')
     erroresmensaje.delete('1.0', tk.END)
 
@@ -202,78 +229,16 @@ def analizar():
         return  # NO analiza nada
 
     erroresmensaje.config(state='disabled')
-    errores = []
-    texto = codigotexto.get("1.0", tk.END).split('\n')
-    tokendatos = {}
-
-    for lineno, linea in enumerate(texto, start=1):
-        col = 0
-        while col < len(linea):
-            if linea[col] == '"':
-                token = '"'
-                if token not in tokendatos:
-                    tokendatos[token] = {"tipo": "Carácter", "lineas": [lineno]}
-                else:
-                    tokendatos[token]["lineas"].append(lineno)
-                col += 1
-                while col < len(linea) and linea[col] != '"':
-                    col += 1
-                if col < len(linea) and linea[col] == '"':
-                    token = '"'
-                    if token not in tokendatos:
-                        tokendatos[token] = {"tipo": "Carácter", "lineas": [lineno]}
-                    else:
-                        tokendatos[token]["lineas"].append(lineno)
-                    col += 1
-                else:
-                    errores.append(f"Error de léxico!!! Línea {lineno}: Cadena no cerrada")
-                    MarcarError(lineno, col - 1, col)
-                continue
-
-            if linea[col] == '#':
-                token = '#'
-                if token not in tokendatos:
-                    tokendatos[token] = {"tipo": "Carácter", "lineas": [lineno]}
-                else:
-                    tokendatos[token]["lineas"].append(lineno)
-                break
-
-            bandera = False
-            for token_type, pattern in Patrones.items():
-                match = pattern.match(linea[col:])
-                if match:
-                    token = match.group()
-                    esvalido = False
-                    for tiposvalido in ['palabras_clave', 'tipos', 'booleanos', 'operadores', 'caracteres', 'comentarios', 'identificadores', 'numeros', 'espacios_blanco']:
-                        if Patrones[tiposvalido].fullmatch(token):
-                            esvalido = True
-                            break
-                    if not esvalido:
-                        sugerencia = SugerirToken(token)
-                        if sugerencia:
-                            errores.append(f"Error de léxico!!! Línea {lineno} En palabra reservada '{token}', ¿quisiste escribir '{sugerencia}'?")
-                        else:
-                            errores.append(f"Error de léxico!!! Línea {lineno} En token inválido '{token}'")
-                        MarcarError(lineno, col, col + len(token))
-                    else:
-                        tokenclave = token.strip()
-                        if tokenclave:
-                            if tokenclave not in tokendatos:
-                                tokendatos[tokenclave] = {"tipo": ClasificarToken(tokenclave), "lineas": [lineno]}
-                            else:
-                                tokendatos[tokenclave]["lineas"].append(lineno)
-                    col += len(token)
-                    bandera = True
-                    break
-            if not bandera:
-                col += 1
+    unidad = UnidadCompilacion(texto_crudo, estado_lexico.flujo())
+    tokendatos, errores = unidad.tokendatos, unidad.errores
 
     erroresmensaje.config(state='normal')
     erroresmensaje.delete('1.0', tk.END)
-    erroresmensaje.insert(tk.END, "\n".join(errores))
+    erroresmensaje.insert(tk.END, "\n".join(e["mensaje"] for e in errores))
     erroresmensaje.config(state='disabled')
 
     if not errores:
+        unidad_actual = unidad
         MostrarTabla(tokendatos)
         guardar_tokens_para_sintactico(tokendatos)
         ruta_vars = guardarVariables(tokendatos)   # guarda variables para otros módulos
@@ -283,56 +248,4 @@ def analizar():
         # erroresmensaje.config(state='disabled')
 
 
-def guardar_tokens_para_sintactico(tokendatos):
-    ruta_directorio = os.path.dirname(__file__)
-    os.makedirs(ruta_directorio, exist_ok=True)
-    ruta_archivo = os.path.join(ruta_directorio, "tokens_aceptados.json")
-    with open(ruta_archivo, "w", encoding="utf-8") as archivo:
-        json.dump(tokendatos, archivo, indent=4, ensure_ascii=False)
-
-def guardarVariables(tokendatos, nombre_archivo="variables.txt"):
-    """
-    Extrae las variables ($identificadores) de tokendatos y las guarda en un .txt.
-    - Una variable por línea
-    - Sin duplicados (tokendatos ya trae clave única por token)
-    - Ordenadas por la primera línea donde aparecen
-    - Al final escribe 'TOTAL=n'
-    Devuelve la ruta completa del archivo generado.
-    """
-    variables = []
-    for tok, data in tokendatos.items():
-        if data.get("tipo") == "Identificador" and isinstance(tok, str) and tok.startswith("$"):
-            primera_linea = min(data.get("lineas", [0]) or [0])
-            variables.append((tok, primera_linea))
-
-    variables.sort(key=lambda x: x[1])
-
-    ruta_directorio = os.path.dirname(__file__)
-    os.makedirs(ruta_directorio, exist_ok=True)
-    ruta_archivo = os.path.join(ruta_directorio, nombre_archivo)
-
-    with open(ruta_archivo, "w", encoding="utf-8") as f:
-        for tok, _ in variables:
-            f.write(f"{tok}\n")
-        f.write(f"TOTAL={len(variables)}\n")
-
-    return ruta_archivo
-
-def guardarCadenaEntrada(cadena_texto, nombre_archivo="cadena_entrada.txt"):
-    """
-    Guarda la cadena (el código completo del editor) en un archivo .txt
-    para que otro programa pueda leerla después (haya o no errores léxicos).
-    Devuelve la ruta completa del archivo generado.
-    """
-    ruta_directorio = os.path.dirname(__file__)
-    os.makedirs(ruta_directorio, exist_ok=True)
-    ruta_archivo = os.path.join(ruta_directorio, nombre_archivo)
-
-    # Guardar el texto tal cual (incluye saltos de línea)
-    with open(ruta_archivo, "w", encoding="utf-8") as f:
-        f.write(cadena_texto)
-
-    return ruta_archivo
-
-
 ventana.mainloop()
\ No newline at end of file
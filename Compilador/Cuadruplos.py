@@ -2,6 +2,7 @@
 import os
 import re
 from typing import List, Tuple, Optional
+from Nodos import NodoExpr as Nodo
 
 
 def leer_operaciones() -> List[str]:
@@ -35,11 +36,6 @@ PREC = {"+":1, "-":1, "*":2, "/":2}
 ABRE   = set("([{")
 CIERRA = {")":"(", "]":"[", "}":"{"}
 
-class Nodo:
-    def __init__(self, op: Optional[str]=None, izq:'Nodo'=None, der:'Nodo'=None, val:Optional[str]=None):
-        self.op, self.izq, self.der, self.val = op, izq, der, val
-    def es_val(self) -> bool: return self.val is not None
-
 def construir_ast(tokens: List[str]) -> Nodo:
     vals: List[Nodo] = []
     ops:  List[str]  = []
@@ -0,0 +1,341 @@
+# Gramatica.py
+# Utilidades sobre gramáticas en el formato de SesionSintactica:
+#   G = {NoTerminal: [[simbolo, ...], ...]}   ([] es la producción vacía ε)
+# Todo símbolo que no es clave de G es terminal; "#" marca el fin de la entrada.
+# Sin interfaz: lo usan los modos de análisis de AnalisisSintactico.py.
+
+import hashlib, json, os, threading
+
+EPSILON = "ε"
+FIN = "#"
+
+
+def calcular_first(G):
+    """
+    FIRST de cada no terminal: {NT: set(terminales)}; incluye EPSILON si el
+    no terminal deriva la cadena vacía. Punto fijo sobre todas las producciones.
+    """
+    first = {nt: set() for nt in G}
+    cambio = True
+    while cambio:
+        cambio = False
+        for nt, alts in G.items():
+            for rhs in alts:
+                nuevo = first_de_secuencia(rhs, first, G)
+                if not nuevo <= first[nt]:
+                    first[nt] |= nuevo
+                    cambio = True
+    return first
+
+def first_de_secuencia(simbolos, first, G):
+    """FIRST de una secuencia de símbolos (EPSILON si toda la secuencia es anulable)."""
+    out = set()
+    for X in simbolos:
+        if X not in G:
+            out.add(X)
+            return out
+        out |= first[X] - {EPSILON}
+        if EPSILON not in first[X]:
+            return out
+    out.add(EPSILON)
+    return out
+
+def calcular_follow(G, inicio, first=None):
+    """FOLLOW de cada no terminal: {NT: set(terminales)}; FOLLOW(inicio) contiene FIN."""
+    first = first or calcular_first(G)
+    follow = {nt: set() for nt in G}
+    follow[inicio].add(FIN)
+    cambio = True
+    while cambio:
+        cambio = False
+        for nt, alts in G.items():
+            for rhs in alts:
+                for k, X in enumerate(rhs):
+                    if X not in G:
+                        continue
+                    resto = first_de_secuencia(rhs[k+1:], first, G)
+                    nuevo = resto - {EPSILON}
+                    if EPSILON in resto:
+                        nuevo |= follow[nt]
+                    if not nuevo <= follow[X]:
+                        follow[X] |= nuevo
+                        cambio = True
+    return follow
+
+def tabla_ll1(G, inicio):
+    """
+    Tabla predictiva {(NT, terminal): alt} con alt 1-based (como las etiquetas
+    NT1, NT2, ...). Devuelve (tabla, conflictos); cada conflicto es
+    (NT, terminal, [alts]) y en la tabla queda la primera alternativa.
+    """
+    first = calcular_first(G)
+    follow = calcular_follow(G, inicio, first)
+    tabla, choques = {}, {}
+    for nt, alts in G.items():
+        for alt, rhs in enumerate(alts, start=1):
+            f = first_de_secuencia(rhs, first, G)
+            terminales = f - {EPSILON}
+            if EPSILON in f:
+                terminales |= follow[nt]
+            for a in terminales:
+                if (nt, a) in tabla:
+                    choques.setdefault((nt, a), [tabla[(nt, a)]]).append(alt)
+                else:
+                    tabla[(nt, a)] = alt
+    conflictos = [(nt, a, alts) for (nt, a), alts in choques.items()]
+    return tabla, conflictos
+
+
+# ----------------- transformaciones ----------------------
+
+def _nombre_libre(G, base):
+    """Primer nombre base, base', base''... que no es no terminal de G."""
+    # sin dígitos al final: las etiquetas de producción son nombre + número
+    while base in G:
+        base += "'"
+    return base
+
+def _esquinas_izquierdas(G):
+    """{NT: set(NT)} con los no terminales que pueden empezar cada producción de NT."""
+    anulables = {nt for nt, f in calcular_first(G).items() if EPSILON in f}
+    esquinas = {nt: set() for nt in G}
+    for nt, alts in G.items():
+        for rhs in alts:
+            for X in rhs:
+                if X not in G:
+                    break
+                esquinas[nt].add(X)
+                if X not in anulables:
+                    break
+    return esquinas
+
+def _alcanzables(esquinas, desde):
+    vistos, pila = set(), [desde]
+    while pila:
+        for Y in esquinas[pila.pop()]:
+            if Y not in vistos:
+                vistos.add(Y); pila.append(Y)
+    return vistos
+
+def _quitar_recursion_directa(G, A):
+    """A -> A α | β  ==>  A -> β A' ;  A' -> α A' | ε"""
+    recursivas = [rhs[1:] for rhs in G[A] if rhs and rhs[0] == A and len(rhs) > 1]
+    otras = [rhs for rhs in G[A] if not rhs or rhs[0] != A]
+    if not recursivas:
+        G[A] = otras  # solo se descartan los ciclos inútiles A -> A
+        return
+    if not otras:
+        # quitar_improductivos() descarta antes estos no terminales
+        raise ValueError(f"{A} solo tiene alternativas recursivas por la izquierda: no genera cadenas")
+    nuevo = _nombre_libre(G, f"{A}R")
+    G[A] = [rhs + [nuevo] for rhs in otras]
+    G[nuevo] = [alfa + [nuevo] for alfa in recursivas] + [[]]
+
+def quitar_improductivos(G, inicio=None):
+    """
+    Copia de G sin los no terminales que no derivan ninguna cadena de
+    terminales (p.ej. B -> B a, sin otra alternativa) ni las alternativas que
+    los usan; el punto fijo alcanza también a los que solo llegan a
+    terminales a través de ellos. El inicial se conserva, sin alternativas si
+    es improductivo. Devuelve (G', quitados) con quitados en el orden de G.
+    """
+    productivos = set()
+    cambio = True
+    while cambio:
+        cambio = False
+        for nt, alts in G.items():
+            if nt not in productivos and any(
+                    all(X not in G or X in productivos for X in rhs) for rhs in alts):
+                productivos.add(nt)
+                cambio = True
+    quitados = [nt for nt in G if nt not in productivos]
+    G2 = {nt: [list(rhs) for rhs in alts if all(X not in quitados for X in rhs)]
+          for nt, alts in G.items() if nt in productivos or nt == inicio}
+    return G2, quitados
+
+def eliminar_recursion_izquierda(G):
+    """
+    Algoritmo de Paull sobre una copia de G: en el orden de las claves, cada
+    Ai -> Aj γ con j < i se reescribe con las producciones de Aj y luego se
+    quita la recursión directa de Ai con un no terminal nuevo AiR. Solo se
+    sustituye cuando Aj puede volver a Ai por la izquierda, para no inflar
+    las partes de la gramática que no son recursivas. Supone (como el
+    algoritmo clásico) que no hay recursión escondida tras un prefijo anulable
+    ni ciclos de producciones unitarias (A -> B, B -> A, que al sustituir
+    dejan un AR anulable delante); en ambos casos queda recursión por la
+    izquierda y se nota como conflicto en tabla_ll1. G no debe tener no
+    terminales improductivos (ver quitar_improductivos).
+    """
+    G = {nt: [list(rhs) for rhs in alts] for nt, alts in G.items()}
+    orden = list(G)
+    for i, Ai in enumerate(orden):
+        for Aj in orden[:i]:
+            if Ai not in _alcanzables(_esquinas_izquierdas(G), Aj):
+                continue
+            nuevas = []
+            for rhs in G[Ai]:
+                if rhs and rhs[0] == Aj:
+                    nuevas.extend(delta + rhs[1:] for delta in G[Aj])
+                else:
+                    nuevas.append(rhs)
+            G[Ai] = nuevas
+        _quitar_recursion_directa(G, Ai)
+    return G
+
+def _prefijo_comun(secuencias):
+    n = min(len(s) for s in secuencias)
+    k = 0
+    while k < n and all(s[k] == secuencias[0][k] for s in secuencias):
+        k += 1
+    return secuencias[0][:k]
+
+def factorizar_izquierda(G):
+    """
+    Factoriza por la izquierda una copia de G hasta que ningún no terminal
+    tenga dos alternativas con el mismo primer símbolo:
+        A -> x y | x z  ==>  A -> x AP ;  AP -> y | z
+    Antes se quitan las alternativas repetidas (A -> a b | a b se queda en
+    A -> a b, sin un no terminal nuevo que solo derive ε). La alternativa
+    factorizada queda en el lugar de la primera del grupo y, en el no
+    terminal nuevo, la cola vacía va al final.
+    """
+    G = {nt: [list(rhs) for rhs in dict.fromkeys(map(tuple, alts))]
+         for nt, alts in G.items()}
+    pendientes = list(G)
+    while pendientes:
+        A = pendientes.pop(0)
+        grupos = {}
+        for rhs in G[A]:
+            if rhs:
+                grupos.setdefault(rhs[0], []).append(rhs)
+        grupo = next((g for g in grupos.values() if len(g) > 1), None)
+        if grupo is None:
+            continue
+        prefijo = _prefijo_comun(grupo)
+        colas = [rhs[len(prefijo):] for rhs in grupo]
+        nuevo = _nombre_libre(G, f"{A}P")
+        G[nuevo] = [c for c in colas if c] + [c for c in colas if not c][:1]
+        alts, puesto = [], False
+        for rhs in G[A]:
+            if any(rhs is g for g in grupo):
+                if not puesto:
+                    alts.append(prefijo + [nuevo]); puesto = True
+            else:
+                alts.append(rhs)
+        G[A] = alts
+        pendientes[:0] = [A, nuevo]
+    return G
+
+def describir_conflictos(conflictos):
+    """
+    Texto legible para los conflictos de tabla_ll1, una línea por
+    (NT, terminal), y para los no terminales improductivos que descartó
+    transformar_gramatica, que llegan como (NT, None, []).
+    """
+    return [f"No terminal improductivo {nt}: no genera cadenas, se quitó con las alternativas que lo usan"
+            if a is None else
+            f"Conflicto LL(1): {nt} con '{a}': chocan " + ", ".join(f"{nt}{alt}" for alt in alts)
+            for nt, a, alts in conflictos]
+
+def transformar_gramatica(G, inicio):
+    """
+    Gramática equivalente apta para los analizadores rápidos (LL(1) y
+    retroceso memoizado): sin no terminales improductivos, sin recursión
+    por la izquierda (directa ni indirecta) y factorizada por la izquierda.
+    Devuelve (G', conflictos): primero un (NT, None, []) por cada no
+    terminal improductivo descartado y luego los conflictos LL(1) que
+    queden (ver describir_conflictos); si no hay de estos últimos, G' es LL(1).
+    """
+    G2, quitados = quitar_improductivos(G, inicio)
+    G2 = factorizar_izquierda(eliminar_recursion_izquierda(G2))
+    _tabla, conflictos = tabla_ll1(G2, inicio)
+    return G2, [(nt, None, []) for nt in quitados] + conflictos
+
+
+# ----------------- compilación con caché en disco --------
+
+CACHE_VERSION = 2
+_compiladas = {}   # huella -> gramática compilada (caché en memoria del proceso)
+
+def huella_gramatica(G, inicio, transformar=False):
+    """sha256 de la gramática en forma canónica (orden de NTs y alternativas incluido)."""
+    canon = json.dumps([CACHE_VERSION, inicio, bool(transformar), list(G.items())],
+                       ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canon.encode("utf-8")).hexdigest()
+
+def compilar_gramatica(G, inicio, transformar=False):
+    """
+    Todo lo que los analizadores derivan de una gramática, calculado una vez:
+    {'gramatica', 'inicio', 'etiquetas' {(NT, alt): 'NTk'}, 'tabla' LL(1),
+    'first', 'follow', 'conflictos'}. Con transformar=True la gramática pasa
+    antes por transformar_gramatica() y 'conflictos' empieza por los no
+    terminales improductivos que se quitaron.
+    """
+    quitados = []
+    if transformar:
+        G, avisos = transformar_gramatica(G, inicio)
+        quitados = [c for c in avisos if c[1] is None]
+    first = calcular_first(G)
+    follow = calcular_follow(G, inicio, first)
+    tabla, conflictos = tabla_ll1(G, inicio)
+    conflictos = quitados + conflictos
+    etiquetas = {(nt, i+1): f"{nt}{i+1}" for nt, alts in G.items() for i in range(len(alts))}
+    return {"gramatica": G, "inicio": inicio, "etiquetas": etiquetas, "tabla": tabla,
+            "first": first, "follow": follow, "conflictos": conflictos}
+
+def _a_json(c):
+    return {
+        "version": CACHE_VERSION,
+        "inicio": c["inicio"],
+        "gramatica": list(c["gramatica"].items()),
+        "etiquetas": [[nt, alt, et] for (nt, alt), et in c["etiquetas"].items()],
+        "tabla": [[nt, a, alt] for (nt, a), alt in c["tabla"].items()],
+        "first": {nt: sorted(s) for nt, s in c["first"].items()},
+        "follow": {nt: sorted(s) for nt, s in c["follow"].items()},
+        "conflictos": [[nt, a, alts] for nt, a, alts in c["conflictos"]],
+    }
+
+def _desde_json(d):
+    if d.get("version") != CACHE_VERSION:
+        raise ValueError("versión de caché distinta")
+    return {
+        "gramatica": {nt: alts for nt, alts in d["gramatica"]},
+        "inicio": d["inicio"],
+        "etiquetas": {(nt, alt): et for nt, alt, et in d["etiquetas"]},
+        "tabla": {(nt, a): alt for nt, a, alt in d["tabla"]},
+        "first": {nt: set(s) for nt, s in d["first"].items()},
+        "follow": {nt: set(s) for nt, s in d["follow"].items()},
+        "conflictos": [(nt, a, alts) for nt, a, alts in d["conflictos"]],
+    }
+
+def cargar_o_compilar(G, inicio, dir_cache=None, transformar=False):
+    """
+    compilar_gramatica() con caché: primero en memoria y luego en
+    dir_cache/<huella>.json. Si la gramática no cambió, arrancar el
+    analizador es leer un archivo; si el archivo falta, está dañado o es de
+    otra versión, se vuelve a compilar y se reescribe.
+    """
+    huella = huella_gramatica(G, inicio, transformar)
+    c = _compiladas.get(huella)
+    if c is not None:
+        return c
+    ruta = os.path.join(dir_cache, f"{huella}.json") if dir_cache else None
+    if ruta and os.path.exists(ruta):
+        try:
+            with open(ruta, "r", encoding="utf-8") as f:
+                c = _desde_json(json.load(f))
+        except (OSError, ValueError, KeyError, TypeError):
+            c = None
+    if c is None:
+        c = compilar_gramatica(G, inicio, transformar)
+        if ruta:
+            try:
+                os.makedirs(dir_cache, exist_ok=True)
+                tmp = f"{ruta}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(_a_json(c), f, ensure_ascii=False)
+                os.replace(tmp, ruta)
+            except OSError:
+                pass  # sin caché en disco se sigue funcionando
+    _compiladas[huella] = c
+    return c
@@ -0,0 +1,588 @@
+# Lexico.py
+# Analizador léxico sin interfaz: no importa tkinter ni crea ventanas, así que
+# se puede usar desde otros módulos, trabajos por lotes o procesos de trabajo.
+# CorrectoLexico.py es la interfaz gráfica encima de este módulo.
+
+import re
+import difflib
+from array import array
+from functools import lru_cache
+import json
+import mmap
+import os
+import struct
+import sys
+
+
+tokens = {
+    'palabras_clave': ['Ini', 'end', 'mostrar', 'leer'],
+    'tipos': ['ente', 'dec', 'carac', 'cade', 'bool'],
+    'booleanos': ['verdadero', 'falso'],
+    'operadores': ['=', r'\+', '-', r'\*', '/'],
+    'caracteres': [r'\(', r'\)', r';', r','],
+    'comentarios': r'#.*',
+    'identificadores': r'\$[a-zA-Z_][a-zA-Z0-9_]*',
+    'numeros': r'\d+(\.\d+)?',
+    'cadenas': r'"[^"]*"',
+    'espacios_blanco': r'\s+',
+    'desconocidos': r'[^\s]+',
+}
+
+Patrones = {
+    'palabras_clave': re.compile(r'\b(?:' + '|'.join(tokens['palabras_clave']) + r')\b'),
+    'tipos': re.compile(r'\b(?:' + '|'.join(tokens['tipos']) + r')\b'),
+    'booleanos': re.compile(r'\b(?:' + '|'.join(tokens['booleanos']) + r')\b'),
+    'operadores': re.compile(r'|'.join(tokens['operadores'])),
+    'comentarios': re.compile(tokens['comentarios']),
+    'identificadores': re.compile(tokens['identificadores']),
+    'numeros': re.compile(tokens['numeros']),
+    'cadenas': re.compile(tokens['cadenas']),
+    'espacios_blanco': re.compile(tokens['espacios_blanco']),
+    'desconocidos': re.compile(tokens['desconocidos']),
+    'caracteres': re.compile('|'.join(tokens['caracteres'])),
+}
+
+# Patrón maestro: todas las categorías en UNA alternancia con grupos nombrados,
+# en el mismo orden de prioridad con que se probaban los Patrones. Se recorre
+# el texto completo una sola vez (sin rebanar líneas) y los saltos de línea
+# son un grupo más para llevar la cuenta de líneas/columnas.
+PatronMaestro = re.compile('|'.join([
+    r'(?P<salto>\n)',
+    r'(?P<cadenas>"[^"\n]*")',
+    r'(?P<cadena_abierta>"[^"\n]*)',
+    r'(?P<comentarios>#[^\n]*)',
+    r'(?P<palabras_clave>(?:' + '|'.join(tokens['palabras_clave']) + r')\b)',
+    r'(?P<tipos>(?:' + '|'.join(tokens['tipos']) + r')\b)',
+    r'(?P<booleanos>(?:' + '|'.join(tokens['booleanos']) + r')\b)',
+    r'(?P<operadores>' + '|'.join(tokens['operadores']) + ')',
+    r'(?P<identificadores>' + tokens['identificadores'] + ')',
+    r'(?P<numeros>' + tokens['numeros'] + ')',
+    r'(?P<espacios_blanco>[^\S\n]+)',
+    r'(?P<desconocidos>' + tokens['desconocidos'] + ')',
+]))
+
+TiposValidos = ['palabras_clave', 'tipos', 'booleanos', 'operadores', 'caracteres', 'comentarios', 'identificadores', 'numeros', 'espacios_blanco']
+
+
+def ClasificarToken(token):
+    if token in tokens['palabras_clave'] or token in tokens['tipos'] or token in tokens['booleanos']:
+        return "Palabra Reservada"
+    elif Patrones['identificadores'].fullmatch(token):
+        return "Identificador"
+    elif Patrones['operadores'].fullmatch(token):
+        return "Operador"
+    elif Patrones['caracteres'].fullmatch(token):
+        return "Carácter"
+    elif Patrones['numeros'].fullmatch(token):
+        return "Carácter"
+    else:
+        return "Otro"
+
+class IndiceSugerencias:
+    """
+    Índice de palabras para sugerir correcciones con el mismo resultado que
+    difflib.get_close_matches(token, palabras, n=1, cutoff): las palabras se
+    agrupan por largo y solo se prueban los largos que pueden alcanzar el
+    cutoff (2*min/(la+lb) es la cota de real_quick_ratio); en esas se filtra
+    por caracteres en común (quick_ratio) antes del ratio() exacto.
+    Los resultados quedan en un LRU, así que un typo repetido cuesta un lookup.
+    """
+
+    def __init__(self, palabras=(), cutoff=0.6, max_cache=4096):
+        self.cutoff = cutoff
+        self.por_largo = {}     # largo -> [palabra, ...]
+        self._palabras = set()
+        self.sugerir = lru_cache(maxsize=max_cache)(self._sugerir)
+        self.agregar(palabras)
+
+    def agregar(self, palabras):
+        """Agrega palabras (p.ej. los $identificadores declarados)."""
+        for palabra in palabras:
+            if palabra and palabra not in self._palabras:
+                self._palabras.add(palabra)
+                self.por_largo.setdefault(len(palabra), []).append(palabra)
+        self.sugerir.cache_clear()
+
+    def _sugerir(self, token):
+        largo_token = len(token)
+        matcher = difflib.SequenceMatcher()
+        matcher.set_seq2(token)
+        mejor = None  # (ratio, palabra): mismo desempate que get_close_matches
+        for largo, palabras in self.por_largo.items():
+            if 2.0 * min(largo, largo_token) / (largo + largo_token) < self.cutoff:
+                continue
+            for palabra in palabras:
+                matcher.set_seq1(palabra)
+                if matcher.quick_ratio() < self.cutoff:
+                    continue
+                ratio = matcher.ratio()
+                if ratio >= self.cutoff and (mejor is None or (ratio, palabra) > mejor):
+                    mejor = (ratio, palabra)
+        return mejor[1] if mejor else None
+
+_IndiceReservadas = IndiceSugerencias(tokens['palabras_clave'] + tokens['tipos'] + tokens['booleanos'])
+
+def SugerirToken(token):
+    return _IndiceReservadas.sugerir(token)
+
+def iterar_tokens(texto):
+    """
+    Generador sobre un str: produce (grupo, lexema, linea, columna) por cada
+    token (sin espacios ni saltos de línea), en orden y de forma perezosa.
+    'grupo' es el nombre del grupo de PatronMaestro que reconoció el token.
+    """
+    lineno, inicio_linea = 1, 0
+    for m in PatronMaestro.finditer(texto):
+        grupo = m.lastgroup
+        if grupo == 'salto':
+            lineno += 1
+            inicio_linea = m.end()
+        elif grupo != 'espacios_blanco':
+            yield grupo, m.group(), lineno, m.start() - inicio_linea
+
+def iterar_tokens_archivo(ruta, codificacion="utf-8"):
+    """
+    Igual que iterar_tokens() pero sobre un archivo mapeado en memoria (mmap):
+    el fuente nunca se carga completo como str. Se decodifica una línea a la
+    vez (ningún token cruza un salto de línea), así que la memoria queda acotada
+    por la línea actual y los tokens que retenga quien consume el generador.
+    Los finales CRLF cuentan como '\n', igual que al leer en modo texto.
+    """
+    with open(ruta, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return  # mmap no acepta archivos vacíos
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            inicio, total, lineno = 0, len(mm), 1
+            while inicio < total:
+                fin = mm.find(b"\n", inicio)
+                if fin < 0:
+                    fin = total
+                corte = fin - 1 if fin > inicio and mm[fin-1:fin] == b"\r" else fin
+                linea = mm[inicio:corte].decode(codificacion)
+                for m in PatronMaestro.finditer(linea):
+                    grupo = m.lastgroup
+                    if grupo != 'espacios_blanco':
+                        yield grupo, m.group(), lineno, m.start()
+                inicio = fin + 1
+                lineno += 1
+
+class FlujoTokens:
+    """
+    Flujo de tokens compacto, compartido por las etapas: columnas paralelas
+    array('i') (grupo, linea, columna, longitud, lexema) en vez de un objeto
+    Python por token. Los lexemas se guardan una sola vez en una tabla interna
+    y cada token guarda solo su índice en ella.
+    Iterar produce las mismas tuplas (grupo, lexema, linea, columna) que
+    iterar_tokens(), así que armar_tabla() lo acepta directamente.
+    """
+    # códigos de grupo: índice en esta tupla (sin 'salto' ni 'espacios_blanco')
+    GRUPOS = tuple(g for g in PatronMaestro.groupindex if g not in ('salto', 'espacios_blanco'))
+    _CODIGO = {g: i for i, g in enumerate(GRUPOS)}
+
+    __slots__ = ("grupos", "lineas", "columnas", "longitudes", "ids", "lexemas", "_interno")
+
+    def __init__(self):
+        self.grupos = array('i')
+        self.lineas = array('i')
+        self.columnas = array('i')
+        self.longitudes = array('i')
+        self.ids = array('i')       # índice en self.lexemas
+        self.lexemas = []           # tabla de lexemas distintos
+        self._interno = {}          # lexema -> índice
+
+    @classmethod
+    def desde_tokens(cls, tokens_iter):
+        """Arma el flujo a partir de tuplas (grupo, lexema, linea, columna)."""
+        flujo = cls()
+        for grupo, lexema, linea, col in tokens_iter:
+            flujo.agregar(grupo, lexema, linea, col)
+        return flujo
+
+    @classmethod
+    def desde_texto(cls, texto):
+        return cls.desde_tokens(iterar_tokens(texto))
+
+    @classmethod
+    def desde_archivo(cls, ruta, codificacion="utf-8"):
+        return cls.desde_tokens(iterar_tokens_archivo(ruta, codificacion))
+
+    def agregar(self, grupo, lexema, linea, col):
+        idx = self._interno.get(lexema)
+        if idx is None:
+            idx = self._interno[lexema] = len(self.lexemas)
+            self.lexemas.append(lexema)
+        self.grupos.append(self._CODIGO[grupo])
+        self.lineas.append(linea)
+        self.columnas.append(col)
+        self.longitudes.append(len(lexema))
+        self.ids.append(idx)
+
+    # ---- vista ----
+    def __len__(self):
+        return len(self.grupos)
+
+    def grupo(self, i):
+        return self.GRUPOS[self.grupos[i]]
+
+    def lexema(self, i):
+        return self.lexemas[self.ids[i]]
+
+    def __getitem__(self, i):
+        """Token i como tupla (grupo, lexema, linea, columna)."""
+        return self.GRUPOS[self.grupos[i]], self.lexemas[self.ids[i]], self.lineas[i], self.columnas[i]
+
+    def __iter__(self):
+        grupos, lexemas = self.GRUPOS, self.lexemas
+        for g, idx, ln, col in zip(self.grupos, self.ids, self.lineas, self.columnas):
+            yield grupos[g], lexemas[idx], ln, col
+
+    def indices(self, grupo):
+        """Índices de los tokens de un grupo (p.ej. 'identificadores')."""
+        codigo = self._CODIGO[grupo]
+        return [i for i, g in enumerate(self.grupos) if g == codigo]
+
+def es_token_invalido(grupo, token):
+    """True si el token reconocido por PatronMaestro es un error léxico."""
+    if grupo == 'cadena_abierta':
+        return True
+    return grupo == 'desconocidos' and not any(Patrones[t].fullmatch(token) for t in TiposValidos)
+
+def armar_tabla(tokens_iter, sugerir=None):
+    """
+    Consume un flujo (grupo, lexema, linea, columna) y arma la tabla de tokens:
+        tokendatos = {token: {"tipo": ..., "lineas": [n, ...]}}
+    Devuelve (tokendatos, errores). Cada error es un dict
+        {"mensaje": str, "linea": n, "inicio": col, "fin": col}
+    con la posición que la interfaz resalta en el editor.
+    'sugerir' reemplaza a SugerirToken (p.ej. una versión con caché).
+    """
+    sugerir = sugerir or SugerirToken
+    errores = []
+    tokendatos = {}
+
+    def registrar(token, lineno, tipo=None):
+        datos = tokendatos.get(token)
+        if datos is None:
+            tokendatos[token] = {"tipo": tipo or ClasificarToken(token), "lineas": [lineno]}
+        else:
+            datos["lineas"].append(lineno)
+
+    for grupo, token, lineno, col in tokens_iter:
+        if grupo == 'cadenas':
+            registrar('"', lineno, "Carácter")
+            registrar('"', lineno, "Carácter")
+        elif grupo == 'cadena_abierta':
+            registrar('"', lineno, "Carácter")
+            fin = col + len(token)
+            errores.append({"mensaje": f"Error de léxico!!! Línea {lineno}: Cadena no cerrada",
+                            "linea": lineno, "inicio": fin - 1, "fin": fin})
+        elif grupo == 'comentarios':
+            registrar('#', lineno, "Carácter")
+        elif grupo == 'desconocidos':
+            if not es_token_invalido(grupo, token):
+                registrar(token, lineno)
+                continue
+            sugerencia = sugerir(token)
+            if sugerencia:
+                mensaje = f"Error de léxico!!! Línea {lineno} En palabra reservada '{token}', ¿quisiste escribir '{sugerencia}'?"
+            else:
+                mensaje = f"Error de léxico!!! Línea {lineno} En token inválido '{token}'"
+            errores.append({"mensaje": mensaje, "linea": lineno, "inicio": col, "fin": col + len(token)})
+        else:
+            registrar(token, lineno)
+
+    return tokendatos, errores
+
+def lex(texto):
+    """Analiza un str completo. Devuelve (tokendatos, errores); ver armar_tabla()."""
+    return armar_tabla(iterar_tokens(texto))
+
+def lex_flujo(texto):
+    """
+    Como lex() pero conservando los tokens: devuelve (flujo, tokendatos, errores)
+    con el FlujoTokens que pueden reusar las etapas siguientes.
+    """
+    flujo = FlujoTokens.desde_texto(texto)
+    tokendatos, errores = armar_tabla(flujo)
+    return flujo, tokendatos, errores
+
+
+# Formato binario de la tabla de tokens (tokens_aceptados.bin), little-endian,
+# todo alineado a 4 bytes para poder ver las líneas directo sobre el mmap:
+#   cabecera : magic b"TKNS", version u16, reservado u16, n_tipos u32, n_tokens u32
+#   tipos    : n_tipos cadenas
+#   tokens   : n_tokens x (cadena token, indice_tipo u32, n_lineas u32, lineas u32 * n_lineas)
+#   cadena   : largo u32 + bytes UTF-8 + relleno con \0 hasta múltiplo de 4
+TOKENS_BIN_MAGIC = b"TKNS"
+TOKENS_BIN_VERSION = 1
+_CABECERA = struct.Struct("<4sHHII")
+
+def _empacar_cadena(texto):
+    datos = texto.encode("utf-8")
+    return struct.pack("<I", len(datos)) + datos + b"\0" * (-len(datos) % 4)
+
+def _leer_cadena(buf, pos):
+    (largo,) = struct.unpack_from("<I", buf, pos)
+    pos += 4
+    return str(buf[pos:pos + largo], "utf-8"), pos + largo + (-largo % 4)
+
+def guardar_tokens_binario(tokendatos, ruta_archivo):
+    """Escribe tokendatos en el formato binario de arriba. Devuelve la ruta."""
+    tipos = list(dict.fromkeys(d["tipo"] for d in tokendatos.values()))
+    indice_tipo = {t: i for i, t in enumerate(tipos)}
+    partes = [_CABECERA.pack(TOKENS_BIN_MAGIC, TOKENS_BIN_VERSION, 0, len(tipos), len(tokendatos))]
+    partes.extend(_empacar_cadena(t) for t in tipos)
+    for token, datos in tokendatos.items():
+        lineas = array('I', datos["lineas"])
+        if sys.byteorder != "little":
+            lineas.byteswap()
+        partes.append(_empacar_cadena(token))
+        partes.append(struct.pack("<II", indice_tipo[datos["tipo"]], len(lineas)))
+        partes.append(lineas.tobytes())
+    with open(ruta_archivo, "wb") as f:
+        f.write(b"".join(partes))
+    return ruta_archivo
+
+class TablaTokensMapeada:
+    """
+    tokens_aceptados.bin mapeado con mmap: 'tokendatos' es
+        {token: {"tipo": str, "lineas": secuencia de int}}
+    con las listas de líneas como memoryview sobre el mapa (sin copiar) en
+    máquinas little-endian. El mapa y el archivo quedan abiertos hasta
+    cerrar() (o el fin del 'with'); después esas líneas ya no se pueden leer.
+    """
+
+    def __init__(self, ruta_archivo):
+        with open(ruta_archivo, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._vistas = []   # memoryviews sobre el mapa: hay que soltarlas antes de cerrarlo
+        try:
+            self.tokendatos = self._leer(ruta_archivo)
+        except Exception:
+            self.cerrar()
+            raise
+
+    def _vista(self, vista):
+        self._vistas.append(vista)
+        return vista
+
+    def _leer(self, ruta_archivo):
+        vista = self._vista(memoryview(self._mm))
+        magic, version, _, n_tipos, n_tokens = _CABECERA.unpack_from(vista, 0)
+        if magic != TOKENS_BIN_MAGIC:
+            raise ValueError(f"{ruta_archivo}: no es una tabla de tokens binaria")
+        if version != TOKENS_BIN_VERSION:
+            raise ValueError(f"{ruta_archivo}: versión {version} no soportada (se esperaba {TOKENS_BIN_VERSION})")
+
+        pos = _CABECERA.size
+        tipos = []
+        for _ in range(n_tipos):
+            tipo, pos = _leer_cadena(vista, pos)
+            tipos.append(tipo)
+
+        tokendatos = {}
+        for _ in range(n_tokens):
+            token, pos = _leer_cadena(vista, pos)
+            idx_tipo, n_lineas = struct.unpack_from("<II", vista, pos)
+            pos += 8
+            crudo = self._vista(vista[pos:pos + 4 * n_lineas])
+            if sys.byteorder == "little":
+                lineas = self._vista(crudo.cast("I"))
+            else:
+                lineas = array('I', crudo)
+                lineas.byteswap()
+            tokendatos[token] = {"tipo": tipos[idx_tipo], "lineas": lineas}
+            pos += 4 * n_lineas
+        return tokendatos
+
+    def cerrar(self):
+        if self._mm is None:
+            return
+        for vista in reversed(self._vistas):
+            vista.release()
+        self._vistas = []
+        self._mm.close()
+        self._mm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.cerrar()
+
+def mapear_tokens_binario(ruta_archivo):
+    """
+    Abre tokens_aceptados.bin con mmap (ver TablaTokensMapeada); cerrarla al
+    terminar, p.ej. 'with mapear_tokens_binario(ruta) as tabla: ...'. Usar
+    cargar_tokens_binario() para tener listas normales sin nada abierto.
+    """
+    return TablaTokensMapeada(ruta_archivo)
+
+def cargar_tokens_binario(ruta_archivo):
+    """Como mapear_tokens_binario() pero con listas de Python (copia independiente)."""
+    with mapear_tokens_binario(ruta_archivo) as tabla:
+        return {tok: {"tipo": d["tipo"], "lineas": list(d["lineas"])}
+                for tok, d in tabla.tokendatos.items()}
+
+def exportar_tokens_json(ruta_bin, ruta_json=None):
+    """Exporta el .bin al JSON legible de antes (para depurar). Devuelve la ruta."""
+    ruta_json = ruta_json or os.path.splitext(ruta_bin)[0] + ".json"
+    with open(ruta_json, "w", encoding="utf-8") as archivo:
+        json.dump(cargar_tokens_binario(ruta_bin), archivo, indent=4, ensure_ascii=False)
+    return ruta_json
+
+def guardar_tokens_para_sintactico(tokendatos, ruta_directorio=None):
+    ruta_directorio = ruta_directorio or os.path.dirname(__file__)
+    os.makedirs(ruta_directorio, exist_ok=True)
+    ruta_archivo = os.path.join(ruta_directorio, "tokens_aceptados.bin")
+    return guardar_tokens_binario(tokendatos, ruta_archivo)
+
+def extraer_variables(tokendatos):
+    """
+    Variables ($identificadores) de tokendatos, sin duplicados y ordenadas por
+    la primera línea donde aparecen.
+    """
+    variables = []
+    for tok, data in tokendatos.items():
+        if data.get("tipo") == "Identificador" and isinstance(tok, str) and tok.startswith("$"):
+            primera_linea = min(data.get("lineas", [0]) or [0])
+            variables.append((tok, primera_linea))
+
+    variables.sort(key=lambda x: x[1])
+    return [tok for tok, _ in variables]
+
+def guardarVariables(tokendatos, nombre_archivo="variables.txt", ruta_directorio=None):
+    """
+    Extrae las variables ($identificadores) de tokendatos y las guarda en un .txt.
+    - Una variable por línea
+    - Sin duplicados (tokendatos ya trae clave única por token)
+    - Ordenadas por la primera línea donde aparecen
+    - Al final escribe 'TOTAL=n'
+    Devuelve la ruta completa del archivo generado.
+    """
+    variables = extraer_variables(tokendatos)
+
+    ruta_directorio = ruta_directorio or os.path.dirname(__file__)
+    os.makedirs(ruta_directorio, exist_ok=True)
+    ruta_archivo = os.path.join(ruta_directorio, nombre_archivo)
+
+    with open(ruta_archivo, "w", encoding="utf-8") as f:
+        for tok in variables:
+            f.write(f"{tok}\n")
+        f.write(f"TOTAL={len(variables)}\n")
+
+    return ruta_archivo
+
+def guardarCadenaEntrada(cadena_texto, nombre_archivo="cadena_entrada.txt", ruta_directorio=None):
+    """
+    Guarda la cadena (el código completo del editor) en un archivo .txt
+    para que otro programa pueda leerla después (haya o no errores léxicos).
+    Devuelve la ruta completa del archivo generado.
+    """
+    ruta_directorio = ruta_directorio or os.path.dirname(__file__)
+    os.makedirs(ruta_directorio, exist_ok=True)
+    ruta_archivo = os.path.join(ruta_directorio, nombre_archivo)
+
+    # Guardar el texto tal cual (incluye saltos de línea)
+    with open(ruta_archivo, "w", encoding="utf-8") as f:
+        f.write(cadena_texto)
+
+    return ruta_archivo
+
+
+class LexicoIncremental:
+    """
+    Estado del léxico para un editor: guarda el texto y los tokens de cada
+    línea y, en cada actualizar(), vuelve a analizar solo las líneas que
+    cambiaron. Ningún token cruza un salto de línea (una cadena sin cerrar es
+    error al final de SU línea), así que dañar una línea nunca obliga a
+    re-analizar las siguientes.
+    """
+
+    def __init__(self):
+        self.lineas = [""]       # texto de cada línea
+        self.tokens = [[]]       # por línea: [(grupo, lexema, columna), ...]
+
+    @staticmethod
+    def _lex_linea(linea):
+        return [(m.lastgroup, m.group(), m.start())
+                for m in PatronMaestro.finditer(linea) if m.lastgroup != 'espacios_blanco']
+
+    def actualizar(self, texto):
+        """
+        Compara el texto nuevo con el anterior (prefijo y sufijo de líneas
+        iguales) y re-analiza solo el tramo dañado.
+        Devuelve (primera_linea, cantidad) de las líneas nuevas re-analizadas,
+        con primera_linea 1-based, o None si el texto no cambió.
+        """
+        nuevas = texto.split("\n")
+        viejas = self.lineas
+        n_v, n_n = len(viejas), len(nuevas)
+        tope = min(n_v, n_n)
+        ini = 0
+        while ini < tope and viejas[ini] == nuevas[ini]:
+            ini += 1
+        if ini == n_v == n_n:
+            return None
+        fin = 0
+        while fin < tope - ini and viejas[n_v - 1 - fin] == nuevas[n_n - 1 - fin]:
+            fin += 1
+        self.tokens[ini:n_v - fin] = [self._lex_linea(l) for l in nuevas[ini:n_n - fin]]
+        self.lineas = nuevas
+        return ini + 1, n_n - fin - ini
+
+    def reemplazar(self, primera, viejas, nuevas):
+        """
+        Aplica una edición de la que ya se conocen las líneas: las 'viejas'
+        líneas desde 'primera' (1-based) pasan a ser 'nuevas' (lista de
+        textos). Solo se analizan esas, sin mirar el resto del texto.
+        Devuelve (primera_linea, cantidad) como actualizar().
+        """
+        i = primera - 1
+        self.lineas[i:i + viejas] = nuevas
+        self.tokens[i:i + viejas] = [self._lex_linea(l) for l in nuevas]
+        return primera, len(nuevas)
+
+    def marcas(self, primera, cantidad):
+        """Posiciones (linea, inicio, fin) de los errores en esas líneas (1-based)."""
+        out = []
+        for lineno in range(primera, primera + cantidad):
+            for grupo, token, col in self.tokens[lineno - 1]:
+                if es_token_invalido(grupo, token):
+                    fin = col + len(token)
+                    out.append((lineno, fin - 1 if grupo == 'cadena_abierta' else col, fin))
+        return out
+
+    def _flujo(self):
+        for lineno, toks in enumerate(self.tokens, start=1):
+            for grupo, token, col in toks:
+                yield grupo, token, lineno, col
+
+    def tabla(self):
+        """(tokendatos, errores) del texto actual, sin volver a pasar regex."""
+        return armar_tabla(self._flujo())
+
+    def flujo(self):
+        """FlujoTokens del texto actual, armado desde la caché por línea."""
+        return FlujoTokens.desde_tokens(self._flujo())
+
+
+def lex_archivo(ruta):
+    """Analiza un archivo sin leerlo completo (mmap). Devuelve (tokendatos, errores)."""
+    return armar_tabla(iterar_tokens_archivo(ruta))
+
+
+if __name__ == "__main__":
+    # Uso por lotes: python Lexico.py archivo1.txt archivo2.txt ...
+    #            o: python Lexico.py --json tokens_aceptados.bin
+    if sys.argv[1:2] == ["--json"]:
+        for ruta in sys.argv[2:]:
+            print(exportar_tokens_json(ruta))
+        sys.exit(0)
+    total = 0
+    for ruta in sys.argv[1:]:
+        _tokendatos, errores = lex_archivo(ruta)
+        total += len(errores)
+        for e in errores:
+            print(f"{ruta}: {e['mensaje']}")
+    sys.exit(1 if total else 0)
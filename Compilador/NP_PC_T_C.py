@@ -6,6 +6,8 @@ import os, re, sys, importlib.util, importlib.machinery
 import tkinter as tk
 from tkinter import ttk, messagebox
 from typing import List, Tuple, Union
+from Arbol import convertir, operaciones as operaciones_de_arbol
+from Nodos import NodoExpr as Nodo, NodoInorden as Nodo2, NodoPCode
 
 # -------- Colores (según tu ventana) --------
 HEADER_BG = "lightgreen"
@@ -59,14 +61,7 @@ GeneradorTriplos = _cargar_clase(
 # *** GeneradorPCode (integrado, NO TOCAR) ***
 # =========================================================
 class GeneradorPCode:
-    class Node:
-        def __init__(self, value=None, op=None, left=None, right=None):
-            self.value = value
-            self.op = op
-            self.left = left
-            self.right = right
-        def is_leaf(self):
-            return self.value is not None
+    Node = NodoPCode
 
     # --- MODIFICADO: acepta $identificadores ---
     def tokenizar(self, expr: str):
@@ -221,14 +216,15 @@ class GeneradorPCode:
         elif op == '/':
             codigo.append("div")
 
-    def _a_codigo_p(self, expresion):
+    def _a_codigo_p(self, expresion, tokens=None):
         variable = None
         if '=' in expresion:
             left, right = expresion.split('=', 1)
             variable = left.strip()
             expresion = right.strip()
 
-        tokens = self.tokenizar(expresion)
+        if tokens is None:
+            tokens = self.tokenizar(expresion)
         rpn = self.shunting_yard(tokens)
         ast = self.build_ast_from_rpn(rpn)
         _ = self.agrupacion_str(ast)
@@ -245,8 +241,17 @@ class GeneradorPCode:
 
         return _, codigo
 
-    def generar_pcode(self, linea: str):
-        _, codigo = self._a_codigo_p(linea)
+    def generar_pcode(self, linea: str, tokens=None):
+        _, codigo = self._a_codigo_p(linea, tokens)
+        return codigo
+
+    def generar_pcode_arbol(self, variable, expr):
+        # expr: expresión del AST del sintáctico (Arbol), sin volver a tokenizar
+        ast = convertir(expr, lambda v: self.Node(value=v),
+                        lambda op, izq, der: self.Node(op=op, left=izq, right=der))
+        codigo = [f"lda {variable}"]
+        self.gen_codigo_p(ast, codigo)
+        codigo.append("sto")
         return codigo
 
 
@@ -268,11 +273,6 @@ PREC = {'+':1, '-':1, '*':2, '/':2}
 ABRE   = set("([{")
 CIERRA = {')':'(', ']':'[', '}':'{'}
 
-class Nodo:
-    def __init__(self, op: str=None, izq: 'Nodo'=None, der: 'Nodo'=None, val: str=None):
-        self.op, self.izq, self.der, self.val = op, izq, der, val
-    def es_val(self): return self.val is not None
-
 def construir_ast(tokens: List[str]) -> Nodo:
     vals: List[Nodo] = []
     ops:  List[str]  = []
@@ -451,8 +451,13 @@ def _extraer_asignacion(linea: str) -> Tuple[Union[str,None], str]:
 # VENTANA (muestra TODAS las expresiones)
 # =========================================================
 class Ventana2x2(tk.Toplevel):
-    def __init__(self, master=None):
+    def __init__(self, master=None, operaciones=None, programa=None):
+        # programa: AST del sintáctico (UnidadCompilacion.ast); cada expresión
+        # se toma de ahí ya analizada. Si no, operaciones: [(linea, tokens_rhs), ...]
+        # ya tokenizadas por el front-end; sin nada se lee operaciones.txt.
         super().__init__(master)
+        self.operaciones = operaciones
+        self.programa = programa
         self.title("Notación Polaca - Código P - Triplos - Cuádruplos")
         self.geometry("1200x740")
         self.configure(background=AREA_BG)
@@ -527,22 +532,42 @@ class Ventana2x2(tk.Toplevel):
 
     # ---------- pipeline ----------
     def _cargar_y_mostrar(self):
-        try:
-            ops = leer_operaciones(RUTA_OPERACIONES)
-        except Exception as e:
-            messagebox.showerror("Error al leer archivo", str(e)); return
+        arboles = None
+        if self.programa is not None:
+            pares = operaciones_de_arbol(self.programa)
+            ops = [linea for linea, _ in pares]
+            arboles = [asig for _, asig in pares]
+            toks_rhs = None
+        elif self.operaciones is not None:
+            ops = [linea for linea, _ in self.operaciones]
+            toks_rhs = [toks for _, toks in self.operaciones]
+        else:
+            try:
+                ops = leer_operaciones(RUTA_OPERACIONES)
+            except Exception as e:
+                messagebox.showerror("Error al leer archivo", str(e)); return
+            toks_rhs = None
         if not ops:
             messagebox.showinfo("Aviso", "No se encontraron asignaciones en el archivo."); return
-        self._mostrar_todas(ops)
+        self._mostrar_todas(ops, toks_rhs, arboles)
+
+    def _mostrar_todas(self, ops, toks_rhs=None, arboles=None):
+        # toks_rhs[i]: tokens del lado derecho de ops[i] (None = tokenizar aquí)
+        # arboles[i]: su Arbol.Asignacion; si está, ninguna etapa re-analiza la expresión
+        toks_rhs = toks_rhs or [None] * len(ops)
+        arboles = arboles or [None] * len(ops)
 
-    def _mostrar_todas(self, ops):
         # ===================== PILAS (Notación Polaca) =====================
         self.txt_rpn.config(state='normal'); self.txt_rpn.delete("1.0", tk.END)
         for i, linea in enumerate(ops, start=1):
             lhs, rhs = _extraer_asignacion(linea)
             try:
-                toks = tokenize(rhs)
-                ast  = construir_ast(toks)
+                if arboles[i-1] is not None:
+                    ast = convertir(arboles[i-1].valor, lambda v: Nodo(val=v),
+                                    lambda op, izq, der: Nodo(op=op, izq=izq, der=der))
+                else:
+                    toks = toks_rhs[i-1] if toks_rhs[i-1] is not None else tokenize(rhs)
+                    ast  = construir_ast(toks)
                 expr_par = parentizar_total(ast)
                 filas, concat = generar_filas(expr_par)
 
@@ -569,7 +594,10 @@ class Ventana2x2(tk.Toplevel):
         self.txt_p.config(state='normal'); self.txt_p.delete("1.0", tk.END)
         for i, linea in enumerate(ops, start=1):
             try:
-                pcode = self.pco.generar_pcode(linea)
+                if arboles[i-1] is not None:
+                    pcode = self.pco.generar_pcode_arbol(arboles[i-1].destino.nombre, arboles[i-1].valor)
+                else:
+                    pcode = self.pco.generar_pcode(linea, toks_rhs[i-1])
             except Exception as e:
                 pcode = [f"ERROR: {e}"]
             self.txt_p.insert(tk.END, f"EXPRECION {i} --> {linea}\n" + "-"*40 + "\n")
@@ -582,7 +610,10 @@ class Ventana2x2(tk.Toplevel):
         for i, linea in enumerate(ops, start=1):
             self.tv_tri.insert("", tk.END, values=("", f"EXPRECION {i}", "", ""))
             try:
-                tlist = self.tri.generar_triplos(linea)
+                if arboles[i-1] is not None:
+                    tlist = self.tri.generar_triplos_arbol(arboles[i-1].destino.nombre, arboles[i-1].valor)
+                else:
+                    tlist = self.tri.generar_triplos(linea, toks_rhs[i-1])
                 for j,(op,a1,a2) in enumerate(tlist):
                     self.tv_tri.insert("", tk.END, values=(f"[{j}]", op, a1, a2))
             except Exception as e:
@@ -594,8 +625,12 @@ class Ventana2x2(tk.Toplevel):
             var, expr = [s.strip() for s in linea.split("=",1)]
             self.tv_cuad.insert("", tk.END, values=(f"EXPRECION {i}", "", "", ""))
             try:
-                post_ok = self.tri.infijo_a_postfijo(self.tri.tokenizar(expr))
-                raiz, _Nodo = ast_desde_postfijo(post_ok, self.tri.OPERADORES)
+                if arboles[i-1] is not None:
+                    raiz = ast_desde_arbol(arboles[i-1].valor)
+                else:
+                    toks = toks_rhs[i-1] if toks_rhs[i-1] is not None else self.tri.tokenizar(expr)
+                    post_ok = self.tri.infijo_a_postfijo(toks)
+                    raiz, _Nodo = ast_desde_postfijo(post_ok, self.tri.OPERADORES)
                 asignar_inorder_idx(raiz)
                 cuad = emitir_cuadruplos(raiz, self.tri.OPERADORES, var)
             except Exception as e:
@@ -606,16 +641,17 @@ class Ventana2x2(tk.Toplevel):
 # =========================================================
 # Helper para Cuádruplos ya existente (no tocado)
 # =========================================================
+def es_num(x):  return bool(re.fullmatch(r'(?:\d+\.\d*|\d*\.\d+|\d+)', x))
+def es_id(x):   return x.startswith("$") and len(x)>1 and all(ch.isalnum() or ch=="_" for ch in x[1:])
+
+def ast_desde_arbol(expr):
+    # mismo árbol que ast_desde_postfijo, directo desde el AST del sintáctico
+    def hoja(v):
+        if not (es_num(v) or es_id(v)): raise ValueError(f"Token inesperado: {v}")
+        return Nodo2(val=v)
+    return convertir(expr, hoja, lambda op, izq, der: Nodo2(op=op, izq=izq, der=der))
+
 def ast_desde_postfijo(post, opdef):
-    class Nodo2:
-        __slots__ = ("op","izq","der","val","inorder_idx")
-        def __init__(self, op=None, izq=None, der=None, val=None):
-            self.op, self.izq, self.der, self.val = op, izq, der, val
-            self.inorder_idx = None
-        @property
-        def es_hoja(self): return self.op is None
-    def es_num(x):  return bool(re.fullmatch(r'(?:\d+\.\d*|\d*\.\d+|\d+)', x))
-    def es_id(x):   return x.startswith("$") and len(x)>1 and all(ch.isalnum() or ch=="_" for ch in x[1:])
     pila=[]
     for tk_ in post:
         if es_num(tk_) or es_id(tk_):
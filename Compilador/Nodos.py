@@ -0,0 +1,56 @@
+# Nodos.py
+# Nodos de los árboles que arman las etapas de código intermedio y el
+# semántico. Todos con __slots__: sin __dict__ por instancia, así que un
+# nodo ocupa lo justo para sus campos (ver medir_nodos.py). Cada módulo
+# los expone con su nombre de siempre (Nodo, Nodo2, Node, TreeNode).
+
+
+class NodoExpr:
+    """Nodo binario de expresión: operador (op, izq, der) u hoja (val)."""
+    __slots__ = ("op", "izq", "der", "val")
+
+    def __init__(self, op=None, izq=None, der=None, val=None):
+        self.op, self.izq, self.der, self.val = op, izq, der, val
+
+    def es_val(self):
+        return self.val is not None
+
+    @property
+    def es_hoja(self):
+        return self.op is None
+
+
+class NodoInorden(NodoExpr):
+    """NodoExpr con su índice en el recorrido inorden (triplos: orden de evaluación)."""
+    __slots__ = ("inorder_idx",)
+
+    def __init__(self, op=None, izq=None, der=None, val=None):
+        NodoExpr.__init__(self, op, izq, der, val)
+        self.inorder_idx = None
+
+
+class NodoPCode:
+    """Nodo del GeneradorPCode: hoja con 'value' u operador con left/right."""
+    __slots__ = ("value", "op", "left", "right")
+
+    def __init__(self, value=None, op=None, left=None, right=None):
+        self.value, self.op, self.left, self.right = value, op, left, right
+
+    def is_leaf(self):
+        return self.value is not None
+
+
+class NodoDibujo:
+    """Nodo n-ario que se dibuja (árbol semántico): etiqueta, valor y la caja (x, y, w, h)."""
+    __slots__ = ("label", "valor", "children", "x", "y", "w", "h")
+
+    def __init__(self, label, valor=None, children=None):
+        self.label = label
+        self.valor = valor
+        self.children = children or []
+        self.x = 0; self.y = 0; self.w = 0; self.h = 0
+
+    def text(self):
+        if self.valor is not None:
+            return f"{self.label}\nValor\n{self.valor}"
+        return f"{self.label}"
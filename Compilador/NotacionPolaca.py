@@ -1,6 +1,7 @@
 import os
 import re
 from typing import List, Tuple, Union
+from Nodos import NodoExpr as Nodo
 
 # ================== Util de ruta ==================
 def _base_dir():
@@ -20,11 +21,6 @@ PREC = {'+':1, '-':1, '*':2, '/':2}
 ABRE   = set("([{")
 CIERRA = {')':'(', ']':'[', '}':'{'}
 
-class Nodo:
-    def __init__(self, op: str=None, izq: 'Nodo'=None, der: 'Nodo'=None, val: str=None):
-        self.op, self.izq, self.der, self.val = op, izq, der, val
-    def es_val(self): return self.val is not None
-
 def construir_ast(tokens: List[str]) -> Nodo:
     vals: List[Nodo] = []
     ops:  List[str]  = []
@@ -194,14 +194,16 @@ class GeneradorPCode:
         self._emit_node(n.right, out)
         out.append(self.OPERADORES[op]['pcode'])
 
-    def generar_pcode(self, cadena: str):
+    def generar_pcode(self, cadena: str, tokens=None):
+        # 'tokens': lado derecho ya tokenizado (opcional), para no re-tokenizar
         if '=' not in cadena:
             raise ValueError("Incluye '='. Ej: $x= a + b")
         var, expr = [s.strip() for s in cadena.split('=', 1)]
         if not self.es_identificador(var):
             raise ValueError("La variable a la izquierda del '=' debe iniciar con '$' (ej. $x).")
 
-        tokens = self.tokenizar(expr)
+        if tokens is None:
+            tokens = self.tokenizar(expr)
         post   = self.infijo_a_postfijo(tokens)
         raiz   = self._ast_desde_postfijo(post)
 
@@ -3,6 +3,7 @@ import os
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from tkinter import font as tkfont
+from Nodos import NodoDibujo
 
 class SemanticoApp:
 
@@ -138,21 +139,22 @@ class SemanticoApp:
 
 
     @classmethod
-    def run(cls, auto_run=False, parent=None):
-        app = cls(parent=parent, auto_run=auto_run)
+    def run(cls, auto_run=False, parent=None, unidad=None):
+        app = cls(parent=parent, auto_run=auto_run, unidad=unidad)
         app._mainloop_if_root()
 
 
-    def __init__(self, parent=None, auto_run=False):
+    def __init__(self, parent=None, auto_run=False, unidad=None):
         self.parent = parent
         self.auto_run = auto_run
+        self.unidad = unidad   # Compilacion.UnidadCompilacion (opcional)
 
         self.root = tk.Toplevel(parent) if parent is not None else tk.Tk()
         self.root.title("Árbol semántico")
         self.root.geometry("1250x760")
 
         self.file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cadena_entrada.txt")
-        self.valid_ids = self._load_vars_file()
+        self.valid_ids = list(unidad.variables) if unidad is not None else self._load_vars_file()
 
         self.expr_roots = []
         self.current_scale = 1.0
@@ -165,17 +167,7 @@ class SemanticoApp:
             self.root.after(200, self.root.lift)
 
 
-    class TreeNode:
-        def __init__(self, label, valor=None, children=None):
-            self.label = label
-            self.valor = valor
-            self.children = children or []
-            self.x = 0; self.y = 0; self.w = 0; self.h = 0
-        def text(self):
-
-            if self.valor is not None:
-                return f"{self.label}\nValor\n{self.valor}"
-            return f"{self.label}"
+    TreeNode = NodoDibujo
 
 
     @classmethod
@@ -216,13 +208,92 @@ class SemanticoApp:
         out.append(("EOF","EOF", line_of(len(text)-1 if text else 0)))
         return out
 
+    @classmethod
+    def tokenize_archivo(cls, path, valid_ids=None):
+        """
+        Igual que tokenize() pero leyendo el archivo línea por línea (ningún
+        token cruza un salto de línea), sin cargar el programa completo en un str.
+        """
+        out, ln = [], 0
+        with open(path, "r", encoding="utf-8") as f:
+            for ln, linea in enumerate(f, start=1):
+                pos = 0
+                while pos < len(linea):
+                    m = cls.token_re.match(linea, pos)
+                    if not m:
+                        raise SyntaxError(f"Léxico: carácter inesperado en línea {ln}: {linea[pos]!r}")
+                    typ, val = m.lastgroup, m.group()
+                    pos = m.end()
+                    if typ in ("WS","COMMENT"): continue
+                    if typ == "ID":
+                        out.append((cls.KEYWORDS.get(val, "ID"), val, ln))
+                    elif typ == "NUM":
+                        out.append(("NUM", float(val) if "." in val else int(val), ln))
+                    elif typ == "STR":
+                        out.append(("STR", val[1:-1], ln))
+                    else:
+                        out.append((typ, val, ln))
+        out.append(("EOF","EOF", max(ln, 1)))
+        return out
+
+    @classmethod
+    def tokenize_flujo(cls, flujo, ultima_linea=1):
+        """
+        Mismas tuplas que tokenize() pero a partir del FlujoTokens del léxico
+        (ver Compilacion.UnidadCompilacion), sin volver a escanear el fuente.
+        Los grupos que no se traducen directo pasan por token_re sobre su lexema.
+        """
+        out = []
+        for grupo, val, ln, _col in flujo:
+            if grupo == "comentarios":
+                continue
+            if grupo in ("identificadores", "palabras_clave", "tipos", "booleanos"):
+                out.append((cls.KEYWORDS.get(val, "ID"), val, ln))
+            elif grupo == "numeros":
+                out.append(("NUM", float(val) if "." in val else int(val), ln))
+            elif grupo == "cadenas":
+                out.append(("STR", val[1:-1], ln))
+            else:
+                pos = 0
+                while pos < len(val):
+                    m = cls.token_re.match(val, pos)
+                    if not m:
+                        raise SyntaxError(f"Léxico: carácter inesperado en línea {ln}: {val[pos]!r}")
+                    typ, txt = m.lastgroup, m.group()
+                    pos = m.end()
+                    if typ in ("WS","COMMENT"): continue
+                    if typ == "ID":
+                        out.append((cls.KEYWORDS.get(txt, "ID"), txt, ln))
+                    elif typ == "NUM":
+                        out.append(("NUM", float(txt) if "." in txt else int(txt), ln))
+                    elif typ == "STR":
+                        out.append(("STR", txt[1:-1], ln))
+                    else:
+                        out.append((typ, txt, ln))
+        out.append(("EOF","EOF", ultima_linea))
+        return out
+
+    @classmethod
+    def _tokens_de(cls, unidad):
+        if unidad is not None:
+            return cls.tokenize_flujo(unidad.flujo, unidad.ultima_linea)
+        file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cadena_entrada.txt")
+        return cls.tokenize_archivo(file_path)
+
 
     class Parser:
-        def __init__(self, owner, toks):
+        """
+        Chequeo de tipos/valores sobre los tokens. Con arboles=False es la
+        pasada rápida: solo tabla de símbolos y errores, sin armar ningún
+        TreeNode (prechequeo); con arboles=True además arma los árboles de
+        las asignaciones con operadores, para dibujarlos o exportarlos.
+        """
+        def __init__(self, owner, toks, arboles=True):
             self.o = owner
             self.toks = toks; self.i = 0
+            self.arboles = arboles
             self.symtab = {}         # nombre -> {tipo, valor, usada, inicializada}
-            self.expr_roots = []     # árboles de Exp (uno por asignación)
+            self.expr_roots = []     # árboles de Exp (uno por asignación; vacío si arboles=False)
             self.errors = []         # lista de errores semánticos (lineados)
             self.had_div = False
             self.had_op = False      # evita dibujar $a=4; o $b=$a;
@@ -232,6 +303,8 @@ class SemanticoApp:
             self.errors.append(f"Línea {line}: {msg}")
 
         def cur(self): return self.toks[self.i]
+        def _hoja(self, label, valor=None):
+            return self.o.TreeNode(label, valor) if self.arboles else None
         def eat(self, t):
             c = self.cur()
             if c[0]!=t:
@@ -347,7 +420,7 @@ class SemanticoApp:
             self.symtab[nombre]["inicializada"]=True
 
 
-            if self.had_op:
+            if self.had_op and self.arboles:
                 self.expr_roots.append(self.o.TreeNode(f"Asignación a {nombre}", valor=val, children=[enode]))
 
 
@@ -369,9 +442,10 @@ class SemanticoApp:
                 else:
                     left_val = left_val + rval if op=="PLUS" else left_val - rval
                     left_typ = "dec" if (left_typ=="dec" or rtyp=="dec") else "ente"
-                label = "+" if op=="PLUS" else "-"
-                left_node = self.o.TreeNode("Exp", left_val, [left_node, self.o.TreeNode("operador", label), rnode])
-            if left_node.label!="Exp":
+                if self.arboles:
+                    label = "+" if op=="PLUS" else "-"
+                    left_node = self.o.TreeNode("Exp", left_val, [left_node, self.o.TreeNode("operador", label), rnode])
+            if self.arboles and left_node.label!="Exp":
                 left_node = self.o.TreeNode("Exp", left_val, [left_node])
             return left_node, float(left_val), left_typ
 
@@ -406,10 +480,11 @@ class SemanticoApp:
                             self._error("División entre cero", self.cur()[2]); rval = 1.0
                         left_val = left_val / rval; left_typ = "dec"
 
-                label="*" if op=="MUL" else "/"
-                left_node = self.o.TreeNode("Term", left_val, [left_node, self.o.TreeNode("operador", label), rnode])
+                if self.arboles:
+                    label="*" if op=="MUL" else "/"
+                    left_node = self.o.TreeNode("Term", left_val, [left_node, self.o.TreeNode("operador", label), rnode])
 
-            if left_node.label!="Term":
+            if self.arboles and left_node.label!="Term":
                 left_node = self.o.TreeNode("Term", left_val, [left_node])
             return left_node, float(left_val), left_typ
 
@@ -420,7 +495,7 @@ class SemanticoApp:
             if t[0]=="NUM":
                 self.i+=1
                 typ = "dec" if isinstance(t[1], float) else "ente"
-                return self.o.TreeNode("Numero", float(t[1]), []), float(t[1]), typ
+                return self._hoja("Numero", float(t[1])), float(t[1]), typ
 
 
             if t[0]=="ID":
@@ -428,17 +503,17 @@ class SemanticoApp:
                 if not name.startswith("$"):
                     self._error(f"Las variables deben iniciar con '$': {name}", ln)
                     self.i+=1
-                    return self.o.TreeNode("nomvar", name), 0.0, "otro"
+                    return self._hoja("nomvar", name), 0.0, "otro"
                 self.i+=1
                 if name not in self.symtab:
                     self._error(f"Identificador no declarado: '{name}'", ln)
                     self.symtab[name] = {"tipo":"ente","valor":None,"usada":True,"inicializada":False}
-                    return self.o.TreeNode("nomvar", name), 0.0, "ente"
+                    return self._hoja("nomvar", name), 0.0, "ente"
                 self.symtab[name]["usada"] = True
                 var_tipo = self.symtab[name]["tipo"]
                 if var_tipo in self.o.NON_NUMERIC_TYPES:
                     self._error(f"Uso no numérico en aritmética: '{name}' es {var_tipo}", ln)
-                    return self.o.TreeNode("nomvar", name), 0.0, var_tipo
+                    return self._hoja("nomvar", name), 0.0, var_tipo
                 v = self.symtab[name]["valor"]
                 if v is None or not self.symtab[name]["inicializada"]:
                     self._error(f"La variable '{name}' se usa antes de ser inicializada", ln)
@@ -446,31 +521,33 @@ class SemanticoApp:
                     typ = "ente" if var_tipo=="ente" else "dec"
                 else:
                     typ = "ente" if var_tipo=="ente" else "dec"
-                return self.o.TreeNode("nomvar", name), float(v), typ
+                return self._hoja("nomvar", name), float(v), typ
 
 
             if t[0]=="STR":
                 self._error("No se puede usar cadena en expresión aritmética", t[2])
                 self.i += 1
-                return self.o.TreeNode("cadena"), 0.0, "cade"
+                return self._hoja("cadena"), 0.0, "cade"
 
 
             if t[0]=="BOOL":
                 self._error("No se puede usar booleano en expresión aritmética", t[2])
                 self.i += 1
-                return self.o.TreeNode("booleano"), 0.0, "bool"
+                return self._hoja("booleano"), 0.0, "bool"
 
 
             if t[0]=="LPAREN":
                 self.i+=1
                 en, val, typ = self.Exp()
                 self.eat("RPAREN")
+                if not self.arboles:
+                    return None, float(val), typ
                 return self.o.TreeNode("Factor", val, [self.o.TreeNode("("), en, self.o.TreeNode(")")]), float(val), typ
 
 
             self._error(f"Se esperaba NUM, ID ($var), cadena no, o '(' y llegó {t[0]}", t[2])
             self.i += 1
-            return self.o.TreeNode("Error"), 0.0, "otro"
+            return self._hoja("Error"), 0.0, "otro"
 
     # ---------- Dibujo ----------
     class Drawer:
@@ -612,20 +689,19 @@ class SemanticoApp:
         txt_right.configure(state="disabled")  # solo lectura
 
     @classmethod
-    def _precheck_semantic(cls):
+    def _precheck_semantic(cls, unidad=None, arboles=False):
         """
         Corre el análisis semántico sin UI para saber si hay errores.
+        Con 'unidad' usa su flujo de tokens en vez de cadena_entrada.txt.
         Devuelve (ok, errores, roots).
         - ok = True si NO hay errores.
         - errores = lista de strings (puede estar vacía).
-        - roots = árboles de expresiones que se dibujarían.
+        - roots = árboles de expresiones que se dibujarían; solo con
+          arboles=True (por defecto es la pasada rápida y queda []).
         """
         try:
-            file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cadena_entrada.txt")
-            with open(file_path, "r", encoding="utf-8") as f:
-                code = f.read()
-            toks = cls.tokenize(code)
-            parser = cls.Parser(cls, toks)
+            toks = cls._tokens_de(unidad)
+            parser = cls.Parser(cls, toks, arboles=arboles)
             _symtab, roots, errors = parser.parse()
             ok = (len(errors) == 0)
             return ok, errors, roots
@@ -634,7 +710,7 @@ class SemanticoApp:
             return False, [f"Error interno en prechequeo: {str(e)}"], []
 
     @classmethod
-    def open_grammar_first(cls, parent=None, auto_run=True):
+    def open_grammar_first(cls, parent=None, auto_run=True, unidad=None):
 
         """
             Abre una ventana con la gramática en dos columnas (solo lectura)
@@ -642,7 +718,7 @@ class SemanticoApp:
             Antes de abrir, hace pre-chequeo semántico: si hay errores, NO abre nada.
             """
         # ===== BLOQUEO: pre-chequeo semántico SIN UI =====
-        ok, errores, roots = cls._precheck_semantic()
+        ok, errores, roots = cls._precheck_semantic(unidad)
 
         # manda errores al panel principal si hay hook
         sink = getattr(cls, "ERROR_SINK", None)
@@ -715,7 +791,7 @@ class SemanticoApp:
 
         def abrir_arbol():
             # 1) Pre–chequeo semántico sin UI
-            ok, errores, roots = cls._precheck_semantic()
+            ok, errores, roots = cls._precheck_semantic(unidad)
 
             # 2) Si hay hook de errores (ventana principal), envía ahí para que el usuario los vea
             sink = getattr(cls, "ERROR_SINK", None)
@@ -731,7 +807,7 @@ class SemanticoApp:
                 return
 
             # 4) Si TODO OK, ahora sí abre la ventana de árboles
-            cls.run(auto_run=True, parent=parent if parent is not None else top)
+            cls.run(auto_run=True, parent=parent if parent is not None else top, unidad=unidad)
             # Si deseas cerrar la ventana de gramática al abrir árboles, descomenta:
             # top.destroy()
 
@@ -764,10 +840,12 @@ class SemanticoApp:
     # ---------- Acciones de UI ----------
     def run_analysis(self):
         try:
-            with open(self.file_path, "r", encoding="utf-8") as f:
-                code = f.read()
-            toks = self.tokenize(code, valid_ids=self.valid_ids)
-            parser = self.Parser(self, toks)
+            if self.unidad is not None:
+                toks = self.tokenize_flujo(self.unidad.flujo, self.unidad.ultima_linea)
+            else:
+                toks = self.tokenize_archivo(self.file_path, valid_ids=self.valid_ids)
+            # los árboles se arman recién aquí, al abrir la ventana que los dibuja
+            parser = self.Parser(self, toks, arboles=True)
             _symtab, roots, errors = parser.parse()
 
             self._show_errors(errors)
@@ -1,395 +1,142 @@
-import os, re, sys, threading, traceback
-
-class SintacticoApp:
-    DEBUG = False
-    _total_declared = None  # leído de variables.txt
-    _lex_values = {}        # idx(1-based) -> lexema real para num/strlit/boollit
-
-    # --- buffers/control para capturar asignaciones aritméticas ---
-    _ops_file_path = None          # ruta de operaciones.txt
-    _rhs_buffer = []               # [{'text': str, 'snap': int}, ...]
-    _assign_open = None            # {'lhs': str, 'tokens': [], 'snap': int, 'saw_strlit': bool, 'saw_op': bool}
-
-    # ----------------- utilidades de rutas -----------------
-    @classmethod
-    def _log(cls, msg):
-        if cls.DEBUG: print(msg)
-
-    @classmethod
-    def _ruta_base(cls):
-        return os.path.dirname(__file__)
-
-    @classmethod
-    def _candidatos_base(cls):
-        base = cls._ruta_base()
-        return [base, os.path.dirname(base), os.getcwd()]
-
-    @classmethod
-    def _buscar_en_candidatos(cls, nombre_archivo: str) -> str:
-        for base in cls._candidatos_base():
-            ruta = os.path.join(base, nombre_archivo)
-            if os.path.exists(ruta):
-                cls._log(f"[Sintáctico] Usando {nombre_archivo} en: {ruta}")
-                return ruta
-        ruta_def = os.path.join(cls._ruta_base(), nombre_archivo)
-        cls._log(f"[Sintáctico] {nombre_archivo} no encontrado. Intentaré en: {ruta_def}")
-        return ruta_def
-
-    # ----------------- lectura de variables ----------------
-    @classmethod
-    def leer_variables_desde_txt(cls, nombre="variables.txt"):
-        ruta = cls._buscar_en_candidatos(nombre)
-        vars_list, total_declared = [], None
-        if os.path.exists(ruta):
-            with open(ruta, "r", encoding="utf-8") as f:
-                for ln in f:
-                    t = ln.strip()
-                    if not t:
-                        continue
-                    m = re.search(r'^\s*TOTAL\s*[:=]\s*(\d+)\s*$', t, re.I)
-                    if m:
-                        total_declared = int(m.group(1))
-                        continue
-                    vars_list.append(t)
-        else:
-            cls._log(f"[Sintáctico] Advertencia: no existe {ruta}")
-        cls._total_declared = total_declared
-        return vars_list
-
-    # ----------------- tokenización ------------------------
-    @classmethod
-    def leer_cadena_desde_txt(cls, nombre="cadena_entrada.txt"):
-        ruta = cls._buscar_en_candidatos(nombre)
-        if not os.path.exists(ruta):
-            cls._log(f"[Sintáctico] Advertencia: no existe {ruta}")
-            return ["#"]
-
-        with open(ruta, "r", encoding="utf-8") as f:
-            texto = f.read()
-
-        # normalizar comillas curvas y quitar comentarios
-        texto = texto.replace("“", "\"").replace("”", "\"")
-        texto = re.sub(r'#.*?(?=\n|$)', '', texto)
-
-        patron = re.compile(
-            r'"[^"\n]*"'               # "texto"
-            r'|\$[A-Za-z_]\w*'         # $var
-            r'|\d+(?:\.\d+)?'          # número
-            r'|[A-Za-z]+'              # palabras
-            r'|[,;()=+\-*/]'           # símbolos
-        )
-
-        raw = patron.findall(texto)
-        toks = []
-        cls._lex_values = {}
-        pos = 1  # índice 1-based
-
-        for t in raw:
-            if not t:
-                continue
-            if t[0] == '"':
-                toks.append("strlit"); cls._lex_values[pos] = t
-            elif t[0] == '$':
-                toks.append(t)
-            elif re.fullmatch(r'\d+(?:\.\d+)?', t):
-                toks.append("num"); cls._lex_values[pos] = t
-            elif t.lower() in ("verdadero", "falso"):
-                toks.append("boollit"); cls._lex_values[pos] = t.lower()
-            else:
-                toks.append(t)
-            pos += 1
-
-        if not toks or toks[-1] != "#":
-            toks.append("#")
-        return toks
-
-    # ----------------- gramática ---------------------------
-    @classmethod
-    def construir_gramatica_fija(cls, vars_nomvar):
-        G = {
-            "Sentencia": [["Ini", "Sentencias", "end"]],
-            "Sentencias": [["TipoSent", ";", "Sentencias"], ["TipoSent", ";"]],
-            "TipoSent": [["DeclaracionVar"], ["PideDatos"], ["MostrarDatos"], ["Asignacion"]],
-            "DeclaracionVar": [["tipoDato", "ListaNomvar"]],
-            "ListaNomvar": [["nomvar"], ["nomvar", ",", "ListaNomvar"]],
-            "PideDatos": [["leer", "nomvar"], ["leer"]],
-            "MostrarDatos": [["mostrar", "ListaMostrar"], ["mostrar"]],
-            "ListaMostrar": [["MostrarItem"], ["MostrarItem", ",", "ListaMostrar"]],
-            "MostrarItem": [["nomvar"], ["strlit"]],
-            "Asignacion": [["nomvar", "=", "Exp"], ["nomvar", "=", "strlit"]],
-            "Exp":   [["Term", "ExpP"]],
-            "ExpP":  [["+", "Term", "ExpP"], ["-", "Term", "ExpP"], []],
-            "Term":  [["Factor", "TermP"]],
-            "TermP": [["*", "Factor", "TermP"], ["/", "Factor", "TermP"], []],
-            "Factor":[["num"], ["nomvar"], ["boollit"], ["(", "Exp", ")"]],
-            "tipoDato": [["ente"], ["dec"], ["carac"], ["cade"], ["bool"]],
-        }
-        G["nomvar"] = [[v] for v in (vars_nomvar or [])]
-        labels = {(nt, i+1): f"{nt}{i+1}" for nt, alts in G.items() for i in range(len(alts))}
-        return G, "Sentencia", labels
-
-    # ----------------- helpers ------------------------------
-    @staticmethod
-    def alpha_to_str(alpha): return " ".join(alpha) if alpha else "ε"
-    @staticmethod
-    def beta_to_str(beta):  return " ".join(beta)
-    @classmethod
-    def _fmt_token(cls, tok, idx_1based):
-        val = cls._lex_values.get(idx_1based)
-        if tok in ("num", "strlit", "boollit") and val is not None:
-            return f"{tok}({val})"
-        return f"'{tok}'"
-    @classmethod
-    def _lexema(cls, tok, idx_1based):
-        if tok in ("num", "strlit", "boollit"):
-            return cls._lex_values.get(idx_1based, tok)
-        return tok
-    @classmethod
-    def _ultimo_match_terminal(cls, actions):
-        for k in range(len(actions) - 1, -1, -1):
-            a = actions[k]
-            if a.get("kind") == "match":
-                return a["detail"], k
-        return None, -1
-    @classmethod
-    def print_state(cls, mode, i, alpha, beta, note):
-        print(f"( {mode}, {i}, {cls.alpha_to_str(alpha)}, {cls.beta_to_str(beta)} )".ljust(75), note)
-
-    # ----------------- analizador (backtracking) ------------
-    @classmethod
-    def analyze(cls, grammar, start, labels, input_syms):
-        beta = [start, "#"]
-        alpha = []
-        mode = "n"
-        i = 1
-        actions, decisions = [], []
-
-        # buffers / archivo
-        cls._rhs_buffer = []
-        cls._assign_open = None
-        if cls._ops_file_path is None:
-            cls._ops_file_path = os.path.join(cls._ruta_base(), "operaciones.txt")
-        # limpiar archivo al inicio
+import os, threading, traceback
+from collections import deque
+from AnalisisSintactico import (AnalisisInterrumpido, EstadisticasParser, LimitesAnalisis,
+                                SesionSintactica, TrazaSintactica)
+
+class SalidaTexto:
+    """
+    Destino de stdout para un Text de Tk. write() puede llamarse desde
+    cualquier hilo y solo encola; un temporizador del hilo de Tk junta lo
+    pendiente cada 'intervalo_ms' y lo inserta con un solo insert/see. El
+    widget conserva a lo sumo 'max_lineas': las más viejas se pasan a
+    'ruta_desborde' (o se descartan si es None), así que el costo de mostrar
+    la traza depende de lo que hay en pantalla y no de su largo total.
+    Se crea en el hilo de Tk; cerrar() vuelca lo que falte y para el temporizador.
+    """
+
+    def __init__(self, text, max_lineas=5000, intervalo_ms=50, ruta_desborde=None):
+        self.text = text
+        self.max_lineas = max_lineas
+        self.intervalo_ms = intervalo_ms
+        self.ruta_desborde = ruta_desborde
+        self.desbordadas = 0            # líneas que ya no están en el widget
+        self._pendiente = deque()       # append/popleft son atómicos entre hilos
+        self._activa = True
+        self._archivo_nuevo = True
+        text.after(intervalo_ms, self._tick)
+
+    def write(self, s):
+        if s: self._pendiente.append(s)
+
+    def flush(self): pass
+
+    def cerrar(self):
+        self._activa = False            # el próximo tick vuelca el resto y no se reprograma
+
+    def _tomar(self):
+        partes = []
         try:
-            with open(cls._ops_file_path, "w", encoding="utf-8") as _:
-                pass
-        except Exception as e:
-            cls._log(f"[Sintáctico] No pude crear/limpiar operaciones.txt: {e}")
-
-        def a_sym():
-            idx = i - 1
-            return input_syms[idx] if 0 <= idx < len(input_syms) else "#"
-
-        print("\nTRAZA:")
-        cls.print_state("n", 1, alpha, beta, "Inicio")
-
-        while True:
-            # Éxito
-            if beta == ["#"] and a_sym() == "#":
-                cls.print_state("n", i, alpha, beta, "(3) fin de pila con '#'")
-
-                # volcar buffer sin duplicados
-                try:
-                    seen = set(); lines = []
-                    for it in cls._rhs_buffer:
-                        t = it["text"]
-                        if t not in seen:
-                            seen.add(t); lines.append(t)
-                    with open(cls._ops_file_path, "w", encoding="utf-8") as f:
-                        for t in lines: f.write(t + "\n")
-                except Exception as e:
-                    cls._log(f"[Sintáctico] Error al escribir operaciones.txt: {e}")
-
-                cls.print_state("t", i+1, alpha, ["ε"], "ACEPTA")
-                return True
-
-            if mode == "n":
-                X = beta[0]
-                a = a_sym()
-
-                # expandir no terminal
-                if X in grammar:
-                    rhss = grammar.get(X, [])
-                    if not rhss:
-                        mode = "r"
-                        cls.print_state("r", i, alpha, beta, "(4) no hay producciones para no terminal")
-                        continue
-                    alt = 1
-                    rhs = rhss[alt-1]
-                    beta = rhs + beta[1:]
-                    label = labels[(X, alt)]
-                    alpha.append(label)
-                    actions.append({"kind":"expand","detail":label,"nonterm":X,"alt":alt,"rhs":rhs})
-                    decisions.append({"X":X,"alt":alt,"i0":i,"alpha_len":len(alpha),"rhs":rhs})
-                    cls.print_state("n", i, alpha, beta, f"(1) entra {X}, aplica {label}")
-                    continue
-
-                # concordancia de terminal
-                if X not in grammar:
-                    if X == a:
-                        i_before = i  # índice del token a consumir
-
-                        # === CAPTURA de asignación completa LHS = RHS ; (backtracking-safe) ===
-                        if X == "=":
-                            prev_tok, _ = cls._ultimo_match_terminal(actions)
-                            lhs = prev_tok if isinstance(prev_tok, str) else None
-                            cls._assign_open = {
-                                "lhs": lhs,
-                                "tokens": [],
-                                "snap": len(actions),
-                                "saw_strlit": False,
-                                "saw_op": False  # <-- SOLO guardamos si hay + - * /
-                            }
-
-                        elif X == ";" and cls._assign_open is not None:
-                            # cerrar: guardar SOLO si no hubo strlit y sí hubo operador
-                            ao = cls._assign_open
-                            if not ao["saw_strlit"] and ao["saw_op"] and ao["tokens"] and ao["lhs"]:
-                                rhs_text = " ".join(ao["tokens"])
-                                linea = f"{ao['lhs']} = {rhs_text} ;"
-                                cls._rhs_buffer.append({"text": linea, "snap": ao["snap"]})
-                            cls._assign_open = None
-
-                        elif cls._assign_open is not None:
-                            # aún dentro de la RHS
-                            if X == "strlit":
-                                cls._assign_open["saw_strlit"] = True
-                            if X in ("+", "-", "*", "/"):
-                                cls._assign_open["saw_op"] = True
-                            lex = cls._lexema(X, i_before)
-                            cls._assign_open["tokens"].append(lex)
-                        # === FIN CAPTURA ===
-
-                        beta = beta[1:]
-                        alpha.append(X)
-                        actions.append({"kind":"match","detail":X})
-                        i += 1
-                        cls.print_state("n", i, alpha, beta, f"(2) concordancia {cls._fmt_token(X, i_before)}")
-                        continue
-                    else:
-                        cls.print_state(
-                            "r", i, alpha, beta,
-                            f"(4) no concuerda: {cls._fmt_token(X, i)} ≠ {cls._fmt_token(a, i)}"
-                        )
-                        mode = "r"
-                        continue
-
-                mode = "r"
-                cls.print_state("r", i, alpha, beta, "(4) estado no válido")
-                continue
-
-            # --------- retroceso ----------
-            else:
-                if not decisions:
-                    cls.print_state("e", i, alpha, beta, "(6b) sin más alternativas: RECHAZA")
-                    return False
-
-                # deshacer último match
-                if actions and actions[-1]["kind"] == "match":
-                    last = actions.pop()
-                    i -= 1
-                    beta = [last["detail"]] + beta
-
-                    # purgar capturas si retrocedimos por debajo del snapshot
-                    if cls._assign_open is not None and len(actions) < cls._assign_open["snap"]:
-                        cls._assign_open = None
-                    while cls._rhs_buffer and cls._rhs_buffer[-1]["snap"] > len(actions):
-                        cls._rhs_buffer.pop()
-
-                    # quitar último terminal de alpha
-                    for p in range(len(alpha)-1, -1, -1):
-                        if alpha[p] == last["detail"]:
-                            alpha.pop(p); break
-                    cls.print_state("r", i, alpha, beta, "(5) retroceso a la entrada")
-                    continue
-
-                # punto de decisión
-                dp = decisions[-1]
-                X = dp["X"]; rhss = grammar[X]
-                tried_alt = dp["alt"]; rhs = dp["rhs"]
-
-                # deshacer matches posteriores a expandir X
-                while i > dp["i0"]:
-                    k = len(actions) - 1
-                    while k >= 0 and actions[k]["kind"] != "match":
-                        k -= 1
-                    if k < 0: break
-                    m = actions.pop(k)
-                    i -= 1
-                    beta = [m["detail"]] + beta
-
-                    if cls._assign_open is not None and len(actions) < cls._assign_open["snap"]:
-                        cls._assign_open = None
-                    while cls._rhs_buffer and cls._rhs_buffer[-1]["snap"] > len(actions):
-                        cls._rhs_buffer.pop()
-
-                    for p in range(len(alpha)-1, -1, -1):
-                        if alpha[p] == m["detail"]:
-                            alpha.pop(p); break
-                    cls.print_state("r", i, alpha, beta, "(5) retroceso a la entrada")
+            while True:
+                partes.append(self._pendiente.popleft())
+        except IndexError:
+            pass
+        return "".join(partes)
+
+    def _desbordar(self, texto):
+        if not texto:
+            return
+        self.desbordadas += texto.count("\n")
+        if self.ruta_desborde is None:
+            return
+        try:
+            with open(self.ruta_desborde, "w" if self._archivo_nuevo else "a", encoding="utf-8") as f:
+                f.write(texto)
+            self._archivo_nuevo = False
+        except OSError:
+            self.ruta_desborde = None
+
+    def _volcar(self):
+        s = self._tomar()
+        if not s:
+            return
+        t = self.text
+        if s.count("\n") > self.max_lineas:
+            # lo nuevo ya no cabe: todo lo anterior y su cabeza van directo al archivo
+            lineas = s.splitlines(True)
+            self._desbordar(t.get("1.0", "end-1c"))
+            t.delete("1.0", "end")
+            self._desbordar("".join(lineas[:-self.max_lineas]))
+            s = "".join(lineas[-self.max_lineas:])
+        t.insert("end", s)
+        exceso = int(t.index("end-1c").split(".")[0]) - 1 - self.max_lineas
+        if exceso > 0:
+            fin = f"{exceso + 1}.0"
+            self._desbordar(t.get("1.0", fin))
+            t.delete("1.0", fin)
+        t.see("end")
+
+    def _tick(self):
+        try:
+            self._volcar()
+        except Exception:
+            return                      # la ventana ya se cerró
+        if self._activa or self._pendiente:
+            self.text.after(self.intervalo_ms, self._tick)
 
-                # volver a X
-                if beta[:len(rhs)] == rhs:
-                    beta = [X] + beta[len(rhs):]
-                else:
-                    beta = [X] + beta
-                # quitar etiqueta Xj de alpha
-                for p in range(len(alpha)-1, -1, -1):
-                    if alpha[p] == f"{X}{tried_alt}":
-                        alpha.pop(p); break
-                # quitar acción 'expand' de Xj
-                q = len(actions) - 1
-                while q >= 0:
-                    a_act = actions[q]
-                    if a_act["kind"] == "expand" and a_act["nonterm"] == X and a_act["alt"] == tried_alt:
-                        actions.pop(q); break
-                    q -= 1
-                cls.print_state("r", i, alpha, beta, f"(6c) deshacer producción {X}{tried_alt} (volver a {X})")
 
-                # siguiente alternativa
-                next_alt = tried_alt + 1
-                if next_alt <= len(rhss):
-                    new_rhs = rhss[next_alt-1]
-                    beta = new_rhs + beta[1:]
-                    new_label = f"{X}{next_alt}"
-                    alpha.append(new_label)
-                    actions.append({"kind":"expand","detail":new_label,"nonterm":X,"alt":next_alt,"rhs":new_rhs})
-                    decisions[-1] = {"X":X,"alt":next_alt,"i0":dp["i0"],"alpha_len":len(alpha),"rhs":new_rhs}
-                    cls.print_state("n", i, alpha, beta, f"(6a) siguiente alternativa de {X}: aplica {new_label}")
-                    mode = "n"
-                else:
-                    decisions.pop()
-                continue
+class SintacticoApp:
+    # configuración de las sesiones que arma la app (ver SesionSintactica):
+    # p.ej. SintacticoApp.MODO = "ll1" vale para los análisis que se lancen después
+    DEBUG = SesionSintactica.DEBUG
+    MODO = SesionSintactica.MODO
+    TRAZA = SesionSintactica.TRAZA
+    TRAZA_RECIENTES = SesionSintactica.TRAZA_RECIENTES
+    MAX_PASOS = SesionSintactica.MAX_PASOS
+    MAX_SEGUNDOS = SesionSintactica.MAX_SEGUNDOS
+    DIR_CACHE = SesionSintactica.DIR_CACHE
+    RECUPERAR = SesionSintactica.RECUPERAR
+    SINCRONIZACION = SesionSintactica.SINCRONIZACION
+    ERROR_SINK = SesionSintactica.ERROR_SINK
+    PROCESOS = SesionSintactica.PROCESOS
+    SENTENCIAS_POR_TROZO = SesionSintactica.SENTENCIAS_POR_TROZO
+    SALIDA_MAX_LINEAS = 5000    # líneas de traza que se conservan en la ventana (ver SalidaTexto)
+    SALIDA_INTERVALO_MS = 50    # cada cuánto se vuelca la salida pendiente al widget
+
+    # ----------------- sesiones -----------------------------
+    @classmethod
+    def nueva_sesion(cls, limites=None, **config):
+        """
+        SesionSintactica con la configuración de la app (MODO, TRAZA,
+        ERROR_SINK...) y lo que cambie 'config' (p.ej. SALIDA). Cada sesión
+        tiene su propio estado, así que varias pueden analizar a la vez
+        (hilos, pool, async) sin pisarse. Por defecto no escribe
+        operaciones.txt (archivo compartido) y su salida va a SALIDA sin
+        cambiar sys.stdout.
+        """
+        base = {k: getattr(cls, k) for k in SesionSintactica.CONFIG if hasattr(cls, k)}
+        base.update(config)
+        return SesionSintactica(limites, **base)
 
     # ----------------- API p/botón --------------------------
     @classmethod
-    def analizar_sintactico(cls, *_):
-        vars_nomvar = cls.leer_variables_desde_txt("variables.txt")
-        total_decl = cls._total_declared
-        if total_decl is not None and total_decl != len(vars_nomvar):
-            raise ValueError(
-                f"TOTAL declarado en variables.txt = {total_decl}, "
-                f"pero se encontraron {len(vars_nomvar)} variables listadas."
-            )
-        if not vars_nomvar:
-            print("[Aviso] No se leyeron variables; 'nomvar' quedará vacío.")
-        grammar, start, labels = cls.construir_gramatica_fija(vars_nomvar)
-        input_syms = cls.leer_cadena_desde_txt("cadena_entrada.txt")
-        cls.analyze(grammar, start, labels, input_syms)
+    def analizar_sintactico(cls, unidad=None, limites=None):
+        """
+        Un análisis en una sesión nueva que escribe operaciones.txt, como
+        siempre (ver SesionSintactica.analizar_sintactico). Para leer después
+        errores, árbol o estadísticas, usar nueva_sesion() directamente.
+        """
+        sesion = cls.nueva_sesion(limites, ESCRIBIR_OPERACIONES=True)
+        return sesion.analizar_sintactico(unidad)
 
     # ----------------- Redirección a Text -------------------
-    class _TextRedirector:
-        def __init__(self, text_widget): self.text = text_widget
-        def write(self, s):
-            if s: self.text.after(0, self._append, s)
-        def flush(self): pass
-        def _append(self, s):
-            try:
-                self.text.insert("end", s); self.text.see("end")
-            except Exception: pass
+    @classmethod
+    def _salida_texto(cls, text_widget):
+        """SalidaTexto para la traza; lo que no entra en el widget va a traza_desbordada.txt."""
+        return SalidaTexto(text_widget, cls.SALIDA_MAX_LINEAS, cls.SALIDA_INTERVALO_MS,
+                           os.path.join(os.path.dirname(__file__), "traza_desbordada.txt"))
 
     # ----------------- UI (Tkinter) -------------------------
-    def __init__(self, parent=None, limpiar=True, titulo="Sintáctico - Traza (Backtracking)"):
+    def __init__(self, parent=None, limpiar=True, titulo="Sintáctico - Traza (Backtracking)", unidad=None):
         import tkinter as tk
         from tkinter import ttk
         from tkinter import scrolledtext as st
@@ -399,7 +146,13 @@ class SintacticoApp:
 
         main = ttk.Frame(self.win, padding=10); main.pack(fill="both", expand=True)
         top = ttk.Frame(main); top.pack(fill="x", pady=(0,8))
-        ttk.Button(top, text="Cerrar", command=self.win.destroy).pack(side="right")
+        ttk.Button(top, text="Cerrar", command=self._cerrar).pack(side="right")
+        self.btn_cancelar = ttk.Button(top, text="Cancelar", command=self._cancelar)
+        self.btn_cancelar.pack(side="right", padx=(0,6))
+        self.btn_estadisticas = ttk.Button(top, text="Exportar estadísticas (JSON)",
+                                           command=self._exportar_estadisticas, state="disabled")
+        self.btn_estadisticas.pack(side="left")
+        self.win.protocol("WM_DELETE_WINDOW", self._cerrar)
 
         self.txt = st.ScrolledText(main, wrap="none", height=28, undo=False)
         self.txt.configure(font=("Consolas", 10)); self.txt.pack(fill="both", expand=True)
@@ -407,49 +160,107 @@ class SintacticoApp:
         self.status = ttk.Label(main, text="Ejecutando…", anchor="w")
         self.status.pack(fill="x", pady=(8,0))
 
+        self.unidad = unidad
+        self.limites = LimitesAnalisis(self.MAX_PASOS, self.MAX_SEGUNDOS)
+        self.salida = self._salida_texto(self.txt)
+        # la sesión escribe directo en la ventana: sys.stdout no se toca
+        self.sesion = self.nueva_sesion(self.limites, SALIDA=self.salida, ESCRIBIR_OPERACIONES=True)
+
         threading.Thread(target=self._run, daemon=True).start()
         if parent is None: self.win.mainloop()
 
+    def _cancelar(self):
+        self.limites.cancelar()
+        self._estado("Cancelando…")
+
+    def _cerrar(self):
+        # que el hilo del análisis no siga ocupando la CPU sin ventana
+        self.limites.cancelar()
+        self.win.destroy()
+
+    def _exportar_estadisticas(self):
+        from tkinter import filedialog, messagebox
+        estad = self.sesion.estadisticas
+        if estad is None:
+            return
+        ruta = filedialog.asksaveasfilename(parent=self.win, defaultextension=".json",
+                                            initialfile="estadisticas_sintactico.json",
+                                            filetypes=[("JSON", "*.json")])
+        if not ruta:
+            return
+        try:
+            estad.exportar_json(ruta)
+        except OSError as e:
+            messagebox.showerror("Estadísticas", f"No pude guardar {ruta}:\n{e}", parent=self.win)
+
+    def _estado_con_estadisticas(self, texto):
+        estad = self.sesion.estadisticas
+        if estad is not None:
+            texto = f"{texto} — {estad.resumen()}"
+            try:
+                self.btn_estadisticas.state(["!disabled"])
+            except Exception:
+                pass
+        self._estado(texto)
+
+    def _estado(self, texto):
+        try:
+            self.status.config(text=texto)
+        except Exception:
+            pass  # la ventana ya se cerró
+
     def _run(self):
-        so, se = sys.stdout, sys.stderr
-        redir = self._TextRedirector(self.txt)
+        sesion = self.sesion
         try:
             self.txt.delete("1.0", "end")
-            sys.stdout = redir; sys.stderr = redir
-            self.status.config(text="Ejecutando…")
-            self.__class__.analizar_sintactico()
-            self.status.config(text="Ejecución terminada")
+            self._estado("Ejecutando…")
+            sesion.analizar_sintactico(self.unidad)
+            self._estado_con_estadisticas("Ejecución terminada")
+        except AnalisisInterrumpido as e:
+            sesion._escribir(f"\n[Interrumpido] {e}\n"); self._estado_con_estadisticas("Análisis interrumpido")
         except ValueError as e:
-            print(f"[Error] {e}\n"); self.status.config(text="Error en variables.txt")
+            sesion._escribir(f"[Error] {e}\n"); self._estado("Error en variables.txt")
         except Exception:
-            traceback.print_exc(); self.status.config(text="Ocurrió un error (ver traza arriba)")
+            traceback.print_exc(file=self.salida); self._estado("Ocurrió un error (ver traza arriba)")
         finally:
-            sys.stdout, sys.stderr = so, se
+            self.salida.cerrar()
+            try:
+                self.btn_cancelar.state(["disabled"])
+            except Exception:
+                pass
 
     @classmethod
-    def run(cls, parent=None, limpiar=True, titulo="Sintáctico "):
-        return cls(parent=parent, limpiar=limpiar, titulo=titulo)
+    def run(cls, parent=None, limpiar=True, titulo="Sintáctico ", unidad=None):
+        return cls(parent=parent, limpiar=limpiar, titulo=titulo, unidad=unidad)
 
     @classmethod
-    def correr_en_text(cls, text_widget, status_widget=None, limpiar=True):
-        so, se = sys.stdout, sys.stderr
-        redir = cls._TextRedirector(text_widget)
+    def correr_en_text(cls, text_widget, status_widget=None, limpiar=True, unidad=None, limites=None):
+        """
+        Corre el análisis en un hilo, en su propia sesión (ver nueva_sesion)
+        que escribe en text_widget; devuelve los LimitesAnalisis para poder cancelarlo.
+        """
+        salida = cls._salida_texto(text_widget)
+        sesion = cls.nueva_sesion(limites, SALIDA=salida, ESCRIBIR_OPERACIONES=True)
         def _runner():
             try:
                 if limpiar: text_widget.delete("1.0", "end")
-                sys.stdout = redir; sys.stderr = redir
                 if status_widget is not None: status_widget.config(text="Ejecutando…")
-                cls.analizar_sintactico()
+                sesion.analizar_sintactico(unidad)
                 if status_widget is not None: status_widget.config(text="Ejecución terminada")
+            except AnalisisInterrumpido as e:
+                sesion._escribir(f"\n[Interrumpido] {e}\n")
+                if status_widget is not None: status_widget.config(text="Análisis interrumpido")
             except ValueError as e:
-                print(f"[Error] {e}\n")
+                sesion._escribir(f"[Error] {e}\n")
                 if status_widget is not None: status_widget.config(text="Error en variables.txt")
             except Exception:
-                traceback.print_exc()
+                traceback.print_exc(file=salida)
                 if status_widget is not None: status_widget.config(text="Ocurrió un error")
             finally:
-                sys.stdout, sys.stderr = so, se
+                salida.cerrar()
         threading.Thread(target=_runner, daemon=True).start()
+        return sesion.limites
+
 
 if __name__ == "__main__":
     SintacticoApp.run(parent=None)
\ No newline at end of file
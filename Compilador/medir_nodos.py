@@ -0,0 +1,117 @@
+# medir_nodos.py
+# Memoria por nodo de los árboles del proyecto: las clases de Nodos.py
+# (con __slots__) contra las clases con __dict__ que había antes en cada
+# módulo, armando un bosque de expresiones de ~1M nodos con cada una.
+#   python medir_nodos.py [nodos] [nodos_por_arbol]
+
+import gc, sys, time, tracemalloc
+from Nodos import NodoDibujo, NodoExpr, NodoInorden, NodoPCode
+
+
+# ----------------- clases de antes (con __dict__) -------
+
+class NodoExprAntes:            # Cuadruplos.Nodo, NotacionPolaca.Nodo, NP_PC_T_C.Nodo
+    def __init__(self, op=None, izq=None, der=None, val=None):
+        self.op, self.izq, self.der, self.val = op, izq, der, val
+
+
+class NodoInordenAntes:         # GeneradorTriplos.Nodo
+    def __init__(self, op=None, izq=None, der=None, val=None):
+        self.op = op
+        self.izq = izq
+        self.der = der
+        self.val = val
+        self.inorder_idx = None
+
+
+class NodoPCodeAntes:           # GeneradorPCode.Node
+    def __init__(self, value=None, op=None, left=None, right=None):
+        self.value = value
+        self.op = op
+        self.left = left
+        self.right = right
+
+
+class NodoDibujoAntes:          # SemanticoApp.TreeNode
+    def __init__(self, label, valor=None, children=None):
+        self.label = label
+        self.valor = valor
+        self.children = children or []
+        self.x = 0; self.y = 0; self.w = 0; self.h = 0
+
+
+# ----------------- bosque de prueba ---------------------
+
+def binario(clase):
+    return (lambda v: clase(val=v)), (lambda op, izq, der: clase(op=op, izq=izq, der=der))
+
+def pcode(clase):
+    return (lambda v: clase(value=v)), (lambda op, izq, der: clase(op=op, left=izq, right=der))
+
+def dibujo(clase):
+    # como el semántico: el operador es un nodo hijo más
+    return ((lambda v: clase("nomvar", v)),
+            (lambda op, izq, der: clase("Exp", 0.0, [izq, clase("operador", op), der])))
+
+CASOS = [
+    ("Nodo (cuádruplos, polaca)", binario, NodoExprAntes, NodoExpr, 1),
+    ("Nodo (triplos) / Nodo2", binario, NodoInordenAntes, NodoInorden, 1),
+    ("GeneradorPCode.Node", pcode, NodoPCodeAntes, NodoPCode, 1),
+    ("TreeNode (semántico)", dibujo, NodoDibujoAntes, NodoDibujo, 2),
+]
+
+HOJAS = ("$a", "$b", "3", "7.5")
+OPS = ("+", "-", "*", "/")
+
+
+def bosque(hoja, binaria, nodos, por_arbol, nodos_por_op):
+    """
+    Árboles equilibrados de ~por_arbol nodos hasta juntar ~'nodos': se arman
+    de abajo hacia arriba (sin recursión). Devuelve (raíces, nodos creados).
+    """
+    raices, total = [], 0
+    hojas_por_arbol = max(2, (por_arbol + nodos_por_op) // (1 + nodos_por_op))
+    k = 0
+    while total < nodos:
+        nivel = [hoja(HOJAS[(k + j) % 4]) for j in range(hojas_por_arbol)]
+        total += hojas_por_arbol
+        while len(nivel) > 1:
+            sig = []
+            for j in range(0, len(nivel) - 1, 2):
+                sig.append(binaria(OPS[(k + j) % 4], nivel[j], nivel[j+1]))
+                total += nodos_por_op
+            if len(nivel) % 2:
+                sig.append(nivel[-1])
+            nivel = sig
+        raices.append(nivel[0])
+        k += 1
+    return raices, total
+
+
+def medir(fabrica, clase, nodos, por_arbol, nodos_por_op):
+    hoja, binaria = fabrica(clase)
+    gc.collect()
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    t = time.perf_counter()
+    raices, total = bosque(hoja, binaria, nodos, por_arbol, nodos_por_op)
+    segundos = time.perf_counter() - t
+    usado = tracemalloc.get_traced_memory()[0] - antes
+    tracemalloc.stop()
+    del raices
+    return usado / total, total, segundos
+
+
+def main(argv):
+    nodos = int(argv[1]) if len(argv) > 1 else 1_000_000
+    por_arbol = int(argv[2]) if len(argv) > 2 else 1000
+    print(f"Python {sys.version.split()[0]}: bosque de ~{nodos} nodos, árboles de ~{por_arbol}")
+    print(f"{'árbol':<28} {'antes B/nodo':>13} {'ahora B/nodo':>13} {'ahorro':>8}")
+    for nombre, fabrica, antes, ahora, nodos_por_op in CASOS:
+        b_antes, total, _ = medir(fabrica, antes, nodos, por_arbol, nodos_por_op)
+        b_ahora, _, _ = medir(fabrica, ahora, nodos, por_arbol, nodos_por_op)
+        print(f"{nombre:<28} {b_antes:>13.1f} {b_ahora:>13.1f} {1 - b_ahora / b_antes:>8.0%}   ({total} nodos)")
+
+
+if __name__ == "__main__":
+    main(sys.argv)
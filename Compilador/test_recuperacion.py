@@ -0,0 +1,44 @@
+# test_recuperacion.py
+# Pruebas de la pasada de recuperación de errores del sintáctico
+# (SesionSintactica.analizar_con_recuperacion).
+#   python -m unittest test_recuperacion      (o pytest)
+
+import tempfile, unittest
+from AnalisisSintactico import SesionSintactica
+
+
+class PruebaRecuperacion(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.sesion = SesionSintactica(DIR_CACHE=tempfile.mkdtemp())
+        cls.gramatica = cls.sesion.compilar_gramatica_ll1(["$a", "$b"])
+
+    def errores(self, fuente):
+        # un token por línea, para que cada error diga en qué token fue
+        tokens = [(t, n) for n, t in enumerate(fuente.split(), start=1)]
+        syms = self.sesion._clasificar_simbolos(tokens)
+        c = self.gramatica
+        return self.sesion.analizar_con_recuperacion(c["gramatica"], c["inicio"], c["etiquetas"],
+                                                     syms, c["tabla"])
+
+    def test_programa_valido_sin_errores(self):
+        self.assertEqual(self.errores("Ini ente $a ; $a = 1 + $a ; end"), [])
+
+    def test_un_end_de_mas_es_un_solo_error(self):
+        errores = self.errores("Ini ente $b ; end leer ; ente $a ; end")
+        self.assertEqual(len(errores), 1)
+        self.assertEqual(errores[0]["linea"], 6)
+        self.assertEqual(errores[0]["esperados"], ["#"])
+        self.assertEqual(errores[0]["encontrado"], "leer")
+
+    def test_un_end_de_mas_en_un_programa_largo(self):
+        resto = " ".join(["$a = 1 ;"] * 2000)
+        self.assertEqual(len(self.errores(f"Ini ente $a ; end {resto} end")), 1)
+
+    def test_se_sigue_tras_cada_sentencia_rota(self):
+        errores = self.errores("Ini ente $a ; $a = + 1 ; leer $a $a ; end")
+        self.assertEqual([e["linea"] for e in errores], [7, 12])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,6 +6,8 @@ import os
 import re
 import tkinter as tk
 from tkinter import messagebox
+from Arbol import convertir
+from Nodos import NodoInorden
 
 # --- Configuración: ajusta la ruta si lo necesitas ---
 RUTA_OPERACIONES = os.path.join(os.path.dirname(__file__), "operaciones.txt")
@@ -120,17 +122,7 @@ class GeneradorTriplos:
         return out
 
     # ======== AST simple ========
-    class Nodo:
-        def __init__(self, op=None, izq=None, der=None, val=None):
-            self.op = op
-            self.izq = izq
-            self.der = der
-            self.val = val
-            self.inorder_idx = None
-
-        @property
-        def es_hoja(self):
-            return self.op is None
+    Nodo = NodoInorden
 
     def ast_desde_postfijo(self, post):
         pila = []
@@ -199,22 +191,38 @@ class GeneradorTriplos:
         return triplos
 
     # ======== API pública ========
-    def generar_triplos(self, cadena: str):
+    def generar_triplos(self, cadena: str, tokens=None):
         """
         Espera algo como: $x=34+5.5+3+2-10*2*10**2
         Devuelve lista de tuplas (op, arg1, arg2). Última es ('=', $x, [k])
+        Si 'tokens' trae el lado derecho ya tokenizado (p.ej. lo que capturó el
+        sintáctico), no se vuelve a tokenizar.
         """
         if '=' not in cadena:
             raise ValueError("Incluye '='.")
         var, expr = [s.strip() for s in cadena.split('=', 1)]
         if not self.es_identificador(var):
             raise ValueError("La variable del lado izquierdo debe iniciar con '$'.")
-        tokens = self.tokenizar(expr)           # ** → ^ dentro del lexer
+        if tokens is None:
+            tokens = self.tokenizar(expr)       # ** → ^ dentro del lexer
         post = self.infijo_a_postfijo(tokens)
         raiz = self.ast_desde_postfijo(post)
         self.asignar_inorder_idx(raiz)
         return self.emitir_triplos(raiz, var)
 
+    def generar_triplos_arbol(self, var: str, expr):
+        """
+        Igual que generar_triplos() pero con el lado derecho ya analizado por
+        el sintáctico (expresión de Arbol): sin tokenizar ni pasar a postfijo.
+        """
+        def hoja(v):
+            if not (self.es_numero(v) or self.es_identificador(v)):
+                raise ValueError(f"Token inesperado: {v}")
+            return self.Nodo(val=v)
+        raiz = convertir(expr, hoja, lambda op, izq, der: self.Nodo(op=op, izq=izq, der=der))
+        self.asignar_inorder_idx(raiz)
+        return self.emitir_triplos(raiz, var)
+
 
 # ================== GUI que procesa archivo automáticamente ==================
 class AppTriplos(tk.Tk):